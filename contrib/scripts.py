@@ -4,17 +4,42 @@
 from __future__ import annotations
 
 import json
+from collections import Counter
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any
 from typing import TYPE_CHECKING
 
 from beancount.parser.options import OPTIONS_DEFAULTS
 from beanquery import connect
 from beanquery import query_compile
 from beanquery.parser.parser import KEYWORDS
+from click import argument
+from click import echo
 from click import group
+from click import option
+from click import Path as ClickPath
+
+from fava.beans.abc import Open
+from fava.beans.load import load_uncached
+from fava.beans.load import ParseCache
+from fava.core import FavaLedger
+from fava.core.filter_parser import compile_filter
+from fava.core.filter_parser import parse_filter
+from fava.core.inventory import CounterInventory
+from fava.core.posting_table import PostingTable
+from fava.core.running_balances import CHECKPOINT_INTERVAL
+from fava.core.running_balances import RunningBalances
+from fava.core.tree import Tree
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
     from collections.abc import Iterable
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
 
 BASE_PATH = Path(__file__).parent.parent
 FAVA_PATH = BASE_PATH / "src" / "fava"
@@ -54,5 +79,273 @@ def generate_bql_grammar_json() -> None:
     path.write_text("export default " + json.dumps(data, indent="  "))
 
 
+def _write_ledger_with_includes(
+    directory: Path, files: int, transactions: int
+) -> Path:
+    """Write a ledger that consists of many included files."""
+    main = directory / "main.beancount"
+    main.write_text(
+        'include "parts/*.beancount"\n'
+        "2000-01-01 open Assets:Cash\n"
+        "2000-01-01 open Expenses:Food\n"
+    )
+    parts = directory / "parts"
+    parts.mkdir()
+    for index in range(files):
+        lines = [
+            f'2001-01-{day % 28 + 1:02} * "Shop {index}" "Groceries"\n'
+            f"  Assets:Cash  -{day}.{index % 100:02} EUR\n"
+            "  Expenses:Food\n"
+            for day in range(transactions)
+        ]
+        (parts / f"{index:04}.beancount").write_text("".join(lines))
+    return main
+
+
+@cli.command()
+@option("--files", default=128, show_default=True, help="Included files.")
+@option(
+    "--transactions",
+    default=2000,
+    show_default=True,
+    help="Transactions per included file.",
+)
+@option(
+    "--processes",
+    "processes_list",
+    multiple=True,
+    type=int,
+    default=(1, 4, 8, 16),
+    show_default=True,
+    help="Numbers of processes to benchmark.",
+)
+def benchmark_parallel_parse(
+    files: int, transactions: int, processes_list: tuple[int, ...]
+) -> None:
+    """Benchmark cold loads of a ledger with many included files.
+
+    Loads a generated ledger with the given numbers of parse processes and
+    reports the time taken for parsing and for the whole load.
+    """
+    with TemporaryDirectory() as tmp_dir:
+        main = str(
+            _write_ledger_with_includes(Path(tmp_dir), files, transactions)
+        )
+        echo(f"{files} files with {transactions} transactions each")
+        baseline = None
+        for processes in processes_list:
+            parse_cache = ParseCache(processes)
+            start = perf_counter()
+            parse_cache.parse_files(
+                [main, *sorted(str(p) for p in Path(tmp_dir).glob("parts/*"))]
+            )
+            parse_time = perf_counter() - start
+            start = perf_counter()
+            load_uncached(
+                main, is_encrypted=False, parse_cache=ParseCache(processes)
+            )
+            load_time = perf_counter() - start
+            baseline = baseline or parse_time
+            echo(
+                f"processes={processes:3}  parse={parse_time:7.3f}s "
+                f"(speedup {baseline / parse_time:4.1f}x)  "
+                f"load={load_time:7.3f}s"
+            )
+
+
+#: The filters to benchmark by default.
+BENCHMARK_FILTERS = (
+    "#trip-new-york-2016",
+    "Goba",
+    'payee:"China Garden" >10',
+    "Goba, Uncle, Rose",
+    "-#trip-new-york-2016 Goba -^link",
+    'any(account:"Expenses:Food" > 20) payee:"Uncle Boons"',
+)
+
+
+@cli.command()
+@argument(
+    "beancount_file",
+    type=ClickPath(exists=True, dir_okay=False),
+    default=str(BASE_PATH / "tests" / "data" / "long-example.beancount"),
+)
+@option(
+    "--filter",
+    "filters",
+    multiple=True,
+    default=BENCHMARK_FILTERS,
+    help="Filters to benchmark.",
+)
+@option("--repeat", default=10, show_default=True, help="Repetitions.")
+def benchmark_filters(
+    beancount_file: str, filters: tuple[str, ...], repeat: int
+) -> None:
+    """Benchmark compiled against interpreted advanced filters.
+
+    Matches all entries of the ledger against each filter, with the parsed
+    filter expression and with the compiled function, and reports the best
+    time of the repetitions for each.
+    """
+    entries, _, _ = load_uncached(beancount_file, is_encrypted=False)
+    echo(f"{len(entries)} entries")
+    for string in filters:
+        expr = parse_filter(string)
+        compiled = compile_filter(expr)
+        times = []
+        for function in (expr, compiled):
+            best = float("inf")
+            for _ in range(repeat):
+                start = perf_counter()
+                matches = sum(1 for entry in entries if function(entry))
+                best = min(best, perf_counter() - start)
+            times.append(best)
+        interpreted_time, compiled_time = times
+        echo(
+            f"{string:55} matches={matches:5}  "
+            f"interpreted={interpreted_time * 1000:7.2f}ms  "
+            f"compiled={compiled_time * 1000:7.2f}ms  "
+            f"(speedup {interpreted_time / compiled_time:4.1f}x)"
+        )
+
+
+def _tree_from_balances(
+    entries: Sequence[Directive], balances: Mapping[str, CounterInventory]
+) -> Tree:
+    """Build a tree from the balances of the accounts."""
+    tree = Tree(
+        create_accounts=[
+            entry.account for entry in entries if isinstance(entry, Open)
+        ]
+    )
+    for name, balance in sorted(balances.items()):
+        tree.insert(name, balance)
+    return tree
+
+
+def _running_balances_decimal(
+    entries: Sequence[Directive], account: str
+) -> list[CounterInventory]:
+    """The checkpoints of the running balance of an account, with Decimals."""
+    inventory = CounterInventory()
+    checkpoints = [CounterInventory()]
+    count = 0
+    for entry in entries:
+        for posting in getattr(entry, "postings", []):
+            if posting.account == account:
+                inventory.add_position(posting)
+                count += 1
+                if count % CHECKPOINT_INTERVAL == 0:
+                    checkpoints.append(CounterInventory(inventory))
+    if count % CHECKPOINT_INTERVAL:
+        checkpoints.append(inventory)
+    return checkpoints
+
+
+def _running_balances_scaled(
+    table: PostingTable, account: str
+) -> list[CounterInventory]:
+    """The checkpoints of the running balance of an account, scaled."""
+    running_balances = RunningBalances(table)
+    checkpoints = running_balances._account_balances(  # noqa: SLF001
+        account, with_children=False
+    ).checkpoints
+    return [checkpoint.to_counter_inventory() for checkpoint in checkpoints]
+
+
+@cli.command()
+@argument(
+    "beancount_file",
+    type=ClickPath(exists=True, dir_okay=False),
+    default=str(BASE_PATH / "tests" / "data" / "long-example.beancount"),
+)
+@option("--repeat", default=10, show_default=True, help="Repetitions.")
+@option(
+    "--generate",
+    default=0,
+    show_default=True,
+    help="Benchmark a generated ledger with this many included files of "
+    "2000 transactions each instead.",
+)
+def benchmark_tree(beancount_file: str, repeat: int, generate: int) -> None:
+    """Benchmark summing balances with Decimals and scaled integers.
+
+    Builds the tree of all entries of the ledger by summing Decimals in
+    counter inventories and by summing the scaled integers of the posting
+    table of the ledger (which is built once per load). Then computes the
+    checkpoints of the running balance of the account with the most
+    postings by summing Decimals and by summing the scaled integers of the
+    posting table with :class:`ScaledCounterInventory`, as the running
+    balances do. The results are checked to be equal and the best time of
+    the repetitions is reported for each.
+    """
+    with TemporaryDirectory() as tmp_dir:
+        if generate:
+            beancount_file = str(
+                _write_ledger_with_includes(Path(tmp_dir), generate, 2000)
+            )
+        ledger = FavaLedger(beancount_file)
+    entries = ledger.all_entries
+    start = perf_counter()
+    table = PostingTable(entries)
+    echo(
+        f"{len(entries)} entries, {len(table)} postings, posting table built "
+        f"in {(perf_counter() - start) * 1000:.2f}ms"
+    )
+    account_id, _ = Counter(table.accounts).most_common(1)[0]
+    account = table.account_names[account_id]
+
+    def balances(tree: Tree) -> dict[str, tuple[list[str], list[str]]]:
+        return {
+            name: (
+                node.balance.to_strings(),
+                node.balance_children.to_strings(),
+            )
+            for name, node in tree.items()
+        }
+
+    def strings(checkpoints: list[CounterInventory]) -> list[list[str]]:
+        return [checkpoint.to_strings() for checkpoint in checkpoints]
+
+    groups: tuple[tuple[tuple[str, Callable[[], Any]], ...], ...] = (
+        (
+            ("tree decimal", lambda: balances(Tree(entries))),
+            (
+                "tree table",
+                lambda: balances(
+                    _tree_from_balances(entries, table.balances())
+                ),
+            ),
+        ),
+        (
+            (
+                "running decimal",
+                lambda: strings(_running_balances_decimal(entries, account)),
+            ),
+            (
+                "running scaled",
+                lambda: strings(_running_balances_scaled(table, account)),
+            ),
+        ),
+    )
+    for variants in groups:
+        expected = None
+        baseline = None
+        for label, function in variants:
+            best = float("inf")
+            for _ in range(repeat):
+                start = perf_counter()
+                result = function()
+                best = min(best, perf_counter() - start)
+            if expected is None:
+                expected = result
+            assert result == expected, label  # noqa: S101
+            baseline = baseline or best
+            echo(
+                f"{label:16} {best * 1000:8.2f}ms  "
+                f"(speedup {baseline / best:4.1f}x)"
+            )
+
+
 if __name__ == "__main__":
     cli()
@@ -14,6 +14,11 @@ from __future__ import annotations
 
 import logging
 import mimetypes
+import os
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from datetime import date
 from datetime import datetime
 from datetime import timezone
@@ -27,6 +32,7 @@ from urllib.parse import urlencode
 from urllib.parse import urlparse
 from urllib.parse import urlunparse
 
+from beancount.utils.encryption import is_encrypted_file
 from flask import abort
 from flask import current_app
 from flask import Flask
@@ -44,10 +50,17 @@ from fava import LOCALES
 from fava import template_filters
 from fava._ctx_globals_class import Context
 from fava.beans import funcs
+from fava.beans.load import load_cached_with_derived
+from fava.beans.load import load_frozen
+from fava.beans.load import load_uncached
+from fava.beans.load import ParseCache
 from fava.context import g
 from fava.core import FavaLedger
 from fava.core.charts import FavaJSONProvider
 from fava.core.documents import is_document_or_import_file
+from fava.core.fava_options import find_cache_dir_option
+from fava.core.fava_options import find_frozen_until_option
+from fava.core.ledger_index import index_for_snapshot
 from fava.helpers import FavaAPIError
 from fava.internal_api import ChartApi
 from fava.internal_api import get_ledger_data
@@ -65,6 +78,9 @@ if TYPE_CHECKING:  # pragma: no cover
     from flask.wrappers import Response
     from werkzeug import Response as WerkzeugResponse
 
+    from fava.beans.types import LoaderResult
+    from fava.core.ledger_index import LedgerIndex
+
 
 setup_logging()
 
@@ -97,6 +113,30 @@ if not mimetypes.types_map.get(".js", "").endswith(
     mimetypes.add_type("text/javascript", ".js")
 
 
+def _load_in_process(
+    path: str, cache_dir: Path | str | None
+) -> tuple[LoaderResult, LedgerIndex | None, ParseCache]:
+    """Load a Beancount file (and its index if snapshots are used).
+
+    The parse cache that the files were parsed with is returned as well, so
+    that the ledger can reuse the parse results when it is reloaded.
+    """
+    parse_cache = ParseCache()
+    if cache_dir:
+        frozen_until = find_frozen_until_option(path)
+        if frozen_until is not None:
+            result = load_frozen(
+                path, Path(cache_dir), frozen_until, parse_cache
+            )
+            return result, None, parse_cache
+        result, index = load_cached_with_derived(
+            path, Path(cache_dir), index_for_snapshot, parse_cache
+        )
+        return result, index, parse_cache
+    result = load_uncached(path, is_encrypted=False, parse_cache=parse_cache)
+    return result, None, parse_cache
+
+
 def _slug(ledger: FavaLedger) -> str:
     """Slug for a ledger."""
     title_slug = slugify(ledger.options["title"])
@@ -104,7 +144,12 @@ def _slug(ledger: FavaLedger) -> str:
 
 
 class _LedgerSlugLoader:
-    """Load multiple ledgers and access them by their slug."""
+    """Load multiple ledgers and access them by their slug.
+
+    The ledgers are loaded concurrently and each one can be accessed as soon
+    as it has been loaded. If there are multiple Beancount files, they are
+    loaded in separate processes.
+    """
 
     def __init__(
         self,
@@ -112,14 +157,21 @@ class _LedgerSlugLoader:
         *,
         load: bool = False,
         poll_watcher: bool = False,
+        cache_dir: str | None = None,
+        parse_processes: int = 1,
+        background_reload: bool = False,
     ) -> None:
         self.fava_app = fava_app
         self.poll_watcher = poll_watcher
+        self.cache_dir = cache_dir
+        self.parse_processes = parse_processes
+        self.background_reload = background_reload
 
         self._lock = Lock()
 
-        # The loaded ledgers - lazily loaded unless load=True
-        self._ledgers = None
+        # The ledgers - lazily loaded unless load=True. Contains futures for
+        # the ledgers that are still loading.
+        self._ledgers: list[FavaLedger | Future[FavaLedger]] | None = None
         # The titles of the ledgers - used to check whether the ledgers_by_slug
         # below needs to be re-computed
         self._titles: list[str] | None = None
@@ -127,49 +179,162 @@ class _LedgerSlugLoader:
         self._ledgers_by_slug: dict[str, FavaLedger] | None = None
 
         if load:
-            with self._lock:
-                self._ledgers = self._load()
+            _ = self.ledgers
 
-    def _load(self) -> list[FavaLedger]:
-        return [
-            FavaLedger(path, poll_watcher=self.poll_watcher)
-            for path in self.fava_app.config["BEANCOUNT_FILES"]
+    def _load(self) -> list[FavaLedger | Future[FavaLedger]]:
+        """Start loading all ledgers."""
+        paths: list[str] = self.fava_app.config["BEANCOUNT_FILES"]
+        loaded: list[
+            Future[tuple[LoaderResult, LedgerIndex | None, ParseCache]] | None
+        ]
+        loaded = [None] * len(paths)
+        if len(paths) > 1:
+            # This imports multiprocessing, which is slow, so only do it here.
+            from concurrent.futures import ProcessPoolExecutor
+
+            processes = ProcessPoolExecutor(
+                max_workers=min(len(paths), os.cpu_count() or 1)
+            )
+            for index, path in enumerate(paths):
+                if is_encrypted_file(path):  # pragma: no cover
+                    continue
+                cache_dir = self.cache_dir or find_cache_dir_option(path)
+                loaded[index] = processes.submit(
+                    _load_in_process, path, cache_dir
+                )
+            processes.shutdown(wait=False)
+        threads = ThreadPoolExecutor(max_workers=len(paths))
+        ledgers: list[FavaLedger | Future[FavaLedger]] = [
+            threads.submit(self._load_ledger, path, result)
+            for path, result in zip(paths, loaded, strict=True)
         ]
+        threads.shutdown(wait=False)
+        return ledgers
+
+    def _load_ledger(
+        self,
+        path: str,
+        loaded: Future[tuple[LoaderResult, LedgerIndex | None, ParseCache]]
+        | None,
+    ) -> FavaLedger:
+        if loaded is None:
+            return FavaLedger(
+                path,
+                poll_watcher=self.poll_watcher,
+                cache_dir=self.cache_dir,
+                parse_processes=self.parse_processes,
+                background_reload=self.background_reload,
+            )
+        result, index, parse_cache = loaded.result()
+        parse_cache.processes = self.parse_processes
+        return FavaLedger(
+            path,
+            poll_watcher=self.poll_watcher,
+            cache_dir=self.cache_dir,
+            background_reload=self.background_reload,
+            loaded=(result, index),
+            parse_cache=parse_cache,
+        )
+
+    def _current(self) -> list[FavaLedger | Future[FavaLedger]]:
+        """The ledgers, with futures for the ones that are still loading."""
+        with self._lock:
+            if self._ledgers is None:
+                self._ledgers = self._load()
+            # Replace futures by the loaded ledgers and switch to the ledgers
+            # that have been reloaded in the background.
+            self._ledgers = [
+                ledger.result().latest
+                if isinstance(ledger, Future) and ledger.done()
+                else ledger.latest
+                if isinstance(ledger, FavaLedger)
+                else ledger
+                for ledger in self._ledgers
+            ]
+            return self._ledgers
 
     @property
     def ledgers(self) -> list[FavaLedger]:
         """Return the list of loaded ledgers (loading it if not yet done)."""
-        if self._ledgers is None:
-            with self._lock:
-                # avoid loading it already loaded while waiting for the lock
-                if self._ledgers is None:  # pragma: no cover
-                    self._ledgers = self._load()
-        return self._ledgers
+        wait(
+            [
+                ledger
+                for ledger in self._current()
+                if isinstance(ledger, Future)
+            ]
+        )
+        return [
+            ledger
+            for ledger in self._current()
+            if isinstance(ledger, FavaLedger)
+        ]
 
     @property
     def ledgers_by_slug(self) -> dict[str, FavaLedger]:
-        """A dict mapping slugs to the loaded ledgers."""
-        ledgers = self.ledgers
+        """A dict mapping slugs to the ledgers that have been loaded."""
+        return self._by_slug(self._current())
+
+    def _by_slug(
+        self, current: list[FavaLedger | Future[FavaLedger]]
+    ) -> dict[str, FavaLedger]:
+        """Map slugs to the loaded ledgers of a list of (loading) ledgers.
+
+        While ledgers are still loading, slugs are assigned in file order
+        among the loaded ones, so a ledger with a duplicate title might get
+        a different slug once the ledgers before it have been loaded.
+        """
+        ledgers = [
+            ledger for ledger in current if isinstance(ledger, FavaLedger)
+        ]
         titles = [ledger.options["title"] for ledger in ledgers]
-        if self._ledgers_by_slug is None or self._titles != titles:
-            by_slug: dict[str, FavaLedger] = {}
+        by_slug = self._ledgers_by_slug
+        if (
+            by_slug is None
+            or self._titles != titles
+            or list(by_slug.values()) != ledgers
+        ):
+            by_slug = {}
             for ledger in ledgers:
                 by_slug[next_key(_slug(ledger), by_slug)] = ledger
             self._ledgers_by_slug = by_slug
             self._titles = titles
-        return self._ledgers_by_slug
+        return by_slug
 
     def first_slug(self) -> str:
         """Get the slug of the first ledger."""
-        return _slug(self.ledgers[0])
+        first = self._current()[0]
+        return _slug(first.result() if isinstance(first, Future) else first)
 
     def items(self) -> ItemsView[str, FavaLedger]:
-        """Get an items view of all the ledgers by slug."""
+        """Get an items view of all the loaded ledgers by slug."""
         return self.ledgers_by_slug.items()
 
     def __getitem__(self, slug: str) -> FavaLedger:
-        """Get the ledger for the given slug."""
-        return self.ledgers_by_slug[slug]
+        """Get the ledger for the given slug.
+
+        Waits for ledgers that are still loading until one with the slug
+        has been loaded. Since the slug of a ledger depends on the titles of
+        all ledgers before it, these need to have been loaded as well.
+        """
+        while True:
+            # Use a single snapshot of the ledgers, which might be swapped by
+            # background reloads at any time.
+            current = self._current()
+            by_slug = self._by_slug(current)
+            loading = [
+                ledger for ledger in current if isinstance(ledger, Future)
+            ]
+            if not loading:
+                return by_slug[slug]
+            ledger = by_slug.get(slug)
+            if ledger is not None:
+                # The slug is only final if all ledgers before have loaded.
+                for other in current:
+                    if other is ledger:
+                        return ledger
+                    if isinstance(other, Future):
+                        break
+            wait(loading, return_when=FIRST_COMPLETED)
 
 
 def static_url(filename: str) -> str:
@@ -458,6 +623,9 @@ def create_app(
     incognito: bool = False,
     read_only: bool = False,
     poll_watcher: bool = False,
+    cache_dir: Path | str | None = None,
+    parse_processes: int = 1,
+    background_reload: bool = False,
 ) -> Flask:
     """Create a Fava Flask application.
 
@@ -467,6 +635,9 @@ def create_app(
         incognito: Whether to run in incognito mode.
         read_only: Whether to run in read-only mode.
         poll_watcher: Whether to use old poll watcher
+        cache_dir: A directory to store snapshots of the loaded ledgers in.
+        parse_processes: The number of processes to parse files in.
+        background_reload: Whether to reload ledgers in a background thread.
     """
     fava_app = Flask("fava")
     fava_app.register_blueprint(json_api, url_prefix="/<bfile>/api")
@@ -481,7 +652,12 @@ def create_app(
     fava_app.config["BEANCOUNT_FILES"] = [str(f) for f in files]
     fava_app.config["INCOGNITO"] = incognito
     fava_app.config["LEDGERS"] = _LedgerSlugLoader(
-        fava_app, load=load, poll_watcher=poll_watcher
+        fava_app,
+        load=load,
+        poll_watcher=poll_watcher,
+        cache_dir=str(cache_dir) if cache_dir is not None else None,
+        parse_processes=parse_processes,
+        background_reload=background_reload,
     )
 
     return fava_app
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from beancount.core.account import TYPE as ACCOUNT_TYPE
@@ -17,8 +18,12 @@ if TYPE_CHECKING:  # pragma: no cover
     from fava.beans.abc import Directive
 
 
+@lru_cache(maxsize=8192)
 def parent(account: str) -> str | None:
-    """Get the name of the parent of the given account."""
+    """Get the name of the parent of the given account.
+
+    This is cached as it is called for every node of every account tree.
+    """
     parts = account.rsplit(":", maxsplit=1)
     return parts[0] if len(parts) == 2 else None
 
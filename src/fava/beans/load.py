@@ -2,13 +2,52 @@
 
 from __future__ import annotations
 
+import copy
+import datetime
+import importlib.util
+import logging
+import os
+import pickle
+import sys
+from contextlib import suppress
+from dataclasses import dataclass
+from glob import glob
+from hashlib import sha256
+from io import BytesIO
+from pathlib import Path
+from typing import Any
 from typing import TYPE_CHECKING
+from typing import TypeVar
 
+from beancount import __version__ as beancount_version
 from beancount import loader
+from beancount.core import account
+from beancount.core import compare
+from beancount.core import data
+from beancount.ops import summarize
+from beancount.ops import validation
+from beancount.parser import booking
+from beancount.parser import options
+from beancount.parser import parser
+from beancount.utils import encryption
+
+from fava.beans import create
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
     from fava.beans.types import LoaderResult
 
+log = logging.getLogger(__name__)
+
+#: The version of the snapshot format - bump this on any change to it.
+SNAPSHOT_VERSION = 12
+
+T = TypeVar("T")
+
 
 def load_string(value: str) -> LoaderResult:
     """Load a Beancoun string."""
@@ -19,14 +58,649 @@ def load_uncached(
     beancount_file_path: str,
     *,
     is_encrypted: bool,
+    parse_cache: ParseCache | None = None,
 ) -> LoaderResult:
-    """Load a Beancount file."""
+    """Load a Beancount file.
+
+    Args:
+        beancount_file_path: Path to the main Beancount file.
+        is_encrypted: Whether the main file is encrypted.
+        parse_cache: If given, reuse the parse results of all files that did
+            not change since they were last loaded with this cache.
+    """
     if is_encrypted:  # pragma: no cover
         return loader.load_file(beancount_file_path)  # type: ignore[return-value]  # ty:ignore[invalid-return-type]
 
+    if parse_cache is not None:
+        return _load(beancount_file_path, parse_cache)
+
     return loader._load(  # type: ignore[return-value]  # noqa: SLF001
         [(beancount_file_path, True)],
         None,
         None,
         None,
     )  # ty:ignore[invalid-return-type]
+
+
+def _parse_contents(filename: str, contents: bytes) -> LoaderResult:
+    """Parse the contents of a (possibly encrypted) Beancount file."""
+    if encryption.is_encrypted_file(filename):  # pragma: no cover
+        contents = encryption.read_encrypted_file(filename).encode()
+    return parser.parse_file(BytesIO(contents), report_filename=filename)  # type: ignore[return-value]  # ty:ignore[invalid-return-type]
+
+
+@dataclass(frozen=True)
+class _CachedParseResult:
+    mtime_ns: int
+    size: int
+    digest: str
+    result: LoaderResult
+
+
+class ParseCache:
+    """A cache for the parse results of single Beancount files.
+
+    Results are keyed by the path of the file. They are reused as long as the
+    mtime and size of the file are unchanged or, if these changed, as long as
+    the hash of the file contents is unchanged.
+
+    Args:
+        processes: If larger than one, files that need to be parsed are parsed
+            in parallel in a pool of this many processes.
+    """
+
+    def __init__(self, processes: int = 1) -> None:
+        self.processes = processes
+        self._results: dict[str, _CachedParseResult] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def parse(self, filename: str) -> LoaderResult:
+        """Parse a file, reusing the cached result if it did not change.
+
+        The returned result is shared - it must not be modified.
+        """
+        return self.parse_files([filename])[filename]
+
+    def parse_files(self, filenames: Sequence[str]) -> dict[str, LoaderResult]:
+        """Parse multiple files, reusing the cached results if possible.
+
+        The returned results are shared - they must not be modified.
+        """
+        results: dict[str, LoaderResult] = {}
+        to_parse: dict[str, tuple[os.stat_result, str, bytes]] = {}
+        for filename in filenames:
+            stat = Path(filename).stat()
+            cached = self._results.get(filename)
+            if (
+                cached is not None
+                and cached.mtime_ns == stat.st_mtime_ns
+                and cached.size == stat.st_size
+            ):
+                results[filename] = cached.result
+                continue
+            contents = Path(filename).read_bytes()
+            digest = sha256(contents).hexdigest()
+            if cached is not None and cached.digest == digest:
+                results[filename] = cached.result
+                self._results[filename] = _CachedParseResult(
+                    stat.st_mtime_ns, stat.st_size, digest, cached.result
+                )
+            else:
+                to_parse[filename] = (stat, digest, contents)
+
+        if not to_parse:
+            return results
+        log.debug("Parsing %s files", len(to_parse))
+        names = list(to_parse)
+        sources = [value[2] for value in to_parse.values()]
+        processes = min(self.processes, len(to_parse))
+        if processes > 1:
+            # This imports multiprocessing, which is slow, so only do it here.
+            from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                parsed = list(executor.map(_parse_contents, names, sources))
+        else:
+            parsed = list(map(_parse_contents, names, sources))
+        for filename, result in zip(names, parsed, strict=True):
+            stat, digest, _ = to_parse[filename]
+            results[filename] = result
+            self._results[filename] = _CachedParseResult(
+                stat.st_mtime_ns, stat.st_size, digest, result
+            )
+        return results
+
+    def retain(self, filenames: Iterable[str]) -> None:
+        """Drop the results for all files but the given ones."""
+        keep = set(filenames)
+        self._results = {
+            filename: cached
+            for filename, cached in self._results.items()
+            if filename in keep
+        }
+
+
+def _load_error(message: str) -> Any:
+    return loader.LoadError(data.new_metadata("<load>", 0), message)
+
+
+def _parse_recursive(
+    beancount_file_path: str,
+    parse_cache: ParseCache,
+    skip: Mapping[str, Any] | None = None,
+) -> tuple[list[Any], list[Any], dict[str, Any]]:
+    """Parse a Beancount file and all its includes.
+
+    This matches the recursive parsing in Beancount's loader: files are merged
+    in breadth-first order of the includes, duplicate and missing files are
+    reported as errors and only the options of the main file are used, with
+    some of them aggregated from the other files.
+
+    Args:
+        beancount_file_path: Path to the main Beancount file.
+        parse_cache: The cache to parse the files with.
+        skip: Included files that should not be parsed, mapped to their
+            options. Such files must not include other files.
+    """
+    skip = skip or {}
+    entries: list[Any] = []
+    errors: list[Any] = []
+    options_map: dict[str, Any] | None = None
+    other_options_maps: list[Any] = []
+    filenames_seen: set[str] = set()
+
+    queue = [os.path.normpath(beancount_file_path)]
+    while queue:
+        # Parse all files of one level of includes at once (so that they can
+        # be parsed in parallel) and then merge them in order.
+        results = parse_cache.parse_files(
+            [
+                filename
+                for filename in dict.fromkeys(queue)
+                if filename not in filenames_seen
+                and filename not in skip
+                and Path(filename).exists()
+            ]
+        )
+        next_queue: list[str] = []
+        for filename in queue:
+            if filename in filenames_seen:
+                msg = f'Duplicate filename parsed: "{filename}"'
+                errors.append(_load_error(msg))
+                continue
+            if filename in skip:
+                filenames_seen.add(filename)
+                other_options_maps.append(skip[filename])
+                continue
+            if filename not in results:
+                errors.append(_load_error(f'File "{filename}" does not exist'))
+                continue
+            filenames_seen.add(filename)
+            src_entries, src_errors, src_options_map = results[filename]
+            entries.extend(src_entries)
+            errors.extend(src_errors)
+
+            if options_map is None:
+                # The parse result is shared, so copy the modified parts.
+                options_map = dict(src_options_map)
+                options_map["dcontext"] = copy.deepcopy(
+                    src_options_map["dcontext"]
+                )
+            else:
+                other_options_maps.append(src_options_map)
+
+            cwd = Path(filename).parent
+            for include in src_options_map["include"]:
+                # Path.glob does not support absolute patterns
+                pattern = str(cwd / include)
+                matched = glob(pattern, recursive=True)  # noqa: PTH207
+                if not matched:
+                    msg = f'File glob "{include}" does not match any files'
+                    errors.append(_load_error(msg))
+                next_queue.extend(os.path.normpath(match) for match in matched)
+        queue = next_queue
+
+    if options_map is None:
+        options_map = copy.deepcopy(options.OPTIONS_DEFAULTS)
+
+    options_map["include"] = sorted(filenames_seen)
+    parse_cache.retain(filenames_seen)
+    options_map = loader.aggregate_options_map(options_map, other_options_maps)
+    return entries, errors, options_map
+
+
+def _load(beancount_file_path: str, parse_cache: ParseCache) -> LoaderResult:
+    """Load a Beancount file, reusing parse results from the given cache.
+
+    After parsing, this does the same as Beancount's loader: the entries are
+    booked, the plugins are run and the result is validated.
+    """
+    return _book_and_validate(
+        *_parse_recursive(beancount_file_path, parse_cache)
+    )
+
+
+def _book_and_validate(
+    parsed_entries: list[Any],
+    parse_errors: list[Any],
+    options_map: dict[str, Any],
+) -> LoaderResult:
+    """Book the parsed entries, run the plugins and validate the result."""
+    entries = sorted(parsed_entries, key=data.entry_sortkey)
+    errors = list(parse_errors)
+
+    entries, balance_errors = booking.book(entries, options_map)  # type: ignore[no-untyped-call]
+    errors.extend(balance_errors)
+
+    saved_pythonpath = list(sys.path)
+    try:
+        sys.path[0:0] = options_map.get("pythonpath", [])
+        entries, errors = loader.run_transformations(
+            entries, errors, options_map, None
+        )
+    finally:
+        sys.path[:] = saved_pythonpath
+
+    errors.extend(validation.validate(entries, options_map, None, None))  # type: ignore[no-untyped-call]
+    options_map["input_hash"] = loader.compute_input_hash(  # type: ignore[no-untyped-call]
+        options_map["include"]
+    )
+    return entries, errors, options_map  # type: ignore[return-value]
+
+
+def _snapshot_version() -> tuple[int, str, tuple[int, int]]:
+    """The version a snapshot needs to match to be read."""
+    return (SNAPSHOT_VERSION, beancount_version, sys.version_info[:2])
+
+
+def hash_files(filenames: Iterable[str]) -> dict[str, str]:
+    """Compute the SHA256 hashes of the contents of the given files.
+
+    For directories, the hash is computed from the paths of all files in
+    them. Files that cannot be read are given an empty hash.
+    """
+    hashes = {}
+    for filename in filenames:
+        path = Path(filename)
+        try:
+            if path.is_dir():
+                listing = sorted(
+                    str(file.relative_to(path))
+                    for file in path.rglob("*")
+                    if file.is_file()
+                )
+                contents = "\n".join(listing).encode()
+            else:
+                contents = path.read_bytes()
+            hashes[filename] = sha256(contents).hexdigest()
+        except OSError:
+            hashes[filename] = ""
+    return hashes
+
+
+def _plugin_files(options_map: Mapping[str, Any]) -> list[str]:
+    """The source files of the plugin modules of a ledger."""
+    files = []
+    saved_pythonpath = list(sys.path)
+    try:
+        sys.path[0:0] = options_map.get("pythonpath", [])
+        for plugin_name, _ in options_map["plugin"]:
+            try:
+                spec = importlib.util.find_spec(plugin_name)
+            except (ImportError, ValueError):
+                continue
+            if spec is not None and spec.has_location and spec.origin:
+                files.append(spec.origin)
+    finally:
+        sys.path[:] = saved_pythonpath
+    return files
+
+
+def snapshot_dependencies(options_map: Mapping[str, Any]) -> list[str]:
+    """The files and directories that a load result depends on.
+
+    Besides the included files, these are the document directories, which
+    Beancount scans for documents, and the source files of the plugins.
+    """
+    directory = Path(options_map["filename"]).parent
+    return [
+        *options_map["include"],
+        *(
+            os.path.normpath(directory / document_dir)
+            for document_dir in options_map["documents"]
+        ),
+        *_plugin_files(options_map),
+    ]
+
+
+def snapshot_path(cache_dir: Path, beancount_file_path: str) -> Path:
+    """The path of the snapshot file for a Beancount file."""
+    path = Path(beancount_file_path)
+    digest = sha256(str(path.absolute()).encode()).hexdigest()[:16]
+    return cache_dir / f"{path.stem}-{digest}.snapshot"
+
+
+def read_snapshot(path: Path) -> Any | None:
+    """Read a snapshot if it is still valid.
+
+    A snapshot is valid if it has been written with the same version of the
+    snapshot format, Beancount and Python and if none of the files that it
+    was created from have changed since then.
+
+    Args:
+        path: The path of the snapshot.
+
+    Returns:
+        The snapshot data or None if it is missing or outdated.
+    """
+    try:
+        with path.open("rb") as file:
+            version, file_hashes, data = pickle.load(file)  # noqa: S301
+    except FileNotFoundError:
+        return None
+    except Exception:  # noqa: BLE001
+        log.warning("Ignoring unreadable snapshot at %s", path)
+        return None
+    if version != _snapshot_version():
+        return None
+    if hash_files(file_hashes) != file_hashes:
+        return None
+    return data
+
+
+def write_snapshot(
+    path: Path,
+    file_hashes: Mapping[str, str],
+    data: Any,
+) -> None:
+    """Write a snapshot.
+
+    The snapshot is written to a temporary file first and then moved into
+    place, so that concurrent readers never see an incomplete snapshot.
+
+    Args:
+        path: The path of the snapshot.
+        file_hashes: The content hashes of all files that the data depends on.
+        data: The data to store.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as file:
+            pickle.dump(
+                (_snapshot_version(), dict(file_hashes), data),
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        tmp_path.replace(path)
+    except OSError:
+        log.warning("Could not write snapshot to %s", path, exc_info=True)
+        with suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # For example, plugins might put objects into the metadata of
+        # entries that cannot be pickled.
+        log.warning(
+            "Could not pickle the data for the snapshot at %s",
+            path,
+            exc_info=True,
+        )
+        with suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+
+
+def load_cached(
+    beancount_file_path: str,
+    cache_dir: Path,
+    parse_cache: ParseCache | None = None,
+) -> LoaderResult:
+    """Load a Beancount file, using a snapshot in the cache directory.
+
+    The booked entries, errors and options are stored in a snapshot in the
+    given directory, keyed by the content hashes of all included files, the
+    files in the document directories and the source files of the plugins
+    (see :func:`snapshot_dependencies`). If none of them have changed, the
+    snapshot is used and parsing, booking and running the plugins are
+    skipped completely.
+
+    Args:
+        beancount_file_path: Path to the main Beancount file.
+        cache_dir: The directory to store the snapshot in.
+        parse_cache: Passed on to `load_uncached` if the snapshot is outdated.
+    """
+    path = snapshot_path(cache_dir, beancount_file_path)
+    snapshot = read_snapshot(path)
+    if snapshot is not None:
+        result: LoaderResult = snapshot[0]
+        return result
+
+    result = load_uncached(
+        beancount_file_path, is_encrypted=False, parse_cache=parse_cache
+    )
+    write_snapshot(
+        path, hash_files(snapshot_dependencies(result[2])), (result, None)
+    )
+    return result
+
+
+def load_cached_with_derived(
+    beancount_file_path: str,
+    cache_dir: Path,
+    derive: Callable[[LoaderResult], T],
+    parse_cache: ParseCache | None = None,
+) -> tuple[LoaderResult, T]:
+    """Load a Beancount file and derived data, using a snapshot.
+
+    Like `load_cached` but with some data derived from the load result, which
+    is stored in the same snapshot. Since both are stored together, the
+    derived data can reference the entries of the load result.
+
+    Args:
+        beancount_file_path: Path to the main Beancount file.
+        cache_dir: The directory to store the snapshot in.
+        derive: A function to compute the derived data from a load result.
+        parse_cache: Passed on to `load_uncached` if the snapshot is outdated.
+    """
+    path = snapshot_path(cache_dir, beancount_file_path)
+    snapshot = read_snapshot(path)
+    if snapshot is not None:
+        result: LoaderResult = snapshot[0]
+        derived: T | None = snapshot[1]
+        if derived is not None:
+            return result, derived
+    else:
+        result = load_uncached(
+            beancount_file_path, is_encrypted=False, parse_cache=parse_cache
+        )
+    derived = derive(result)
+    write_snapshot(
+        path, hash_files(snapshot_dependencies(result[2])), (result, derived)
+    )
+    return result, derived
+
+
+#: The types of entries that are summarised in a frozen history.
+_SUMMARISED_TYPES = (data.Transaction, data.Balance, data.Pad, data.Price)
+
+
+@dataclass(frozen=True)
+class FrozenHistory:
+    """The history of a ledger before some date, in summarised form.
+
+    The included files which only contain entries before the date are
+    archived: they are not parsed anymore as long as they are unchanged.
+    All transactions before the date are replaced by opening balances, all
+    balance assertions and pad entries before it are dropped. The prices
+    and the other entries of archived files are kept.
+    """
+
+    #: The date before which the history is frozen.
+    frozen_until: datetime.date
+    #: The summarising transactions and the kept entries.
+    entries: list[Any]
+    #: The errors from parsing the archived files.
+    errors: list[Any]
+    #: The options of the archived files by filename.
+    archived: dict[str, Any]
+    #: A hash of the summarised entries from files that are not archived.
+    fingerprint: str
+
+
+def _fingerprint(entries: Iterable[Any]) -> str:
+    hashes = sorted(compare.hash_entry(entry) for entry in entries)
+    return sha256("".join(hashes).encode()).hexdigest()
+
+
+def _freeze(
+    beancount_file_path: str,
+    result: LoaderResult,
+    frozen_until: datetime.date,
+    parse_cache: ParseCache,
+) -> FrozenHistory | None:
+    """Summarise the history before the given date.
+
+    Returns:
+        The frozen history or None if no included file can be archived.
+    """
+    entries, _, options_map = result
+    main = os.path.normpath(beancount_file_path)
+    archived: dict[str, Any] = {}
+    archived_errors: list[Any] = []
+    live_summarised: list[Any] = []
+    for filename in options_map["include"]:
+        parsed_entries, parse_errors, file_options = parse_cache.parse(
+            filename
+        )
+        if (
+            filename != main
+            and not file_options["include"]
+            and all(entry.date < frozen_until for entry in parsed_entries)
+        ):
+            archived[filename] = file_options
+            archived_errors.extend(parse_errors)
+        else:
+            live_summarised.extend(
+                entry
+                for entry in parsed_entries
+                if entry.date < frozen_until
+                and isinstance(entry, _SUMMARISED_TYPES)
+            )
+    if not archived:
+        return None
+
+    before: list[Any] = [
+        entry for entry in entries if entry.date < frozen_until
+    ]
+    opening_account = account.join(
+        options_map["name_equity"], options_map["account_previous_balances"]
+    )
+    summarised, _ = summarize.summarize(before, frozen_until, opening_account)
+    kept: list[Any] = [
+        entry for entry in summarised if isinstance(entry, data.Transaction)
+    ]
+    kept.extend(
+        entry
+        for entry in before
+        if isinstance(entry, data.Price)
+        or (
+            not isinstance(entry, _SUMMARISED_TYPES)
+            and entry.meta.get("filename") in archived
+        )
+    )
+    if not any(
+        isinstance(entry, data.Open) and entry.account == opening_account
+        for entry in entries
+    ):
+        kept.append(
+            create.open(
+                data.new_metadata("<summarize>", 0),
+                frozen_until - datetime.timedelta(days=1),
+                opening_account,
+                [],
+            )
+        )
+    return FrozenHistory(
+        frozen_until,
+        kept,
+        archived_errors,
+        archived,
+        _fingerprint(live_summarised),
+    )
+
+
+def _load_on_frozen_history(
+    beancount_file_path: str,
+    frozen: FrozenHistory,
+    parse_cache: ParseCache,
+) -> LoaderResult | None:
+    """Load the files that are not archived on top of the frozen history.
+
+    Returns:
+        The load result or None if the frozen history is outdated since some
+        of the summarised entries in the files that are not archived changed.
+    """
+    parsed_entries, parse_errors, options_map = _parse_recursive(
+        beancount_file_path, parse_cache, frozen.archived
+    )
+    frozen_until = frozen.frozen_until
+    entries = list(frozen.entries)
+    summarised = []
+    for entry in parsed_entries:
+        if entry.date < frozen_until and isinstance(entry, _SUMMARISED_TYPES):
+            summarised.append(entry)
+        else:
+            entries.append(entry)
+    if _fingerprint(summarised) != frozen.fingerprint:
+        return None
+    return _book_and_validate(
+        entries, [*frozen.errors, *parse_errors], options_map
+    )
+
+
+def frozen_snapshot_path(cache_dir: Path, beancount_file_path: str) -> Path:
+    """The path of the frozen history snapshot for a Beancount file."""
+    return snapshot_path(cache_dir, beancount_file_path).with_suffix(".frozen")
+
+
+def load_frozen(
+    beancount_file_path: str,
+    cache_dir: Path,
+    frozen_until: datetime.date,
+    parse_cache: ParseCache | None = None,
+) -> LoaderResult:
+    """Load a Beancount file with the history before a date frozen.
+
+    The history before the date is summarised once (see
+    :class:`FrozenHistory`) and stored in a snapshot in the cache directory,
+    which stays valid as long as the archived files and the source files of
+    the plugins do not change. On loads, only the other files are parsed,
+    and booked and validated on top of the summarised history.
+
+    Args:
+        beancount_file_path: Path to the main Beancount file.
+        cache_dir: The directory to store the snapshots in.
+        frozen_until: The date before which the history is frozen.
+        parse_cache: Used to parse the files.
+    """
+    parse_cache = parse_cache if parse_cache is not None else ParseCache()
+    path = frozen_snapshot_path(cache_dir, beancount_file_path)
+    frozen: FrozenHistory | None = read_snapshot(path)
+    if frozen is not None and frozen.frozen_until == frozen_until:
+        result = _load_on_frozen_history(
+            beancount_file_path, frozen, parse_cache
+        )
+        if result is not None:
+            return result
+
+    full_result = load_cached(beancount_file_path, cache_dir, parse_cache)
+    frozen = _freeze(
+        beancount_file_path, full_result, frozen_until, parse_cache
+    )
+    if frozen is None:
+        return full_result
+    plugin_files = _plugin_files(full_result[2])
+    write_snapshot(path, hash_files([*frozen.archived, *plugin_files]), frozen)
+    result = _load_on_frozen_history(beancount_file_path, frozen, parse_cache)
+    return result if result is not None else full_result
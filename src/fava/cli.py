@@ -93,6 +93,24 @@ def _add_env_filenames(filenames: tuple[str, ...]) -> tuple[str, ...]:
 @click.option(
     "--poll-watcher", is_flag=True, help="Use old polling-based watcher."
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, resolve_path=True),
+    metavar="<dir>",
+    help="Store snapshots of the loaded ledgers in this directory.",
+)
+@click.option(
+    "--parse-processes",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Parse included files in parallel in this many processes.",
+)
+@click.option(
+    "--background-reload",
+    is_flag=True,
+    help="Reload changed files in the background.",
+)
 @click.version_option(package_name="fava")
 def main(  # noqa: PLR0913
     *,
@@ -106,6 +124,9 @@ def main(  # noqa: PLR0913
     profile: bool = False,
     profile_dir: str | None = None,
     poll_watcher: bool = False,
+    cache_dir: str | None = None,
+    parse_processes: int = 1,
+    background_reload: bool = False,
 ) -> None:  # pragma: no cover
     """Start Fava for FILENAMES on http://<host>:<port>.
 
@@ -129,6 +150,9 @@ def main(  # noqa: PLR0913
         incognito=incognito,
         read_only=read_only,
         poll_watcher=poll_watcher,
+        cache_dir=cache_dir,
+        parse_processes=parse_processes,
+        background_reload=background_reload,
     )
 
     if prefix:
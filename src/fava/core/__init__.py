@@ -2,28 +2,36 @@
 
 from __future__ import annotations
 
+import copy
+import logging
+from bisect import bisect_left
 from dataclasses import dataclass
-from datetime import date
 from datetime import timedelta
 from functools import cached_property
 from functools import lru_cache
-from itertools import islice
-from itertools import takewhile
+from operator import attrgetter
 from pathlib import Path
+from threading import Lock
+from threading import RLock
+from threading import Thread
+from typing import Generic
+from typing import overload
 from typing import TYPE_CHECKING
+from typing import TypeVar
 
 from beancount.utils.encryption import is_encrypted_file
 
 from fava.beans.abc import Balance
+from fava.beans.abc import Open
 from fava.beans.abc import Price
 from fava.beans.abc import Transaction
 from fava.beans.account import account_tester
 from fava.beans.account import get_entry_accounts
 from fava.beans.funcs import get_position
-from fava.beans.funcs import hash_entry
-from fava.beans.helpers import slice_entry_dates
+from fava.beans.load import load_cached_with_derived
+from fava.beans.load import load_frozen
 from fava.beans.load import load_uncached
-from fava.beans.prices import FavaPriceMap
+from fava.beans.load import ParseCache
 from fava.beans.str import position_to_string
 from fava.core.accounts import AccountDict
 from fava.core.attributes import AttributesModule
@@ -32,18 +40,26 @@ from fava.core.charts import ChartModule
 from fava.core.commodities import CommoditiesModule
 from fava.core.conversion import conversion_from_str
 from fava.core.extensions import ExtensionModule
+from fava.core.fava_options import find_cache_dir_option
+from fava.core.fava_options import find_frozen_until_option
 from fava.core.fava_options import parse_options
 from fava.core.file import _incomplete_sortkey
 from fava.core.file import FileModule
+from fava.core.filter_cache import compact_positions
+from fava.core.filter_cache import entries_size
+from fava.core.filter_cache import FilterCache
+from fava.core.filter_cache import positions_size
 from fava.core.filters import AccountFilter
 from fava.core.filters import AdvancedFilter
 from fava.core.filters import TimeFilter
 from fava.core.group_entries import group_entries_by_type
 from fava.core.ingest import IngestModule
 from fava.core.inventory import CounterInventory
+from fava.core.ledger_index import index_for_snapshot
+from fava.core.ledger_index import LedgerIndex
 from fava.core.misc import FavaMisc
+from fava.core.module_base import FavaModule
 from fava.core.number import DecimalFormatModule
-from fava.core.query_shell import QueryShell
 from fava.core.tree import Tree
 from fava.core.watcher import Watcher
 from fava.core.watcher import WatchfilesWatcher
@@ -55,20 +71,27 @@ if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Iterable
     from collections.abc import Mapping
     from collections.abc import Sequence
+    from datetime import date
     from decimal import Decimal
     from typing import Literal
 
     from fava.beans.abc import Directive
+    from fava.beans.prices import FavaPriceMap
     from fava.beans.types import BeancountOptions
+    from fava.beans.types import LoaderResult
     from fava.core.conversion import Conversion
     from fava.core.fava_options import FavaOptions
     from fava.core.group_entries import EntriesByType
     from fava.core.inventory import SimpleCounterInventory
+    from fava.core.query_shell import QueryShell
     from fava.helpers import BeancountError
     from fava.util.date import DateRange
     from fava.util.date import Interval
 
 
+log = logging.getLogger(__name__)
+
+
 class EntryNotFoundForHashError(FavaAPIError):
     """Entry not found for hash."""
 
@@ -100,6 +123,49 @@ class JournalPage:
     total_pages: int
 
 
+def _account_positions(
+    ledger: FavaLedger, account: str | None
+) -> Sequence[int]:
+    """The positions of the entries matching the account filter."""
+    index = ledger.index
+    if not account:
+        return range(len(index.entries))
+    return compact_positions(AccountFilter(account).positions(index))
+
+
+def _advanced_positions(
+    ledger: FavaLedger,
+    account: str | None,
+    advanced_filter: AdvancedFilter | None,
+) -> Sequence[int]:
+    """The positions of the entries matching account and advanced filter.
+
+    The positions for the account filter are taken from the filter cache.
+    If the advanced filter refines a cached one by adding conjuncts to it,
+    like `#tag payee:"Shop"` does for `#tag`, only the entries matching the
+    cached filter are filtered.
+    """
+    cache = ledger.filter_cache
+    if advanced_filter is None:
+        return cache.get(
+            "account",
+            account,
+            lambda: _account_positions(ledger, account),
+            positions_size,
+        )
+    conjuncts = advanced_filter.conjuncts
+    for matched in range(len(conjuncts) - 1, 0, -1):
+        refined = cache.peek("advanced", (account, conjuncts[:matched]))
+        if refined is not None:
+            return compact_positions(
+                advanced_filter.positions(ledger.index, refined, matched)
+            )
+    positions = _advanced_positions(ledger, account, None)
+    return compact_positions(
+        advanced_filter.positions(ledger.index, positions)
+    )
+
+
 class FilteredLedger:
     """Filtered Beancount ledger."""
 
@@ -107,14 +173,19 @@ class FilteredLedger:
         "__dict__",  # for the cached_property decorator
         "_date_first",
         "_date_last",
-        "_pages",
         "date_range",
         "entries",
         "ledger",
+        "positions",
     )
     _date_first: date | None
     _date_last: date | None
 
+    #: The positions of the filtered entries in the entries of the ledger
+    #: or None if they are filtered by time (which summarises the entries
+    #: before the time range).
+    positions: Sequence[int] | None
+
     def __init__(
         self,
         ledger: FavaLedger,
@@ -133,24 +204,28 @@ class FilteredLedger:
         """
         self.ledger = ledger
         self.date_range: DateRange | None = None
-        self._pages: (
-            tuple[
-                int,
-                Literal["asc", "desc"],
-                list[Sequence[tuple[int, Directive]]],
-            ]
-            | None
-        ) = None
-
-        entries = ledger.all_entries
-        if account:
-            entries = AccountFilter(account).apply(entries)
-        if filter and filter.strip():
-            entries = AdvancedFilter(filter.strip()).apply(entries)
+
+        index = ledger.index
+        account = account or None
+        filter = (filter and filter.strip()) or None  # noqa: A001
+        advanced_filter = AdvancedFilter(filter) if filter else None
+        positions = ledger.filter_cache.get(
+            "advanced",
+            (account, advanced_filter.conjuncts if advanced_filter else ()),
+            lambda: _advanced_positions(ledger, account, advanced_filter),
+            positions_size,
+        )
+        self.positions = positions
+        entries = index.entries_at(positions)
         if time:
             time_filter = TimeFilter(ledger.options, ledger.fava_options, time)
-            entries = time_filter.apply(entries)
+            entries = (
+                time_filter.apply_to_index(index)
+                if entries is index.entries
+                else time_filter.apply(entries)
+            )
             self.date_range = time_filter.date_range
+            self.positions = None
         self.entries = entries
 
         if self.date_range:
@@ -180,6 +255,8 @@ class FilteredLedger:
     @cached_property
     def entries_with_all_prices(self) -> Sequence[Directive]:
         """The filtered entries, with all prices added back in for queries."""
+        if self.positions is not None:
+            return self.ledger.index.entries_with_prices(self.positions)
         entries = [*self.entries, *self.ledger.all_entries_by_type.Price]
         entries.sort(key=_incomplete_sortkey)
         return entries
@@ -189,15 +266,39 @@ class FilteredLedger:
         """The filtered entries, without prices for journals."""
         return [e for e in self.entries if not isinstance(e, Price)]
 
+    @cached_property
+    def entries_by_type(self) -> EntriesByType:
+        """The filtered entries grouped by type."""
+        if self.entries is self.ledger.index.entries:
+            return self.ledger.all_entries_by_type
+        return group_entries_by_type(self.entries)
+
+    def _tree(self) -> Tree:
+        """Build a tree for the filtered entries.
+
+        If the entries are not filtered by time, the balances are summed
+        from the posting table of the ledger.
+        """
+        if self.positions is None:
+            return Tree(self.entries)
+        table = self.ledger.index.posting_table
+        tree = Tree(
+            create_accounts=[
+                entry.account for entry in self.entries_by_type.Open
+            ]
+        )
+        tree.insert_balances(table.balances(table.rows(self.positions)))
+        return tree
+
     @cached_property
     def root_tree(self) -> Tree:
         """A root tree."""
-        return Tree(self.entries)
+        return self._tree()
 
     @cached_property
     def root_tree_closed(self) -> Tree:
         """A root tree for the balance sheet."""
-        tree = Tree(self.entries)
+        tree = self._tree()
         tree.cap(self.ledger.options)
         return tree
 
@@ -268,55 +369,106 @@ class FilteredLedger:
             directive) tuples in reverse chronological order and the total
             number of pages.
         """
-        if (
-            self._pages is None
-            or self._pages[0] != per_page
-            or self._pages[1] != order
-        ):
-            pages: list[Sequence[tuple[int, Directive]]] = []
-            enumerated = list(enumerate(self.entries_without_prices))
-            entries = (
-                iter(enumerated) if order == "asc" else reversed(enumerated)
-            )
-            while batch := tuple(islice(entries, per_page)):
-                pages.append(batch)
-            if not pages:
-                pages.append([])
-            self._pages = (per_page, order, pages)
-        _per_pages, _order, pages = self._pages
-        total = len(pages)
+        entries = self.entries_without_prices
+        total = max(1, -(-len(entries) // per_page))
         if page > total:
             return None
-        return JournalPage(pages[page - 1], total)
+        if order == "asc":
+            start = (page - 1) * per_page
+            end = min(start + per_page, len(entries))
+            indices = range(start, end)
+        else:
+            end = len(entries) - (page - 1) * per_page
+            start = max(end - per_page, 0)
+            indices = range(end - 1, start - 1, -1)
+        return JournalPage(tuple((i, entries[i]) for i in indices), total)
+
+
+M = TypeVar("M", bound=FavaModule)
+
+
+class _LazyModule(Generic[M]):
+    """A module of a :class:`FavaLedger` that is loaded on demand.
+
+    The `load_file` method of the module is run on the first access to it
+    after each (re)load of the ledger.
+    """
+
+    def __set_name__(self, owner: type[FavaLedger], name: str) -> None:
+        self.name = name
+        self.attribute = f"_{name}"
+
+    @overload
+    def __get__(
+        self, ledger: None, owner: type[FavaLedger]
+    ) -> _LazyModule[M]: ...
+
+    @overload
+    def __get__(self, ledger: FavaLedger, owner: type[FavaLedger]) -> M: ...
+
+    def __get__(
+        self, ledger: FavaLedger | None, owner: type[FavaLedger]
+    ) -> M | _LazyModule[M]:
+        if ledger is None:
+            return self
+        module: M = getattr(ledger, self.attribute)
+        generation = ledger._generation  # noqa: SLF001
+        loaded = ledger._module_generations  # noqa: SLF001
+        if loaded.get(self.name) != generation:
+            with ledger._module_lock:  # noqa: SLF001
+                if loaded.get(self.name) != generation:
+                    module.load_file()
+                    loaded[self.name] = generation
+        return module
+
+    def __set__(self, ledger: FavaLedger, module: M) -> None:
+        setattr(ledger, self.attribute, module)
+
+    def get_unloaded(self, ledger: FavaLedger) -> M:
+        """The module of a ledger, without loading it."""
+        module: M = getattr(ledger, self.attribute)
+        return module
 
 
 class FavaLedger:
     """Interface for a Beancount ledger."""
 
     __slots__ = (
+        "_accounts",
+        "_attributes",
+        "_background_reload",
+        "_budgets",
+        "_cache_dir",
+        "_commodities",
+        "_frozen_until",
+        "_full_history",
+        "_full_history_ledger",
+        "_generation",
+        "_ingest",
         "_is_encrypted",
-        "accounts",
-        "accounts",
+        "_misc",
+        "_module_generations",
+        "_module_lock",
+        "_mtime",
+        "_parse_cache",
+        "_query_shell",
+        "_reload_lock",
+        "_successor",
         "all_entries",
         "all_entries_by_type",
-        "attributes",
         "beancount_file_path",
-        "budgets",
         "charts",
-        "commodities",
         "extensions",
         "fava_options",
         "fava_options_errors",
         "file",
+        "filter_cache",
         "format_decimal",
         "get_entry",
-        "get_filtered",
-        "ingest",
+        "index",
         "load_errors",
-        "misc",
         "options",
         "prices",
-        "query_shell",
         "watcher",
     )
 
@@ -341,20 +493,23 @@ class FavaLedger:
     #: Dict of list of all (unfiltered) entries by type.
     all_entries_by_type: EntriesByType
 
+    #: Data derived from all entries, shared by the modules.
+    index: LedgerIndex
+
     #: A :class:`.AccountDict` module - details about the accounts.
-    accounts: AccountDict
+    accounts = _LazyModule[AccountDict]()
 
     #: An :class:`AttributesModule` instance.
-    attributes: AttributesModule
+    attributes = _LazyModule[AttributesModule]()
 
     #: A :class:`.BudgetModule` instance.
-    budgets: BudgetModule
+    budgets = _LazyModule[BudgetModule]()
 
     #: A :class:`.ChartModule` instance.
     charts: ChartModule
 
     #: A :class:`.CommoditiesModule` instance.
-    commodities: CommoditiesModule
+    commodities = _LazyModule[CommoditiesModule]()
 
     #: A :class:`.ExtensionModule` instance.
     extensions: ExtensionModule
@@ -366,25 +521,68 @@ class FavaLedger:
     format_decimal: DecimalFormatModule
 
     #: A :class:`.IngestModule` instance.
-    ingest: IngestModule
+    ingest = _LazyModule[IngestModule]()
 
     #: A :class:`.FavaMisc` instance.
-    misc: FavaMisc
-
-    #: A :class:`.QueryShell` instance.
-    query_shell: QueryShell
+    misc = _LazyModule[FavaMisc]()
 
-    def __init__(self, path: str, *, poll_watcher: bool = False) -> None:
+    def __init__(
+        self,
+        path: str,
+        *,
+        poll_watcher: bool = False,
+        cache_dir: str | None = None,
+        parse_processes: int = 1,
+        background_reload: bool = False,
+        loaded: tuple[LoaderResult, LedgerIndex | None] | None = None,
+        parse_cache: ParseCache | None = None,
+        full_history: bool = False,
+    ) -> None:
         """Create an interface for a Beancount ledger.
 
         Arguments:
             path: Path to the main Beancount file.
             poll_watcher: Whether to use the polling file watcher.
+            cache_dir: A directory to store snapshots of the loaded ledger in.
+                This takes precedence over the `cache-dir` option.
+            parse_processes: The number of processes to parse files in.
+            background_reload: Whether to reload the ledger in a background
+                thread into a new ledger object instead of in place.
+            loaded: The result of loading the file and optionally its index,
+                if it has already been loaded elsewhere, e.g., in another
+                process.
+            parse_cache: The cache of parse results to reload the files with,
+                e.g., the one that they were parsed with for ``loaded``.
+                Takes precedence over ``parse_processes``.
+            full_history: Whether to always load the full history, ignoring
+                the `frozen-until` option.
         """
         #: The path to the main Beancount file.
         self.beancount_file_path = path
         self._is_encrypted = is_encrypted_file(path)
-        self.get_filtered = lru_cache(maxsize=16)(self._get_filtered)
+        self._cache_dir = cache_dir
+        self._full_history = full_history
+        self._parse_cache = (
+            parse_cache
+            if parse_cache is not None
+            else ParseCache(parse_processes)
+        )
+        self._background_reload = background_reload
+        self._reload_lock = Lock()
+        self.watcher = WatchfilesWatcher() if not poll_watcher else Watcher()
+        self._setup(loaded=loaded)
+
+    def _setup(
+        self,
+        file_lock: Lock | None = None,
+        loaded: tuple[LoaderResult, LedgerIndex | None] | None = None,
+    ) -> None:
+        """Create the modules and load the file."""
+        self._successor: FavaLedger | None = None
+        self._generation = 0
+        self._module_generations: dict[str, int] = {}
+        self._module_lock = RLock()
+        self.filter_cache = FilterCache()
         self.get_entry = lru_cache(maxsize=16)(self._get_entry)
 
         self.accounts = AccountDict(self)
@@ -393,27 +591,60 @@ class FavaLedger:
         self.charts = ChartModule(self)
         self.commodities = CommoditiesModule(self)
         self.extensions = ExtensionModule(self)
-        self.file = FileModule(self)
+        self.file = FileModule(self, file_lock)
         self.format_decimal = DecimalFormatModule(self)
         self.ingest = IngestModule(self)
         self.misc = FavaMisc(self)
-        self.query_shell = QueryShell(self)
+        self._query_shell: QueryShell | None = None
 
-        self.watcher = WatchfilesWatcher() if not poll_watcher else Watcher()
+        self.load_file(loaded)
+        self._mtime = self.watcher.last_checked
 
-        self.load_file()
+    def load_file(
+        self,
+        loaded: tuple[LoaderResult, LedgerIndex | None] | None = None,
+    ) -> None:
+        """Load the main file and all included files and set attributes.
 
-    def load_file(self) -> None:
-        """Load the main file and all included files and set attributes."""
-        self.all_entries, self.load_errors, self.options = load_uncached(
-            self.beancount_file_path,
-            is_encrypted=self._is_encrypted,
-        )
-        self.get_filtered.cache_clear()
+        Args:
+            loaded: The result of loading the file and optionally its index,
+                if it has already been loaded elsewhere.
+        """
+        self._generation += 1
+        cache_dir = self.cache_dir
+        self._frozen_until = self.frozen_until
+        index: LedgerIndex | None = None
+        if loaded is not None:
+            result, index = loaded
+        elif cache_dir is not None and self._frozen_until is not None:
+            result = load_frozen(
+                self.beancount_file_path,
+                cache_dir,
+                self._frozen_until,
+                self._parse_cache,
+            )
+        elif cache_dir is not None:
+            # The index is stored in the snapshot as well.
+            result, index = load_cached_with_derived(
+                self.beancount_file_path,
+                cache_dir,
+                index_for_snapshot,
+                self._parse_cache,
+            )
+        else:
+            result = load_uncached(
+                self.beancount_file_path,
+                is_encrypted=self._is_encrypted,
+                parse_cache=self._parse_cache,
+            )
+        self.all_entries, self.load_errors, self.options = result
+        self.filter_cache.clear()
         self.get_entry.cache_clear()
+        self._full_history_ledger: FavaLedger | None = None
 
-        self.all_entries_by_type = group_entries_by_type(self.all_entries)
-        self.prices = FavaPriceMap(self.all_entries_by_type.Price)
+        self.index = index if index is not None else LedgerIndex(result[0])
+        self.all_entries_by_type = self.index.by_type
+        self.prices = self.index.prices
 
         self.fava_options, self.fava_options_errors = parse_options(
             self.all_entries_by_type.Custom,
@@ -424,22 +655,15 @@ class FavaLedger:
         else:
             self.watcher.update(*self.paths_to_watch())
 
-        # Call load_file of all modules.
-        self.accounts.load_file()
-        self.attributes.load_file()
-        self.budgets.load_file()
+        # Call load_file of all modules that are not loaded lazily.
         self.charts.load_file()
-        self.commodities.load_file()
         self.extensions.load_file()
         self.file.load_file()
         self.format_decimal.load_file()
-        self.misc.load_file()
-        self.query_shell.load_file()
-        self.ingest.load_file()
 
         self.extensions.after_load_file()
 
-    def _get_filtered(
+    def get_filtered(
         self,
         account: str | None = None,
         filter: str | None = None,  # noqa: A002
@@ -447,30 +671,131 @@ class FavaLedger:
     ) -> FilteredLedger:
         """Filter the ledger.
 
+        The filtered ledgers and the results of their filter stages are
+        cached in :attr:`filter_cache`.
+
         Args:
             account: The account filter.
             filter: The advanced filter.
             time: The time filter.
         """
-        return FilteredLedger(
-            ledger=self, account=account, filter=filter, time=time
+        if self._frozen_until is not None and time:
+            # A time filter that starts before the summarised history asks
+            # for its details, which only the full history has.
+            time_filter = TimeFilter(self.options, self.fava_options, time)
+            if time_filter.date_range.begin < self._frozen_until:
+                return self.full_history.get_filtered(account, filter, time)
+        account = account or None
+        filter = (filter and filter.strip()) or None  # noqa: A001
+        time = time or None
+        return self.filter_cache.get(
+            "time",
+            (account, filter, time),
+            lambda: FilteredLedger(
+                ledger=self, account=account, filter=filter, time=time
+            ),
+            lambda filtered: entries_size(filtered.entries),
         )
 
+    @property
+    def cache_dir(self) -> Path | None:
+        """The directory that snapshots of this ledger are stored in."""
+        # Never write the contents of an encrypted file to disk.
+        if self._is_encrypted:  # pragma: no cover
+            return None
+        cache_dir = self._cache_dir or find_cache_dir_option(
+            self.beancount_file_path
+        )
+        return Path(cache_dir) if cache_dir else None
+
+    @property
+    def frozen_until(self) -> date | None:
+        """The date that the history of this ledger is frozen until.
+
+        The history before this date is only loaded in summarised form, see
+        :func:`fava.beans.load.load_frozen`. This requires a cache directory.
+        """
+        if self._full_history or self.cache_dir is None:
+            return None
+        return find_frozen_until_option(self.beancount_file_path)
+
+    @property
+    def full_history(self) -> FavaLedger:
+        """This ledger with the full history.
+
+        If the history of this ledger is frozen, this is a separate ledger
+        which is only loaded on first use, for the reports that need the
+        entries before the date that the history is frozen until. It is
+        dropped whenever this ledger is reloaded.
+        """
+        if self._frozen_until is None:
+            return self
+        with self._module_lock:
+            full_history = self._full_history_ledger
+            if full_history is None:
+                # This ledger is never checked for changes, so the polling
+                # watcher is used as it does not start a thread.
+                full_history = FavaLedger(
+                    self.beancount_file_path,
+                    poll_watcher=True,
+                    cache_dir=self._cache_dir,
+                    full_history=True,
+                )
+                self._full_history_ledger = full_history
+            return full_history
+
     @property
     def mtime(self) -> int:
         """The timestamp to the latest change of the underlying files."""
+        if self._background_reload:
+            return self._mtime
         return self.watcher.last_checked
 
+    @property
+    def query_shell(self) -> QueryShell:
+        """A :class:`.QueryShell` instance.
+
+        Importing the query shell is slow, so it is only created on first use.
+        """
+        if self._query_shell is None:
+            with self._module_lock:
+                if self._query_shell is None:
+                    from fava.core.query_shell import QueryShell  # noqa: PLC0415
+
+                    self._query_shell = QueryShell(self)
+        return self._query_shell
+
+    @property
+    def latest(self) -> FavaLedger:
+        """The most recently loaded ledger object for this ledger.
+
+        With background reloading, each reload creates a new ledger object.
+        Existing ones are left unchanged, so that requests which are using
+        them see a consistent state.
+        """
+        ledger = self
+        while ledger._successor is not None:
+            ledger = ledger._successor
+        return ledger
+
     @property
     def errors(self) -> Sequence[BeancountError]:
-        """The errors that the Beancount loading plus Fava module errors."""
+        """The errors that the Beancount loading plus Fava module errors.
+
+        The lazily loaded modules are only loaded for this if they can have
+        errors, so that they are not loaded on every page.
+        """
+        has_budgets = any(
+            entry.type == "budget" for entry in self.all_entries_by_type.Custom
+        )
         return [
             *self.load_errors,
             *self.fava_options_errors,
-            *self.budgets.errors,
+            *(self.budgets.errors if has_budgets else ()),
             *self.extensions.errors,
-            *self.misc.errors,
-            *self.ingest.errors,
+            # These only depend on the options, not on the loaded module.
+            *FavaLedger.misc.get_unloaded(self).errors,
+            *(self.ingest.errors if self.fava_options.import_config else ()),
         ]
 
     @property
@@ -496,8 +821,10 @@ class FavaLedger:
             A tuple (files, directories).
         """
         files = [Path(i) for i in self.options["include"]]
-        if self.ingest.module_path:
-            files.append(self.ingest.module_path)
+        # The path of the import config does not need the module loaded.
+        module_path = FavaLedger.ingest.get_unloaded(self).module_path
+        if module_path:
+            files.append(module_path)
         return (
             files,
             [
@@ -517,11 +844,75 @@ class FavaLedger:
         # We can't reload an encrypted file, so act like it never changes.
         if self._is_encrypted:  # pragma: no cover
             return False
+        if self._background_reload:
+            return self._changed_in_background()
         changed = self.watcher.check()
         if changed:
             self.load_file()
         return changed
 
+    def reload(self) -> None:
+        """Reload the ledger.
+
+        With background reloading, this loads a new ledger object in the
+        current thread (see :attr:`latest`), otherwise this is the same as
+        :meth:`load_file`.
+        """
+        if not self._background_reload:
+            self.load_file()
+            return
+        with self._reload_lock:
+            ledger = self.latest
+            ledger._successor = ledger._load_successor()  # noqa: SLF001
+
+    def reload_after_write(self) -> None:
+        """Reload the ledger after Fava has written to one of its files.
+
+        Without background reloading, the change is picked up by the next
+        call to :meth:`changed`. With it, the ledger is reloaded in the
+        current thread, so that the response to the edit is not stale.
+        """
+        if self._background_reload:
+            self.reload()
+
+    def _changed_in_background(self) -> bool:
+        """Start a background reload if a file changed since loading.
+
+        Returns:
+            True if this ledger has been replaced by a newer one.
+        """
+        if (
+            self._successor is None
+            and (
+                self.watcher.check() or self.watcher.last_checked > self._mtime
+            )
+            # The lock is released by the background thread.
+            and self._reload_lock.acquire(blocking=False)
+        ):
+            Thread(target=self._reload_in_background, daemon=True).start()
+        return self._successor is not None
+
+    def _reload_in_background(self) -> None:
+        try:
+            if self._successor is None:
+                self._successor = self._load_successor()
+        except Exception:  # pragma: no cover
+            log.exception("Reloading %s failed", self.beancount_file_path)
+        finally:
+            self._reload_lock.release()
+
+    def _load_successor(self) -> FavaLedger:
+        """Load a new ledger object that shares the configuration and state.
+
+        The watcher, parse cache and locks are shared with the new object.
+        """
+        # Files changed after this point will cause another reload.
+        mtime = self.watcher.last_checked
+        ledger = copy.copy(self)
+        ledger._setup(self.file._lock)  # noqa: SLF001
+        ledger._mtime = mtime  # noqa: SLF001
+        return ledger
+
     def interval_balances(
         self,
         filtered: FilteredLedger,
@@ -548,20 +939,45 @@ class FavaLedger:
             if account.startswith(account_name)
         ]
 
-        interval_ranges = list(reversed(filtered.interval_ranges(interval)))
-        interval_balances = [
-            Tree(
-                slice_entry_dates(
-                    filtered.entries,
-                    date.min if accumulate else date_range.begin,
-                    date_range.end,
-                ),
-                min_accounts,
-            )
-            for date_range in interval_ranges
-        ]
-
-        return interval_balances, interval_ranges
+        # The balances are summed in one pass over the entries. For the
+        # accumulated balances, the running balances of the accounts are
+        # carried over from one interval to the next (instead of adding
+        # the balances of the intervals, which could give the numbers with
+        # different exponents).
+        entries = filtered.entries
+        interval_ranges = filtered.interval_ranges(interval)
+        balances: dict[str, CounterInventory] = {}
+        opened: dict[str, None] = {}
+        interval_balances = []
+        index = 0
+        for date_range in interval_ranges:
+            if not accumulate:
+                balances = {}
+                opened = {}
+                while (
+                    index < len(entries)
+                    and entries[index].date < date_range.begin
+                ):
+                    index += 1
+            while (
+                index < len(entries) and entries[index].date < date_range.end
+            ):
+                entry = entries[index]
+                if isinstance(entry, Open):
+                    opened[entry.account] = None
+                for posting in getattr(entry, "postings", []):
+                    balance = balances.get(posting.account)
+                    if balance is None:
+                        balance = balances[posting.account] = (
+                            CounterInventory()
+                        )
+                    balance.add_position(posting)
+                index += 1
+            tree = Tree(create_accounts=[*min_accounts, *opened])
+            tree.insert_balances(balances)
+            interval_balances.append(tree)
+
+        return interval_balances[::-1], interval_ranges[::-1]
 
     @listify
     def account_journal(
@@ -614,6 +1030,28 @@ class FavaLedger:
                     conv.apply(balance, prices, entry.date),
                 )
 
+    def balance_before(
+        self,
+        account: str,
+        date: date,
+        *,
+        with_children: bool = False,
+    ) -> CounterInventory:
+        """The balance of an account from all entries before a date.
+
+        This is the same as adding the postings of the account to a
+        :class:`CounterInventory` in order, but starts from the running
+        balance at the closest checkpoint of the account.
+
+        Arguments:
+            account: An account name.
+            date: A date.
+            with_children: Whether to include the postings of subaccounts.
+        """
+        return self.index.running_balances.balance_before(
+            account, date, with_children=with_children
+        )
+
     def _get_entry(self, entry_hash: str) -> Directive:
         """Find an entry.
 
@@ -627,12 +1065,10 @@ class FavaLedger:
             EntryNotFoundForHashError: If there is no entry for the given hash.
         """
         try:
-            return next(
-                entry
-                for entry in self.all_entries
-                if entry_hash == hash_entry(entry)
-            )
-        except StopIteration as exc:
+            return self.index.entry_hashes[entry_hash]
+        except KeyError as exc:
+            if self._frozen_until is not None:
+                return self.full_history.get_entry(entry_hash)
             raise EntryNotFoundForHashError(entry_hash) from exc
 
     def context(
@@ -654,19 +1090,25 @@ class FavaLedger:
             Balance or Transaction then ``before`` and ``after`` contain
             the balances before and after the entry of the affected accounts.
         """
+        if (
+            self._frozen_until is not None
+            and entry_hash not in self.index.entry_hashes
+        ):
+            return self.full_history.context(entry_hash)
         entry = self.get_entry(entry_hash)
 
         if not isinstance(entry, (Balance, Transaction)):
             return entry, None, None
 
-        entry_accounts = get_entry_accounts(entry)
-        balances = {account: CounterInventory() for account in entry_accounts}
-        for entry_ in takewhile(lambda e: e is not entry, self.all_entries):
-            if isinstance(entry_, Transaction):
-                for posting in entry_.postings:
-                    balance = balances.get(posting.account)
-                    if balance is not None:
-                        balance.add_position(posting)
+        entries = self.index.entries
+        position = bisect_left(entries, entry.date, key=attrgetter("date"))
+        while position < len(entries) and entries[position] is not entry:
+            position += 1
+        running_balances = self.index.running_balances
+        balances = {
+            account: running_balances.balance_before_entry(account, position)
+            for account in get_entry_accounts(entry)
+        }
 
         def visualise(inv: CounterInventory) -> Sequence[str]:
             return [position_to_string(pos) for pos in inv.positions()]
@@ -11,10 +11,9 @@ from fava.beans.abc import Close
 from fava.beans.flags import FLAG_UNREALIZED
 from fava.beans.funcs import hash_entry
 from fava.core.conversion import UNITS
-from fava.core.group_entries import group_entries_by_account
 from fava.core.group_entries import TransactionPosting
+from fava.core.inventory import CounterInventory
 from fava.core.module_base import FavaModule
-from fava.core.tree import Tree
 from fava.util.date import local_today
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -24,7 +23,6 @@ if TYPE_CHECKING:  # pragma: no cover
 
     from fava.beans.abc import Directive
     from fava.beans.abc import Meta
-    from fava.core.tree import TreeNode
 
 
 def get_last_entry(
@@ -67,12 +65,18 @@ def uptodate_status(
     return None
 
 
-def balance_string(tree_node: TreeNode) -> str:
+def balance_string(
+    account: str,
+    txn_postings: Sequence[Directive | TransactionPosting],
+) -> str:
     """Balance directive for the given account for today."""
-    account = tree_node.name
+    balance = CounterInventory()
+    for txn_posting in txn_postings:
+        if isinstance(txn_posting, TransactionPosting):
+            balance.add_position(txn_posting.posting)
     today = str(local_today())
     res = ""
-    for currency, number in UNITS.apply(tree_node.balance).items():
+    for currency, number in UNITS.apply(balance).items():
         res += f"{today} balance {account:<28} {number:>15} {currency}\n"
     return res
 
@@ -133,26 +137,26 @@ class AccountDict(FavaModule, dict[str, AccountData]):
 
     def load_file(self) -> None:  # noqa: D102
         self.clear()
-        entries_by_account = group_entries_by_account(self.ledger.all_entries)
-        tree = Tree(self.ledger.all_entries)
+        index = self.ledger.index
         for open_entry in self.ledger.all_entries_by_type.Open:
             meta = open_entry.meta
-            account_data = self.setdefault(open_entry.account)
+            account = open_entry.account
+            account_data = self.setdefault(account)
             account_data.meta = meta
             account_data.currencies = open_entry.currencies
 
-            txn_postings = entries_by_account[open_entry.account]
-            last = get_last_entry(txn_postings)
+            last = index.last_entry.get(account)
             if last is not None and not isinstance(last, Close):
                 account_data.last_entry = LastEntry(
                     date=last.date,
                     entry_hash=hash_entry(last),
                 )
             if meta.get("fava-uptodate-indication"):
+                txn_postings = index.entries_by_account.get(account, [])
                 account_data.uptodate_status = uptodate_status(txn_postings)
                 if account_data.uptodate_status != "green":
                     account_data.balance_string = balance_string(
-                        tree.get(open_entry.account),
+                        account, txn_postings
                     )
         for close in self.ledger.all_entries_by_type.Close:
             self.setdefault(close.account).close_date = close.date
@@ -0,0 +1,90 @@
+"""A sorted index of the amounts of all postings."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+    from decimal import Decimal
+
+    from fava.beans.abc import Directive
+    from fava.core.filter_parser import MatchAmount
+
+
+class AmountIndex:
+    """The absolute amounts of the units of all postings, sorted.
+
+    The comparisons of a :class:`~fava.core.filter_parser.MatchAmount` each
+    select a contiguous range of the sorted amounts, which is found by
+    bisection, so that the entries with a posting with large (or small)
+    units can be found without looking at all postings.
+
+    Args:
+        entries: The entries to index.
+    """
+
+    __slots__ = ("_unknown", "amounts", "positions")
+
+    #: The absolute numbers of the units of all postings, in ascending order.
+    amounts: Sequence[Decimal]
+
+    #: For each amount, the position of the entry of its posting.
+    positions: Sequence[int]
+
+    def __init__(self, entries: Sequence[Directive]) -> None:
+        pairs: list[tuple[Decimal, int]] = []
+        unknown: list[int] = []
+        for position, entry in enumerate(entries):
+            for posting in getattr(entry, "postings", ()):
+                number = getattr(posting.units, "number", None)
+                if number is None:
+                    unknown.append(position)
+                else:
+                    pairs.append((abs(number), position))
+        pairs.sort()
+        self.amounts = [amount for amount, _ in pairs]
+        self.positions = [position for _, position in pairs]
+        # The positions of entries with a posting without a number, which
+        # never matches.
+        self._unknown = unknown
+
+    def _range(self, match: MatchAmount) -> tuple[int, int]:
+        """The range of the amounts that match."""
+        amounts = self.amounts
+        op = match.op
+        if op == "<":
+            return 0, bisect_left(amounts, match.value)
+        if op == "<=":
+            return 0, bisect_right(amounts, match.value)
+        if op == ">":
+            return bisect_right(amounts, match.value), len(amounts)
+        if op == ">=":
+            return bisect_left(amounts, match.value), len(amounts)
+        return (
+            bisect_left(amounts, match.value),
+            bisect_right(amounts, match.value),
+        )
+
+    def search(
+        self, match: MatchAmount, *, negate: bool = False
+    ) -> Sequence[int]:
+        """The positions of the entries with a posting with matching units.
+
+        Args:
+            match: The amount comparison.
+            negate: Find the entries with a posting that does not match
+                instead.
+
+        Returns:
+            The sorted positions of the entries.
+        """
+        start, end = self._range(match)
+        positions = self.positions
+        if negate:
+            return sorted(
+                {*positions[:start], *positions[end:], *self._unknown}
+            )
+        return sorted(set(positions[start:end]))
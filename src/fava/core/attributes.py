@@ -9,6 +9,8 @@ from fava.util.date import END_OF_YEAR
 from fava.util.ranking import ExponentialDecayRanker
 
 if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Iterable
     from collections.abc import Sequence
 
     from fava.beans.abc import Directive
@@ -31,11 +33,19 @@ def get_active_years(
         A reverse sorted list of years or fiscal years that occur in the
         entries.
     """
+    return _active_years((entry.date for entry in entries), fye)
+
+
+def _active_years(
+    dates: Iterable[datetime.date],
+    fye: FiscalYearEnd,
+) -> list[str]:
+    """Return active years for a sorted iterable of dates."""
     years = []
     if fye == END_OF_YEAR:
         prev_year = None
-        for entry in entries:
-            year = entry.date.year
+        for date in dates:
+            year = date.year
             if year != prev_year:
                 prev_year = year
                 years.append(year)
@@ -43,12 +53,11 @@ def get_active_years(
     month = fye.month
     day = fye.day
     prev_year = None
-    for entry in entries:
-        date = entry.date
+    for date in dates:
         year = (
-            entry.date.year + 1
+            date.year + 1
             if date.month > month or (date.month == month and date.day > day)
-            else entry.date.year
+            else date.year
         )
         if year != prev_year:
             prev_year = year
@@ -69,61 +78,27 @@ class AttributesModule(FavaModule):
         self.years: Sequence[str] = []
 
     def load_file(self) -> None:  # noqa: D102
-        all_entries = self.ledger.all_entries
-
-        all_links = set()
-        all_tags = set()
-        for entry in all_entries:
-            links = getattr(entry, "links", None)
-            if links is not None:
-                all_links.update(links)
-            tags = getattr(entry, "tags", None)
-            if tags is not None:
-                all_tags.update(tags)
-        self.links = sorted(all_links)
-        self.tags = sorted(all_tags)
-
-        self.years = get_active_years(
-            all_entries,
+        index = self.ledger.index
+        self.links = index.links
+        self.tags = index.tags
+        self.years = _active_years(
+            index.dates,
             self.ledger.fava_options.fiscal_year_end,
         )
-
-        account_ranker = ExponentialDecayRanker(
-            sorted(self.ledger.accounts.keys()),
-        )
-        currency_ranker = ExponentialDecayRanker()
-        payee_ranker = ExponentialDecayRanker()
-
-        for txn in self.ledger.all_entries_by_type.Transaction:
-            if txn.payee:
-                payee_ranker.update(txn.payee, txn.date)
-            for posting in txn.postings:
-                account_ranker.update(posting.account, txn.date)
-                currency_ranker.update(posting.units.currency, txn.date)
-                if posting.cost and posting.cost.currency is not None:
-                    currency_ranker.update(posting.cost.currency, txn.date)
-
-        self.accounts = account_ranker.sort()
-        self.currencies = currency_ranker.sort()
-        self.payees = payee_ranker.sort()
+        self.accounts, self.currencies, self.payees = index.rankings
 
     def payee_accounts(self, payee: str) -> Sequence[str]:
         """Rank accounts for the given payee."""
         account_ranker = ExponentialDecayRanker(self.accounts)
-        transactions = self.ledger.all_entries_by_type.Transaction
-        for txn in transactions:
-            if txn.payee == payee:
-                for posting in txn.postings:
-                    account_ranker.update(posting.account, txn.date)
+        for txn in self.ledger.index.payees.get(payee, []):
+            for posting in txn.postings:
+                account_ranker.update(posting.account, txn.date)
         return account_ranker.sort()
 
     def payee_transaction(self, payee: str) -> Transaction | None:
         """Get the last transaction for a payee."""
-        transactions = self.ledger.all_entries_by_type.Transaction
-        for txn in reversed(transactions):
-            if txn.payee == payee:
-                return txn
-        return None
+        transactions = self.ledger.index.payees.get(payee)
+        return transactions[-1] if transactions else None
 
     def narration_transaction(self, narration: str) -> Transaction | None:
         """Get the last transaction for a narration."""
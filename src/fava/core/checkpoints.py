@@ -0,0 +1,211 @@
+"""Balances at checkpoints to quickly clamp entries to a date range."""
+
+from __future__ import annotations
+
+import datetime
+from bisect import bisect_left
+from bisect import bisect_right
+from operator import attrgetter
+from typing import Any
+from typing import TYPE_CHECKING
+
+from beancount.core import data
+from beancount.core import flags
+from beancount.core.account_types import is_income_statement_account
+from beancount.core.inventory import Inventory
+from beancount.ops.summarize import conversions
+from beancount.ops.summarize import create_entries_from_balances
+from beancount.parser import options
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.beans.types import BeancountOptions
+
+_get_date = attrgetter("date")
+
+
+class _State:
+    """The state of summarising the entries before some position.
+
+    This is what Beancount's summarisation accumulates: the balance of each
+    account that had a posting, the Open entries of the accounts that are
+    not closed and the last Price entry for each currency pair.
+
+    The inventories in the balances are shared between states and must not
+    be modified - :meth:`add_entries` replaces those that it changes.
+    """
+
+    __slots__ = ("balances", "open_entries", "price_entries")
+
+    def __init__(
+        self,
+        balances: dict[str, Inventory],
+        open_entries: dict[str, tuple[int, Any]],
+        price_entries: dict[tuple[str, str], Any],
+    ) -> None:
+        self.balances = balances
+        self.open_entries = open_entries
+        self.price_entries = price_entries
+
+    def copy(self) -> _State:
+        return _State(
+            dict(self.balances),
+            dict(self.open_entries),
+            dict(self.price_entries),
+        )
+
+    def add_entries(self, entries: Sequence[Any], start: int) -> None:
+        """Add the entries, which start at the given position."""
+        balances = self.balances
+        open_entries = self.open_entries
+        price_entries = self.price_entries
+        copied: set[str] = set()
+        for position, entry in enumerate(entries, start):
+            if isinstance(entry, data.Transaction):
+                for posting in entry.postings:
+                    account = posting.account
+                    if account not in copied:
+                        balance = balances.get(account)
+                        balances[account] = Inventory(balance)
+                        copied.add(account)
+                    balances[account].add_position(posting)
+            elif isinstance(entry, data.Open):
+                existing = open_entries.get(entry.account)
+                if existing is None or entry.date < existing[1].date:
+                    open_entries[entry.account] = (position, entry)
+            elif isinstance(entry, data.Close):
+                open_entries.pop(entry.account, None)
+            elif isinstance(entry, data.Price):
+                price_entries[entry.currency, entry.amount.currency] = entry
+
+
+class BalanceCheckpoints:
+    """Balances at the start of each month, to clamp entries to a date range.
+
+    Clamping entries to a date range with Beancount's `clamp_opt` summarises
+    all entries before the start of the range, which needs a pass over all
+    of them. With the state of this summarisation stored at the first entry
+    of each month, only the entries between the closest checkpoint and the
+    start of the range need to be added to it.
+
+    Args:
+        entries: The entries, sorted by date.
+    """
+
+    __slots__ = ("_positions", "_states", "entries")
+
+    def __init__(self, entries: Sequence[Directive]) -> None:
+        self.entries = entries
+        self._positions: list[int] = []
+        self._states: list[_State] = []
+
+        state = _State({}, {}, {})
+        start = 0
+        month = None
+        for position, entry in enumerate(entries):
+            entry_month = (entry.date.year, entry.date.month)
+            if entry_month != month:
+                month = entry_month
+                state = state.copy()
+                state.add_entries(entries[start:position], start)
+                self._positions.append(position)
+                self._states.append(state)
+                start = position
+
+    def _state_before(self, position: int) -> _State:
+        """The summarisation state for the entries before a position."""
+        checkpoint = bisect_right(self._positions, position) - 1
+        if checkpoint < 0:
+            return _State({}, {}, {})
+        start = self._positions[checkpoint]
+        state = self._states[checkpoint].copy()
+        if start < position:
+            state.add_entries(self.entries[start:position], start)
+        return state
+
+    def clamp(
+        self,
+        begin: datetime.date,
+        end: datetime.date,
+        options_map: BeancountOptions,
+    ) -> list[Directive]:
+        """Clamp the entries to a date range.
+
+        This returns the same entries as Beancount's `clamp_opt`.
+
+        Args:
+            begin: The first date of the range.
+            end: One day beyond the last date of the range.
+            options_map: The Beancount options.
+
+        Returns:
+            The entries in the range, with the entries before it summarised
+            and conversions to balance the range inserted.
+        """
+        entries = self.entries
+        if not entries:
+            return []
+        account_types = options.get_account_types(options_map)  # type: ignore[no-untyped-call]
+        earnings, opening, _ = options.get_previous_accounts(options_map)  # type: ignore[no-untyped-call]
+        _, current_conversions = options.get_current_accounts(options_map)  # type: ignore[no-untyped-call]
+
+        begin_position = bisect_left(entries, begin, key=_get_date)
+        end_position = bisect_left(entries, end, key=_get_date)
+        state = self._state_before(begin_position)
+        summarize_date = begin - datetime.timedelta(days=1)
+
+        # Transfer the balances of income and expense accounts to equity.
+        transferred = {
+            account: balance
+            for account, balance in state.balances.items()
+            if is_income_statement_account(account, account_types)
+        }
+        transfer_entries = create_entries_from_balances(
+            transferred,
+            summarize_date,
+            earnings,
+            direction=False,
+            meta=data.new_metadata("<transfer_balances>", 0),
+            flag=flags.FLAG_TRANSFER,
+            narration_template=(
+                "Transfer balance for '{account}' (Transfer balance)"
+            ),
+        )
+        state.add_entries(transfer_entries, begin_position)
+
+        # Summarise the balances and keep open accounts and the last prices.
+        summarizing_entries = create_entries_from_balances(
+            state.balances,
+            summarize_date,
+            opening,
+            direction=True,
+            meta=data.new_metadata("<summarize>", 0),
+            flag=flags.FLAG_SUMMARIZE,
+            narration_template=(
+                "Opening balance for '{account}' (Summarization)"
+            ),
+        )
+        before_entries = sorted(
+            [entry for _, entry in sorted(state.open_entries.values())]
+            + sorted(state.price_entries.values(), key=data.entry_sortkey)
+            + summarizing_entries,
+            key=data.entry_sortkey,
+        )
+
+        # Balance assertions for the transferred accounts would fail.
+        after_entries = [
+            entry
+            for entry in entries[begin_position:end_position]
+            if not (
+                isinstance(entry, data.Balance)
+                and entry.account in transferred
+            )
+        ]
+        return conversions(  # type: ignore[return-value]
+            before_entries + after_entries,
+            current_conversions,
+            options_map["conversion_currency"],
+            end,
+        )
@@ -7,6 +7,7 @@ parsing the options.
 
 from __future__ import annotations
 
+import datetime
 import re
 from dataclasses import dataclass
 from dataclasses import field
@@ -24,7 +25,6 @@ from fava.util.date import END_OF_YEAR
 from fava.util.date import parse_fye_string
 
 if TYPE_CHECKING:  # pragma: no cover
-    import datetime
     from collections.abc import Sequence
 
     from fava.beans.abc import Custom
@@ -84,18 +84,25 @@ class InvalidFiscalYearEndOptionError(ValueError):  # noqa: D101
         super().__init__(f"Invalid 'fiscal_year_end' option: '{value}'.")
 
 
+class InvalidFrozenUntilOptionError(ValueError):  # noqa: D101
+    def __init__(self, value: str) -> None:
+        super().__init__(f"Invalid 'frozen_until' option: '{value}'.")
+
+
 @dataclass
 class FavaOptions:
     """Options for Fava that can be set in the Beancount file."""
 
     account_journal_include_children: bool = True
     auto_reload: bool = False
+    cache_dir: str | None = None
     collapse_pattern: Sequence[re.Pattern[str]] = field(default_factory=list)
     conversion_currencies: tuple[str, ...] = ()
     currency_column: int = 61
     default_file: str | None = None
     default_page: str = "income_statement/"
     fiscal_year_end: FiscalYearEnd = END_OF_YEAR
+    frozen_until: datetime.date | None = None
     import_config: str | None = None
     import_dirs: Sequence[str] = field(default_factory=list)
     indent: int = 2
@@ -122,6 +129,10 @@ class FavaOptions:
         # It's typed as Sequence so that it's not externally mutated
         self.collapse_pattern.append(pattern)  # type: ignore[attr-defined]  # ty:ignore[unresolved-attribute]
 
+    def set_cache_dir(self, value: str, filename: str) -> None:
+        """Set the cache_dir option."""
+        self.cache_dir = str((Path(filename).parent / value).absolute())
+
     def set_default_file(self, value: str, filename: str) -> None:
         """Set the default_file option."""
         self.default_file = (
@@ -137,6 +148,13 @@ class FavaOptions:
             raise InvalidFiscalYearEndOptionError(value)
         self.fiscal_year_end = fye
 
+    def set_frozen_until(self, value: str) -> None:
+        """Set the frozen_until option."""
+        try:
+            self.frozen_until = datetime.date.fromisoformat(value)
+        except ValueError as err:
+            raise InvalidFrozenUntilOptionError(value) from err
+
     def set_import_dirs(self, value: str) -> None:
         """Add an import directory."""
         # It's typed as Sequence so that it's not externally mutated
@@ -199,12 +217,16 @@ def parse_option_custom_entry(  # noqa: PLR0912
         raise NotAStringOptionError(key)
     filename, lineno = get_position(entry)
 
-    if key == "collapse_pattern":
+    if key == "cache_dir":
+        options.set_cache_dir(value, filename)
+    elif key == "collapse_pattern":
         options.set_collapse_pattern(value)
     elif key == "default_file":
         options.set_default_file(value, filename)
     elif key == "fiscal_year_end":
         options.set_fiscal_year_end(value)
+    elif key == "frozen_until":
+        options.set_frozen_until(value)
     elif key == "import_dirs":
         options.set_import_dirs(value)
     elif key == "insert_entry":
@@ -223,6 +245,66 @@ def parse_option_custom_entry(  # noqa: PLR0912
         setattr(options, key, tuple(value.strip().split(" ")))
 
 
+def _find_option(beancount_file_path: str, name: str) -> str | None:
+    """Find the value of an option in the source of the main file."""
+    try:
+        source = Path(beancount_file_path).read_bytes()
+    except OSError:
+        return None
+    option_re = re.compile(
+        rb'^\d{4}-\d{2}-\d{2}[ \t]+custom[ \t]+"fava-option"[ \t]+"'
+        + name.replace("-", "[-_]").encode()
+        + rb'"[ \t]+"([^"\n]*)"',
+        re.MULTILINE,
+    )
+    match = option_re.search(source)
+    return match[1].decode(errors="replace") if match is not None else None
+
+
+def find_cache_dir_option(beancount_file_path: str) -> str | None:
+    """Find the value of the cache-dir option in the main file.
+
+    Snapshots need to be looked up before the ledger is loaded, so this only
+    scans the source of the main file for the option instead of parsing it.
+
+    Args:
+        beancount_file_path: Path to the main Beancount file.
+
+    Returns:
+        The absolute path of the cache directory or None if it is not set.
+    """
+    value = _find_option(beancount_file_path, "cache-dir")
+    if value is None:
+        return None
+    options = FavaOptions()
+    options.set_cache_dir(value, beancount_file_path)
+    return options.cache_dir
+
+
+def find_frozen_until_option(
+    beancount_file_path: str,
+) -> datetime.date | None:
+    """Find the value of the frozen-until option in the main file.
+
+    Like the cache-dir option, this is needed before the ledger is loaded.
+
+    Args:
+        beancount_file_path: Path to the main Beancount file.
+
+    Returns:
+        The date or None if it is not set or invalid.
+    """
+    value = _find_option(beancount_file_path, "frozen-until")
+    if value is None:
+        return None
+    options = FavaOptions()
+    try:
+        options.set_frozen_until(value)
+    except InvalidFrozenUntilOptionError:
+        return None
+    return options.frozen_until
+
+
 def parse_options(
     custom_entries: Sequence[Custom],
 ) -> tuple[FavaOptions, list[OptionError]]:
@@ -111,9 +111,11 @@ def _file_newline_character(path: Path) -> str:
 class FileModule(FavaModule):
     """Functions related to reading/writing to Beancount files."""
 
-    def __init__(self, ledger: FavaLedger) -> None:
+    def __init__(
+        self, ledger: FavaLedger, lock: threading.Lock | None = None
+    ) -> None:
         super().__init__(ledger)
-        self._lock = threading.Lock()
+        self._lock = lock or threading.Lock()
 
     def get_source(self, path: Path) -> tuple[str, str]:
         """Get source files.
@@ -165,7 +167,7 @@ class FileModule(FavaModule):
             self.ledger.watcher.notify(path)
 
             self.ledger.extensions.after_write_source(str(path), source)
-            self.ledger.load_file()
+            self.ledger.reload()
 
             return _sha256_str(source)
 
@@ -193,6 +195,7 @@ class FileModule(FavaModule):
             insert_metadata_in_file(path, lineno, indent, key, value)
             self.ledger.watcher.notify(path)
             self.ledger.extensions.after_insert_metadata(entry, key, value)
+            self.ledger.reload_after_write()
 
     def save_entry_slice(
         self,
@@ -218,6 +221,7 @@ class FileModule(FavaModule):
             new_sha256sum = save_entry_slice(entry, source_slice, sha256sum)
             self.ledger.watcher.notify(Path(get_position(entry)[0]))
             self.ledger.extensions.after_entry_modified(entry, source_slice)
+            self.ledger.reload_after_write()
             return new_sha256sum
 
     def delete_entry_slice(self, entry_hash: str, sha256sum: str) -> None:
@@ -235,6 +239,7 @@ class FileModule(FavaModule):
             delete_entry_slice(entry, sha256sum)
             self.ledger.watcher.notify(Path(get_position(entry)[0]))
             self.ledger.extensions.after_delete_entry(entry)
+            self.ledger.reload_after_write()
 
     def insert_entries(self, entries: Sequence[Directive]) -> None:
         """Insert entries.
@@ -259,6 +264,7 @@ class FileModule(FavaModule):
                 self.ledger.watcher.notify(path)
                 self.ledger.fava_options.insert_entry = updated_insert_options
                 self.ledger.extensions.after_insert_entry(entry)
+            self.ledger.reload_after_write()
 
     def render_entries(self, entries: Sequence[Directive]) -> Iterable[Markup]:
         """Return entries in Beancount format.
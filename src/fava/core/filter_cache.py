@@ -0,0 +1,191 @@
+"""A cache for the stages of filtering a ledger."""
+
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+    from collections.abc import Hashable
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+T = TypeVar("T")
+
+#: The default memory budget of the filter cache, in bytes.
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+#: The estimated size of one item of a list of entry positions: the pointer
+#: in the list and (for all but the smallest ints) the int object.
+_POSITION_SIZE = 36
+
+#: The estimated size for each entry of a filtered ledger: the pointer in
+#: the list of entries and the data derived from it on demand, like the
+#: trees and the entries grouped by type.
+_ENTRY_SIZE = 64
+
+#: The estimated size of a cached value besides its items.
+_OVERHEAD = 256
+
+
+def compact_positions(positions: Sequence[int]) -> Sequence[int]:
+    """Store entry positions compactly, as an array of unsigned ints."""
+    if isinstance(positions, (range, array)):
+        return positions
+    return array("I", positions)
+
+
+def positions_size(positions: Sequence[int]) -> int:
+    """Estimate the memory used by a sequence of entry positions.
+
+    A range (for an empty filter) takes no memory per item.
+    """
+    if isinstance(positions, range):
+        return _OVERHEAD
+    if isinstance(positions, array):
+        return _OVERHEAD + positions.itemsize * len(positions)
+    return _OVERHEAD + _POSITION_SIZE * len(positions)
+
+
+def entries_size(entries: Sequence[Any]) -> int:
+    """Estimate the memory used by a filtered list of entries."""
+    return _OVERHEAD + _ENTRY_SIZE * len(entries)
+
+
+@dataclass
+class StageStats:
+    """Hits and misses of one filter stage."""
+
+    hits: int = 0
+    misses: int = 0
+
+
+class FilterCache:
+    """A cache for the stages of filtering a ledger.
+
+    Filtering happens in stages: the account filter, then the advanced
+    filter and finally the time filter. The result of each stage is cached
+    separately, keyed by its stage name and the filter values up to this
+    stage, so that filters that share a prefix - like all the time ranges
+    for a given account and advanced filter - share its result.
+
+    The cached values are evicted in least-recently-used order once their
+    estimated memory exceeds the budget. The most recently added value is
+    always kept, even if it exceeds the budget on its own.
+
+    Args:
+        max_size: The memory budget, in bytes.
+    """
+
+    __slots__ = (
+        "_lock",
+        "_size",
+        "_stats",
+        "_values",
+        "evictions",
+        "max_size",
+    )
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.evictions = 0
+        self._lock = Lock()
+        self._values: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._size = 0
+        self._stats: dict[str, StageStats] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def size(self) -> int:
+        """The estimated memory used by the cached values, in bytes."""
+        return self._size
+
+    @property
+    def stats(self) -> Mapping[str, StageStats]:
+        """The hits and misses for each stage."""
+        with self._lock:
+            return {
+                stage: StageStats(stats.hits, stats.misses)
+                for stage, stats in self._stats.items()
+            }
+
+    def get(
+        self,
+        stage: str,
+        key: Hashable,
+        compute: Callable[[], T],
+        size: Callable[[T], int],
+    ) -> T:
+        """Get the cached value for a stage, computing it if necessary.
+
+        The value is computed without holding the lock, as computing the
+        later stages will look up the earlier ones. If the computation
+        raises, nothing is cached.
+
+        Args:
+            stage: The name of the filter stage.
+            key: The filter values up to this stage.
+            compute: To compute the value if it is not cached.
+            size: To estimate the memory used by a computed value.
+        """
+        cache_key = (stage, key)
+        with self._lock:
+            stats = self._stats.get(stage)
+            if stats is None:
+                stats = self._stats[stage] = StageStats()
+            cached = self._values.get(cache_key)
+            if cached is not None:
+                self._values.move_to_end(cache_key)
+                stats.hits += 1
+                return cached[0]  # type: ignore[no-any-return]
+            stats.misses += 1
+
+        value = compute()
+        value_size = size(value)
+
+        with self._lock:
+            previous = self._values.pop(cache_key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._values[cache_key] = (value, value_size)
+            self._size += value_size
+            while self._size > self.max_size and len(self._values) > 1:
+                _, (_, evicted_size) = self._values.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+        return value
+
+    def peek(self, stage: str, key: Hashable) -> Any:
+        """Get the cached value for a stage, if there is one.
+
+        A found value counts as a hit, but missing ones do not count.
+
+        Args:
+            stage: The name of the filter stage.
+            key: The filter values up to this stage.
+
+        Returns:
+            The cached value or None.
+        """
+        cache_key = (stage, key)
+        with self._lock:
+            cached = self._values.get(cache_key)
+            if cached is None:
+                return None
+            self._values.move_to_end(cache_key)
+            self._stats.setdefault(stage, StageStats()).hits += 1
+            return cached[0]
+
+    def clear(self) -> None:
+        """Remove all cached values (the statistics are kept)."""
+        with self._lock:
+            self._values.clear()
+            self._size = 0
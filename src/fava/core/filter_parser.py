@@ -8,6 +8,7 @@ from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
 from decimal import Decimal
+from functools import lru_cache
 from typing import Any
 from typing import Literal
 from typing import TYPE_CHECKING
@@ -27,6 +28,7 @@ except ImportError:  # pragma: no cover
 if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Callable
     from collections.abc import Iterable
+    from collections.abc import Sequence
 
     from fava.beans.abc import Directive
     from fava.beans.abc import Posting
@@ -79,21 +81,37 @@ _LEXER = Lexer(
 class Match:
     """Match a string."""
 
-    __slots__ = ("match",)
+    __slots__ = ("match", "regex", "search")
 
     match: Callable[[str], bool]
 
+    #: The string to search for.
+    search: str
+
+    #: The compiled regular expression or None if the search string is not
+    #: a valid one and strings are compared for equality instead.
+    regex: re.Pattern[str] | None
+
     def __init__(self, search: str) -> None:
+        self.search = search
         try:
-            match = re.compile(search, re.IGNORECASE).search
+            self.regex = re.compile(search, re.IGNORECASE)
+            match = self.regex.search
             self.match = lambda s: bool(match(s))
         except re.error:
+            self.regex = None
             self.match = lambda s: s == search
 
     def __call__(self, obj: Any) -> bool:
         """Whether the string representation of the object matches."""
         return self.match(str(obj))
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Match) and other.search == self.search
+
+    def __hash__(self) -> int:
+        return hash(self.search)
+
 
 _OPERATORS: dict[Operator, Callable[[Any, Decimal], bool]] = {
     "<": operator.lt,
@@ -107,12 +125,14 @@ _OPERATORS: dict[Operator, Callable[[Any, Decimal], bool]] = {
 class MatchAmount:
     """Matches an amount."""
 
-    __slots__ = ("operator", "value")
+    __slots__ = ("op", "operator", "value")
 
+    op: Operator
     operator: Callable[[Any, Decimal], bool]
     value: Decimal
 
     def __init__(self, op: Operator, value: Decimal) -> None:
+        self.op = op
         self.value = value
         self.operator = _OPERATORS[op]
 
@@ -125,6 +145,16 @@ class MatchAmount:
             else False
         )
 
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, MatchAmount)
+            and other.op == self.op
+            and other.value == self.value
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.op, self.value))
+
 
 class FilterExpression(ABC):
     """A part of a parsed filter, matching entries or postings."""
@@ -382,6 +412,7 @@ class _FilterParser(ParserBase):
         return KeyMatch(key, MatchAmount(op, self.expect(NUMBER)))
 
 
+@lru_cache(maxsize=256)
 def parse_filter(string: str) -> FilterExpression:
     """Parse a filter expression.
 
@@ -399,6 +430,9 @@ def parse_filter(string: str) -> FilterExpression:
       links, strings and nested 'any(...)'/'all(...)' are not allowed inside
       them, and '>= 100' there matches the posting's own units directly
 
+    The parsed filters are cached - as filter expressions are immutable and
+    compare equal if they are the same filter, they can be shared.
+
     Args:
         string: The filter string.
 
@@ -409,3 +443,177 @@ def parse_filter(string: str) -> FilterExpression:
         FilterError: If the filter could not be parsed.
     """
     return _FilterParser(string).parse()
+
+
+#: The maximum number of results of string matches that are memoised.
+_MAX_INTERNED_MATCHES = 65536
+
+#: The (rough) relative cost of matching an entry for the kinds of filter
+#: expression, used to order the expressions in an `and` or `or` so that the
+#: cheap (and for tags and links, usually selective) ones are checked first.
+_COSTS: dict[type[FilterExpression], int] = {
+    TagMatch: 1,
+    LinkMatch: 1,
+    PostingUnitsMatch: 1,
+    KeyMatch: 2,
+    UnitsMatch: 3,
+    StringMatch: 4,
+}
+
+
+def _cost(expr: FilterExpression) -> int:
+    """Estimate the cost of matching an entry against an expression."""
+    if isinstance(expr, (AndExpression, OrExpression)):
+        return sum(_cost(sub_expr) for sub_expr in expr.expressions)
+    if isinstance(expr, NotExpression):
+        return _cost(expr.expression)
+    if isinstance(expr, PostingsMatch):
+        return 5 * _cost(expr.expression)
+    return _COSTS.get(type(expr), 5)
+
+
+def _interned(match: Match) -> Callable[[str], bool]:
+    """Memoise the results of a string match for each distinct string."""
+    results: dict[str, bool] = {}
+    search = match.match
+
+    def interned(value: str) -> bool:
+        result = results.get(value)
+        if result is None:
+            if len(results) >= _MAX_INTERNED_MATCHES:
+                results.clear()
+            result = results[value] = search(value)
+        return result
+
+    return interned
+
+
+def _compile_key_match(expr: KeyMatch) -> Callable[[Any], bool]:
+    key = expr.key
+    match = expr.match
+    matches: Callable[[Any], bool] = match
+    if isinstance(match, Match):
+        interned = _interned(match)
+
+        def match_string(value: Any) -> bool:
+            return interned(str(value))
+
+        matches = match_string
+    has_attribute: dict[type, bool] = {}
+
+    def key_match(entry: Any) -> bool:
+        cls = entry.__class__
+        attribute = has_attribute.get(cls)
+        if attribute is None:
+            attribute = has_attribute[cls] = hasattr(entry, key)
+        if attribute:
+            return matches(getattr(entry, key) or "")
+        meta = entry.meta
+        if meta is not None and key in meta:
+            return matches(meta[key])
+        return False
+
+    return key_match
+
+
+def _compile_string_match(expr: StringMatch) -> Callable[[Any], bool]:
+    interned = _interned(expr.match)
+    names_by_class: dict[type, tuple[str, ...]] = {}
+
+    def string_match(entry: Any) -> bool:
+        cls = entry.__class__
+        names = names_by_class.get(cls)
+        if names is None:
+            names = names_by_class[cls] = tuple(
+                name
+                for name in ("narration", "payee", "comment")
+                if hasattr(entry, name)
+            )
+        for name in names:
+            value = getattr(entry, name)
+            if value and interned(str(value)):
+                return True
+        return False
+
+    return string_match
+
+
+def _compile_all(
+    functions: Sequence[Callable[[Any], bool]],
+) -> Callable[[Any], bool]:
+    if len(functions) == 2:
+        first, second = functions
+        return lambda entry: first(entry) and second(entry)
+
+    # A loop is faster than all() with a generator.
+    def all_match(entry: Any) -> bool:
+        for function in functions:  # noqa: SIM110
+            if not function(entry):
+                return False
+        return True
+
+    return all_match
+
+
+def _compile_any(
+    functions: Sequence[Callable[[Any], bool]],
+) -> Callable[[Any], bool]:
+    if len(functions) == 2:
+        first, second = functions
+        return lambda entry: first(entry) or second(entry)
+
+    # A loop is faster than any() with a generator.
+    def any_match(entry: Any) -> bool:
+        for function in functions:  # noqa: SIM110
+            if function(entry):
+                return True
+        return False
+
+    return any_match
+
+
+def compile_filter(  # noqa: PLR0911
+    expr: FilterExpression,
+) -> Callable[[Directive | Posting], bool]:
+    """Compile a filter expression into a function matching entries.
+
+    The function matches the same entries as the expression but is faster:
+    the sub-expressions of an `and` or `or` are ordered to check the cheap
+    ones first, the attributes of an entry are only looked up if its type
+    has them and the results of string matches are memoised for each
+    distinct string.
+
+    Args:
+        expr: A parsed filter expression.
+
+    Returns:
+        A function matching entries or postings against the filter.
+    """
+    if isinstance(expr, (AndExpression, OrExpression)):
+        functions = [
+            compile_filter(sub_expr)
+            for sub_expr in sorted(expr.expressions, key=_cost)
+        ]
+        if isinstance(expr, AndExpression):
+            return _compile_all(functions)
+        return _compile_any(functions)
+    if isinstance(expr, NotExpression):
+        function = compile_filter(expr.expression)
+        return lambda entry: not function(entry)
+    if isinstance(expr, TagMatch):
+        tag = expr.tag
+        return lambda entry: tag in (getattr(entry, "tags", None) or ())
+    if isinstance(expr, LinkMatch):
+        link = expr.link
+        return lambda entry: link in (getattr(entry, "links", None) or ())
+    if isinstance(expr, KeyMatch):
+        return _compile_key_match(expr)
+    if isinstance(expr, StringMatch):
+        return _compile_string_match(expr)
+    if isinstance(expr, PostingsMatch):
+        quantifier = expr.quantifier
+        function = compile_filter(expr.expression)
+        return lambda entry: quantifier(
+            function(posting) for posting in getattr(entry, "postings", ())
+        )
+    return expr
@@ -7,11 +7,27 @@ from abc import abstractmethod
 from typing import TYPE_CHECKING
 
 from beancount.core import account
+from beancount.core import data
 from beancount.ops.summarize import clamp_opt
 
 from fava.beans.account import get_entry_accounts
+from fava.core.filter_parser import AndExpression
+from fava.core.filter_parser import compile_filter
+from fava.core.filter_parser import KeyMatch
+from fava.core.filter_parser import LinkMatch
 from fava.core.filter_parser import Match
+from fava.core.filter_parser import NotExpression
+from fava.core.filter_parser import OrExpression
 from fava.core.filter_parser import parse_filter
+from fava.core.filter_parser import PostingsMatch
+from fava.core.filter_parser import PostingUnitsMatch
+from fava.core.filter_parser import StringMatch
+from fava.core.filter_parser import TagMatch
+from fava.core.filter_parser import UnitsMatch
+from fava.core.ledger_index import _UNINDEXED_META_KEYS
+from fava.core.ledger_index import difference
+from fava.core.ledger_index import intersection
+from fava.core.ledger_index import union
 from fava.helpers import FavaAPIError
 from fava.util.date import InvalidDateRangeError
 from fava.util.date_parser import parse_date
@@ -23,6 +39,8 @@ if TYPE_CHECKING:  # pragma: no cover
     from fava.beans.abc import Directive
     from fava.beans.types import BeancountOptions
     from fava.core.fava_options import FavaOptions
+    from fava.core.filter_parser import FilterExpression
+    from fava.core.ledger_index import LedgerIndex
     from fava.util.date import DateRange
 
 
@@ -81,23 +99,207 @@ class TimeFilter(EntryFilter):
         )
         return clamped_entries  # type: ignore[return-value]  # ty:ignore[invalid-return-type]
 
+    def apply_to_index(self, index: LedgerIndex) -> Sequence[Directive]:
+        """Filter and summarise all entries of a ledger using its index.
+
+        This is equivalent to applying the filter to the entries of the index
+        but only summarises the entries since the closest checkpoint before
+        the start of the date range.
+        """
+        return index.checkpoints.clamp(
+            self.date_range.begin, self.date_range.end, self._options
+        )
+
+
+#: The keys that a :class:`KeyMatch` can match an attribute of an entry for
+#: (instead of a metadata value).
+_ATTRIBUTE_KEYS = frozenset().union(*(dir(t) for t in data.ALL_DIRECTIVES))
+
+
+def _key_positions(expr: KeyMatch, index: LedgerIndex) -> Sequence[int] | None:
+    """The positions of the entries matching a key match."""
+    key = expr.key
+    if key == "payee":
+        # Transactions without a payee are matched against the empty string.
+        if expr.match(""):
+            return None
+        candidates = union(
+            [
+                positions
+                for payee, positions in index.payee_positions.items()
+                if expr.match(payee)
+            ]
+            + [index.meta_key_positions.get(key, [])]
+        )
+    elif key in _ATTRIBUTE_KEYS:
+        return None
+    elif key[:1] == "_" or key in _UNINDEXED_META_KEYS:
+        # These metadata keys are not indexed, so all entries are matched.
+        return None
+    else:
+        candidates = index.meta_key_positions.get(key, [])
+    entries = index.entries
+    matches = compile_filter(expr)
+    return [position for position in candidates if matches(entries[position])]
+
+
+def _postings_positions(
+    expr: PostingsMatch, index: LedgerIndex
+) -> Sequence[int] | None:
+    """The positions of the entries matching a match on their postings."""
+    if not isinstance(expr.expression, PostingUnitsMatch):
+        return None
+    match = expr.expression.match
+    if expr.quantifier is any:
+        return index.amount_index.search(match)
+    if expr.quantifier is all:
+        # Entries without postings match as well.
+        return difference(
+            range(len(index.entries)),
+            index.amount_index.search(match, negate=True),
+        )
+    return None
+
+
+def _and_positions(
+    expr: AndExpression, index: LedgerIndex
+) -> Sequence[int] | None:
+    """The positions of the entries matching all of the expressions."""
+    all_positions = []
+    excluded = []
+    unindexed = []
+    for sub_expr in expr.expressions:
+        if isinstance(sub_expr, NotExpression):
+            positions = _positions(sub_expr.expression, index)
+            if positions is not None:
+                excluded.append(positions)
+                continue
+        positions = _positions(sub_expr, index)
+        if positions is None:
+            unindexed.append(sub_expr)
+        else:
+            all_positions.append(positions)
+    if not all_positions:
+        return None
+    result = intersection(all_positions)
+    for positions in excluded:
+        result = difference(result, positions)
+    if unindexed:
+        entries = index.entries
+        matches = compile_filter(AndExpression(tuple(unindexed)))
+        result = [
+            position for position in result if matches(entries[position])
+        ]
+    return result
+
+
+def _positions(  # noqa: PLR0911
+    expr: FilterExpression, index: LedgerIndex
+) -> Sequence[int] | None:
+    """The positions of the entries matching a filter expression.
+
+    Tags, links, payees, metadata keys, bare strings (see
+    :class:`~fava.core.text_index.TextIndex`) and units (see
+    :class:`~fava.core.amount_index.AmountIndex`) are looked up in the index
+    and combinations of them computed from the positions. For an `and` of
+    expressions, those that cannot be looked up are only matched against
+    the entries matching the others.
+
+    Returns:
+        The sorted positions or None if the expression cannot be answered
+        using the index.
+    """
+    if isinstance(expr, TagMatch):
+        return index.tag_positions.get(expr.tag, [])
+    if isinstance(expr, LinkMatch):
+        return index.link_positions.get(expr.link, [])
+    if isinstance(expr, KeyMatch):
+        return _key_positions(expr, index)
+    if isinstance(expr, StringMatch):
+        return index.text_index.search(expr.match)
+    if isinstance(expr, UnitsMatch):
+        return index.amount_index.search(expr.match)
+    if isinstance(expr, PostingsMatch):
+        return _postings_positions(expr, index)
+    if isinstance(expr, NotExpression):
+        positions = _positions(expr.expression, index)
+        if positions is None:
+            return None
+        return difference(range(len(index.entries)), positions)
+    if isinstance(expr, OrExpression):
+        any_positions = []
+        for sub_expr in expr.expressions:
+            positions = _positions(sub_expr, index)
+            if positions is None:
+                return None
+            any_positions.append(positions)
+        return union(any_positions)
+    if isinstance(expr, AndExpression):
+        return _and_positions(expr, index)
+    return None
+
 
 class AdvancedFilter(EntryFilter):
     """Filter by tags and links and keys."""
 
-    __slots__ = ("_include",)
+    __slots__ = ("_expression", "_include")
 
     def __init__(self, value: str) -> None:
         try:
-            self._include = parse_filter(value)
+            self._expression = parse_filter(value)
         except ParseError as error:
             raise AdvancedFilterParseError(value, error) from error
+        self._include = compile_filter(self._expression)
 
     def apply(self, entries: Sequence[Directive]) -> Sequence[Directive]:
         """Filter the entries matching the filter expression."""
         include = self._include
         return [entry for entry in entries if include(entry)]
 
+    @property
+    def conjuncts(self) -> tuple[FilterExpression, ...]:
+        """The filter expressions that matching entries match all of."""
+        expression = self._expression
+        if isinstance(expression, AndExpression):
+            return expression.expressions
+        return (expression,)
+
+    def positions(
+        self, index: LedgerIndex, within: Sequence[int], matched: int = 0
+    ) -> Sequence[int]:
+        """Filter entries of a ledger using its index.
+
+        Args:
+            index: The index of the ledger.
+            within: The positions of the entries to filter.
+            matched: The number of the :attr:`conjuncts` that all entries in
+                `within` are known to match already, so that only the
+                remaining ones need to be matched.
+
+        Returns:
+            The positions of the matching entries. Where possible, these are
+            looked up in the index instead of matching all entries.
+        """
+        expression = self._expression
+        include = self._include
+        if matched:
+            remaining = self.conjuncts[matched:]
+            expression = (
+                remaining[0]
+                if len(remaining) == 1
+                else AndExpression(remaining)
+            )
+            include = compile_filter(expression)
+        positions = _positions(expression, index)
+        if positions is None:
+            entries = index.entries
+            return [
+                position for position in within if include(entries[position])
+            ]
+        if len(within) == len(index.entries):
+            return positions
+        return intersection([within, positions])
+
 
 class AccountFilter(EntryFilter):
     """Filter by account.
@@ -111,17 +313,33 @@ class AccountFilter(EntryFilter):
         self._value = value
         self._match = Match(value)
 
+    def _matches(self, name: str) -> bool:
+        return account.has_component(name, self._value) or self._match(name)
+
     def apply(self, entries: Sequence[Directive]) -> Sequence[Directive]:
         """Filter the entries with a posting to a matching account."""
-        value = self._value
-        if not value:
+        if not self._value:
             return entries
-        match = self._match
+        matches = self._matches
         return [
             entry
             for entry in entries
-            if any(
-                account.has_component(name, value) or match(name)
-                for name in get_entry_accounts(entry)
-            )
+            if any(matches(name) for name in get_entry_accounts(entry))
         ]
+
+    def positions(self, index: LedgerIndex) -> Sequence[int]:
+        """Filter all entries of a ledger using its index.
+
+        This is equivalent to applying the filter to the entries of the index
+        but only matches each account once and then combines the positions
+        of the entries for the matching accounts.
+
+        Returns:
+            The positions of the matching entries.
+        """
+        if not self._value:
+            return range(len(index.entries))
+        positions = index.account_positions
+        return union(
+            [positions[name] for name in positions if self._matches(name)]
+        )
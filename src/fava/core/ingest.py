@@ -16,8 +16,6 @@ from os import sep
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from beangulp.importer import Importer
-
 from fava.core.module_base import FavaModule
 from fava.helpers import BeancountError
 from fava.helpers import FavaAPIError
@@ -32,6 +30,8 @@ if TYPE_CHECKING:  # pragma: no cover
     from typing import ParamSpec
     from typing import TypeVar
 
+    from beangulp.importer import Importer
+
     from fava.beans.abc import Directive
     from fava.core import FavaLedger
 
@@ -291,6 +291,9 @@ def load_import_config(module_path: Path) -> LoadedImportConfig:
         callable(fn) for fn in hooks
     ):
         raise ImportConfigHooksNotASequenceCallablesError
+    # Importing beangulp is slow, so only do it once an import config is used.
+    from beangulp.importer import Importer  # noqa: PLC0415
+
     importers = {}
     for importer in config:
         if not isinstance(importer, Importer):
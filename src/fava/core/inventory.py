@@ -13,6 +13,7 @@ if TYPE_CHECKING:  # pragma: no cover
     import datetime
     from collections.abc import Callable
     from collections.abc import Iterator
+    from collections.abc import Mapping
     from typing import Concatenate
     from typing import ParamSpec
 
@@ -169,3 +170,77 @@ class CounterInventory(dict[InventoryKey, Decimal]):
                     self.pop(key, None)
                 else:
                     self[key] = new_num
+
+
+class ScaledCounterInventory:
+    """An inventory that sums numbers as integers, scaled per currency.
+
+    The numbers of each currency are multiplied by ten to the power of the
+    scale of the currency and summed as integers, together with the smallest
+    exponent of the numbers added since the sum last was zero. This gives
+    exactly the same numbers as :class:`CounterInventory` (see
+    :meth:`to_counter_inventory`).
+
+    This is only faster than summing Decimals if the numbers are already
+    scaled, like the numbers in the posting table of a ledger, since
+    converting a Decimal costs more than adding two of them.
+
+    Args:
+        scales: The number of decimal places for each currency.
+    """
+
+    __slots__ = ("_scales", "_sums")
+
+    def __init__(self, scales: Mapping[str, int]) -> None:
+        self._scales = scales
+        # For each key, the scaled sum and the smallest exponent.
+        self._sums: dict[InventoryKey, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sums)
+
+    def is_empty(self) -> bool:
+        """Check if the inventory is empty."""
+        return not self._sums
+
+    def copy(self) -> ScaledCounterInventory:
+        """Copy the inventory."""
+        copied = ScaledCounterInventory(self._scales)
+        copied._sums = {key: value.copy() for key, value in self._sums.items()}
+        return copied
+
+    def add_scaled(
+        self, key: InventoryKey, number: int, exponent: int
+    ) -> None:
+        """Add a scaled number to key.
+
+        Args:
+            key: The key, a tuple ``(currency, cost)``.
+            number: The number, scaled by the scale of the currency.
+            exponent: The exponent of the number, which must not be smaller
+                than minus the scale of the currency.
+        """
+        sums = self._sums
+        current = sums.get(key)
+        if current is None:
+            if number:
+                sums[key] = [number, min(exponent, 0)]
+        else:
+            total = current[0] + number
+            if total:
+                current[0] = total
+                current[1] = min(current[1], exponent)
+            else:
+                del sums[key]
+
+    def to_counter_inventory(self) -> CounterInventory:
+        """Convert to a :class:`CounterInventory` with Decimal numbers."""
+        counter = CounterInventory()
+        scales = self._scales
+        for key, (number, exponent) in self._sums.items():
+            counter[key] = (
+                Decimal(number)
+                .scaleb(-scales[key[0]])
+                .quantize(Decimal((0, (1,), exponent)))
+            )
+        return counter
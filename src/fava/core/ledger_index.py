@@ -0,0 +1,420 @@
+"""Data derived from the entries of a ledger."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import NamedTuple
+from typing import TYPE_CHECKING
+
+from fava.beans.abc import Price
+from fava.beans.abc import Transaction
+from fava.beans.account import get_entry_accounts
+from fava.beans.flags import FLAG_UNREALIZED
+from fava.beans.funcs import hash_entry
+from fava.beans.prices import FavaPriceMap
+from fava.core.amount_index import AmountIndex
+from fava.core.checkpoints import BalanceCheckpoints
+from fava.core.file import _incomplete_sortkey
+from fava.core.group_entries import EntriesByType
+from fava.core.group_entries import TransactionPosting
+from fava.core.posting_table import PostingTable
+from fava.core.running_balances import RunningBalances
+from fava.core.text_index import TextIndex
+from fava.util.ranking import ExponentialDecayRanker
+
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.beans.types import LoaderResult
+
+
+#: The metadata keys that all entries have, which are not indexed.
+_UNINDEXED_META_KEYS = frozenset(("filename", "lineno"))
+
+
+class Rankings(NamedTuple):
+    """Accounts, currencies and payees, ranked by how recently they are used.
+
+    Accounts that are opened or closed but never used in a posting are
+    included, with the lowest rank.
+    """
+
+    accounts: Sequence[str]
+    currencies: Sequence[str]
+    payees: Sequence[str]
+
+
+class LedgerIndex:
+    """Data derived from all entries of a ledger.
+
+    This is computed in a single pass over the entries on each load of the
+    ledger, so that the modules of the ledger do not each need to scan all
+    entries again.
+
+    Some data which is expensive to compute and not always needed is only
+    computed on first access. All of it can be stored in a snapshot, see
+    :func:`index_for_snapshot`.
+
+    Args:
+        entries: The entries of the ledger, sorted by date.
+    """
+
+    __slots__ = (
+        "_amount_index",
+        "_checkpoints",
+        "_entry_hashes",
+        "_posting_table",
+        "_price_ends",
+        "_rankings",
+        "_running_balances",
+        "_text_index",
+        "account_positions",
+        "by_type",
+        "currencies",
+        "dates",
+        "entries",
+        "entries_by_account",
+        "last_entry",
+        "link_positions",
+        "links",
+        "meta_key_positions",
+        "payee_positions",
+        "payees",
+        "prices",
+        "tag_positions",
+        "tags",
+    )
+
+    #: The entries that this index is for.
+    entries: Sequence[Directive]
+
+    #: The entries grouped by type.
+    by_type: EntriesByType
+
+    #: The entries (or for Transactions, the postings) for each account.
+    entries_by_account: Mapping[str, Sequence[Directive | TransactionPosting]]
+
+    #: For each account, the positions (in :attr:`entries`) of all entries
+    #: with this account, in ascending order.
+    account_positions: Mapping[str, Sequence[int]]
+
+    #: The last entry for each account, ignoring unrealized gains entries.
+    last_entry: Mapping[str, Directive]
+
+    #: For each currency, the dates of all postings that it occurs in.
+    currencies: Mapping[str, Sequence[datetime.date]]
+
+    #: For each payee, all transactions with this payee.
+    payees: Mapping[str, Sequence[Transaction]]
+
+    #: All dates that there are entries on, in ascending order.
+    dates: Sequence[datetime.date]
+
+    #: All links, sorted.
+    links: Sequence[str]
+
+    #: All tags, sorted.
+    tags: Sequence[str]
+
+    #: For each tag, the positions of the entries with it.
+    tag_positions: Mapping[str, Sequence[int]]
+
+    #: For each link, the positions of the entries with it.
+    link_positions: Mapping[str, Sequence[int]]
+
+    #: For each payee, the positions of the transactions with it.
+    payee_positions: Mapping[str, Sequence[int]]
+
+    #: For each metadata key, the positions of the entries with it. The
+    #: filename and line number that all entries have and internal keys
+    #: (starting with an underscore) are left out.
+    meta_key_positions: Mapping[str, Sequence[int]]
+
+    #: The price map.
+    prices: FavaPriceMap
+
+    def __init__(self, entries: Sequence[Directive]) -> None:  # noqa: PLR0912, PLR0915
+        by_type = EntriesByType([], [], [], [], [], [], [], [], [], [], [], [])
+        lists_by_type = by_type._asdict()
+        entries_by_account: dict[str, list[Directive | TransactionPosting]] = (
+            defaultdict(list)
+        )
+        account_positions: dict[str, list[int]] = defaultdict(list)
+        last_entry: dict[str, Directive] = {}
+        currencies: dict[str, list[datetime.date]] = defaultdict(list)
+        payees: dict[str, list[Transaction]] = defaultdict(list)
+        dates: list[datetime.date] = []
+        tag_positions: dict[str, list[int]] = defaultdict(list)
+        link_positions: dict[str, list[int]] = defaultdict(list)
+        payee_positions: dict[str, list[int]] = defaultdict(list)
+        meta_key_positions: dict[str, list[int]] = defaultdict(list)
+
+        prev_date = None
+        # An entry can have the same account multiple times, so check the
+        # last position before adding one to the account positions.
+        for position, entry in enumerate(entries):
+            lists_by_type[entry.__class__.__name__].append(entry)
+            date = entry.date
+            if date != prev_date:
+                dates.append(date)
+                prev_date = date
+            entry_links = getattr(entry, "links", None)
+            if entry_links:
+                for link in entry_links:
+                    link_positions[link].append(position)
+            entry_tags = getattr(entry, "tags", None)
+            if entry_tags:
+                for tag in entry_tags:
+                    tag_positions[tag].append(position)
+            for key in entry.meta:
+                if key[0] != "_" and key not in _UNINDEXED_META_KEYS:
+                    meta_key_positions[key].append(position)
+
+            if isinstance(entry, Transaction):
+                if entry.payee:
+                    payees[entry.payee].append(entry)
+                    payee_positions[entry.payee].append(position)
+                is_unrealized = entry.flag == FLAG_UNREALIZED
+                for posting in entry.postings:
+                    account = posting.account
+                    entries_by_account[account].append(
+                        TransactionPosting(entry, posting)
+                    )
+                    positions = account_positions[account]
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+                    if not is_unrealized:
+                        last_entry[account] = entry
+                    currencies[posting.units.currency].append(date)
+                    cost = posting.cost
+                    if cost and cost.currency is not None:
+                        currencies[cost.currency].append(date)
+            else:
+                for account in get_entry_accounts(entry):
+                    entries_by_account[account].append(entry)
+                    positions = account_positions[account]
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+                    last_entry[account] = entry
+
+        self.entries = entries
+        self.by_type = by_type
+        self.entries_by_account = dict(sorted(entries_by_account.items()))
+        self.account_positions = dict(account_positions)
+        self.last_entry = last_entry
+        self.currencies = dict(currencies)
+        self.payees = dict(payees)
+        self.dates = dates
+        self.links = sorted(link_positions)
+        self.tags = sorted(tag_positions)
+        self.tag_positions = dict(tag_positions)
+        self.link_positions = dict(link_positions)
+        self.payee_positions = dict(payee_positions)
+        self.meta_key_positions = dict(meta_key_positions)
+        self.prices = FavaPriceMap(by_type.Price)
+        self._entry_hashes: dict[str, Directive] | None = None
+        self._rankings: Rankings | None = None
+        self._checkpoints: BalanceCheckpoints | None = None
+        self._text_index: TextIndex | None = None
+        self._amount_index: AmountIndex | None = None
+        self._price_ends: Sequence[int] | None = None
+        self._posting_table: PostingTable | None = None
+        self._running_balances: RunningBalances | None = None
+
+    @property
+    def entry_hashes(self) -> Mapping[str, Directive]:
+        """All entries by their hash.
+
+        For entries with the same hash, this contains the first one.
+        """
+        if self._entry_hashes is None:
+            self._entry_hashes = {
+                hash_entry(entry): entry for entry in reversed(self.entries)
+            }
+        return self._entry_hashes
+
+    @property
+    def rankings(self) -> Rankings:
+        """The accounts, currencies and payees ranked by recent usage."""
+        if self._rankings is None:
+            by_type = self.by_type
+            account_ranker = ExponentialDecayRanker(
+                sorted(
+                    {entry.account for entry in by_type.Open}
+                    | {entry.account for entry in by_type.Close}
+                )
+            )
+            for account, txn_postings in self.entries_by_account.items():
+                for txn_posting in txn_postings:
+                    if isinstance(txn_posting, TransactionPosting):
+                        account_ranker.update(
+                            account, txn_posting.transaction.date
+                        )
+
+            currency_ranker = ExponentialDecayRanker()
+            for currency, dates in self.currencies.items():
+                for date in dates:
+                    currency_ranker.update(currency, date)
+
+            payee_ranker = ExponentialDecayRanker()
+            for payee, transactions in self.payees.items():
+                for txn in transactions:
+                    payee_ranker.update(payee, txn.date)
+
+            self._rankings = Rankings(
+                account_ranker.sort(),
+                currency_ranker.sort(),
+                payee_ranker.sort(),
+            )
+        return self._rankings
+
+    @property
+    def checkpoints(self) -> BalanceCheckpoints:
+        """Balances at checkpoints to clamp the entries to date ranges."""
+        if self._checkpoints is None:
+            self._checkpoints = BalanceCheckpoints(self.entries)
+        return self._checkpoints
+
+    @property
+    def text_index(self) -> TextIndex:
+        """The trigram index for narrations, payees and comments."""
+        if self._text_index is None:
+            self._text_index = TextIndex(self.entries)
+        return self._text_index
+
+    @property
+    def amount_index(self) -> AmountIndex:
+        """The sorted amounts of all postings."""
+        if self._amount_index is None:
+            self._amount_index = AmountIndex(self.entries)
+        return self._amount_index
+
+    @property
+    def posting_table(self) -> PostingTable:
+        """The postings of all entries as a columnar table."""
+        if self._posting_table is None:
+            self._posting_table = PostingTable(self.entries)
+        return self._posting_table
+
+    @property
+    def running_balances(self) -> RunningBalances:
+        """The running balances of the accounts, with checkpoints."""
+        if self._running_balances is None:
+            self._running_balances = RunningBalances(self.posting_table)
+        return self._running_balances
+
+    @property
+    def price_ends(self) -> Sequence[int]:
+        """For each Price entry, the end of the entries that sort like it.
+
+        This is the first position after the price of an entry that comes
+        later when sorting by date and type.
+        """
+        if self._price_ends is None:
+            entries = self.entries
+            ends: list[int] = []
+            end = len(entries)
+            next_key = None
+            for position in range(len(entries) - 1, -1, -1):
+                entry = entries[position]
+                key = _incomplete_sortkey(entry)
+                if key != next_key:
+                    end = position + 1
+                    next_key = key
+                if isinstance(entry, Price):
+                    ends.append(end)
+            ends.reverse()
+            self._price_ends = ends
+        return self._price_ends
+
+    def entries_at(self, positions: Sequence[int]) -> Sequence[Directive]:
+        """The entries at the given positions."""
+        entries = self.entries
+        if len(positions) == len(entries):
+            return entries
+        return [entries[position] for position in positions]
+
+    def entries_with_prices(
+        self, positions: Sequence[int]
+    ) -> Sequence[Directive]:
+        """The entries at the given positions, with all prices merged in.
+
+        This is the same as sorting the entries followed by all Price
+        entries by date and type. As the positions are sorted, the prices
+        are inserted by bisection instead.
+        """
+        entries = self.entries_at(positions)
+        result: list[Directive] = []
+        start = 0
+        for price, end in zip(
+            self.by_type.Price, self.price_ends, strict=True
+        ):
+            stop = bisect_left(positions, end, start)
+            if stop > start:
+                result.extend(entries[start:stop])
+            result.append(price)
+            start = stop
+        result.extend(entries[start:])
+        return result
+
+
+def union(positions: Sequence[Sequence[int]]) -> Sequence[int]:
+    """The union of sorted lists of entry positions, sorted."""
+    if not positions:
+        return []
+    if len(positions) == 1:
+        return positions[0]
+    return sorted(set().union(*positions))
+
+
+def intersection(positions: Sequence[Sequence[int]]) -> Sequence[int]:
+    """The intersection of (at least one) sorted lists of entry positions.
+
+    Starting with the shortest list, the remaining positions are looked up
+    in the other lists by bisection, so this is fast if one list is short.
+    """
+    by_length = sorted(positions, key=len)
+    result = by_length[0]
+    for other in by_length[1:]:
+        if not result:
+            break
+        length = len(other)
+        result = [
+            position
+            for position in result
+            if (i := bisect_left(other, position)) < length
+            and other[i] == position
+        ]
+    return result
+
+
+def difference(
+    positions: Sequence[int], other: Sequence[int]
+) -> Sequence[int]:
+    """The positions that are not in the other list, sorted."""
+    if not other:
+        return positions
+    exclude = set(other)
+    return [position for position in positions if position not in exclude]
+
+
+def index_for_snapshot(result: LoaderResult) -> LedgerIndex:
+    """Build the index for a load result to store it in a snapshot.
+
+    This also computes all the data of the index that is otherwise only
+    computed on first access.
+    """
+    index = LedgerIndex(result[0])
+    _ = index.entry_hashes
+    _ = index.rankings
+    _ = index.checkpoints
+    _ = index.text_index
+    _ = index.amount_index
+    _ = index.price_ends
+    _ = index.posting_table
+    _ = index.running_balances
+    return index
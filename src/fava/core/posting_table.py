@@ -0,0 +1,208 @@
+"""A columnar table of all postings of a ledger."""
+
+from __future__ import annotations
+
+from array import array
+from decimal import Decimal
+from itertools import chain
+from typing import TYPE_CHECKING
+
+from fava.core.inventory import CounterInventory
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.beans.protocols import Cost
+
+
+class PostingTable:
+    """The postings of all entries, as parallel arrays.
+
+    Accounts, currencies and costs are interned and stored as ids into
+    :attr:`account_names`, :attr:`currency_names` and :attr:`cost_values`.
+    The numbers of the units are stored as integers, scaled for each currency
+    by the largest number of decimal places it occurs with, together with
+    their exponent, so that they can be summed exactly with integers and
+    converted back to the same Decimals that summing them would give.
+
+    Args:
+        entries: The entries of the ledger.
+    """
+
+    __slots__ = (
+        "account_names",
+        "accounts",
+        "cost_values",
+        "costs",
+        "currencies",
+        "currency_names",
+        "dates",
+        "entry_rows",
+        "exponents",
+        "numbers",
+        "scales",
+    )
+
+    #: The date (as a proleptic Gregorian ordinal) of each posting.
+    dates: Sequence[int]
+    #: The account id of each posting.
+    accounts: Sequence[int]
+    #: The currency id of each posting.
+    currencies: Sequence[int]
+    #: The cost id of each posting, 0 for postings without a cost.
+    costs: Sequence[int]
+    #: The scaled number of the units of each posting.
+    numbers: Sequence[int]
+    #: The exponent of the number of the units of each posting.
+    exponents: Sequence[int]
+    #: For each entry, the first row of its postings, and the number of rows.
+    entry_rows: Sequence[int]
+
+    #: The account names, by id.
+    account_names: Sequence[str]
+    #: The currencies, by id.
+    currency_names: Sequence[str]
+    #: The costs, by id.
+    cost_values: Sequence[Cost | None]
+    #: For each currency id, the number of decimal places it is scaled by.
+    scales: Sequence[int]
+
+    def __init__(self, entries: Sequence[Directive]) -> None:
+        account_ids: dict[str, int] = {}
+        currency_ids: dict[str, int] = {}
+        cost_ids: dict[Cost | None, int] = {None: 0}
+        dates = array("l")
+        accounts = array("I")
+        currencies = array("I")
+        costs = array("I")
+        exponents = array("i")
+        entry_rows = array("I")
+        decimals: list[Decimal] = []
+        scales: list[int] = []
+
+        for entry in entries:
+            entry_rows.append(len(decimals))
+            postings = getattr(entry, "postings", None)
+            if not postings:
+                continue
+            date = entry.date.toordinal()
+            for posting in postings:
+                units = posting.units
+                number = units.number
+                if number is None:  # pragma: no cover
+                    continue
+                account_id = account_ids.setdefault(
+                    posting.account, len(account_ids)
+                )
+                currency_id = currency_ids.get(units.currency)
+                if currency_id is None:
+                    currency_id = currency_ids[units.currency] = len(scales)
+                    scales.append(0)
+                exponent = number.as_tuple().exponent
+                assert isinstance(exponent, int)  # noqa: S101
+                scales[currency_id] = max(scales[currency_id], -exponent)
+                dates.append(date)
+                accounts.append(account_id)
+                currencies.append(currency_id)
+                costs.append(cost_ids.setdefault(posting.cost, len(cost_ids)))
+                exponents.append(exponent)
+                decimals.append(number)
+        entry_rows.append(len(decimals))
+
+        numbers: list[int] = []
+        for currency_id, number in zip(currencies, decimals, strict=True):
+            numerator, denominator = number.as_integer_ratio()
+            numbers.append(
+                numerator * 10 ** scales[currency_id] // denominator
+            )
+
+        self.dates = dates
+        self.accounts = accounts
+        self.currencies = currencies
+        self.costs = costs
+        self.numbers = numbers
+        self.exponents = exponents
+        self.entry_rows = entry_rows
+        self.account_names = list(account_ids)
+        self.currency_names = list(currency_ids)
+        self.cost_values = list(cost_ids)
+        self.scales = scales
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def rows(self, positions: Sequence[int]) -> Iterable[int]:
+        """The rows of the postings of the entries at the given positions."""
+        entry_rows = self.entry_rows
+        if len(positions) == len(entry_rows) - 1:
+            return range(len(self.numbers))
+        # Only iterate in C, this is much faster than a generator expression.
+        starts = map(entry_rows.__getitem__, positions)
+        ends = map(entry_rows.__getitem__, map((1).__add__, positions))
+        return chain.from_iterable(map(range, starts, ends))
+
+    def balances(
+        self, rows: Iterable[int] | None = None
+    ) -> dict[str, CounterInventory]:
+        """Sum the units of the postings by account.
+
+        This gives the same inventories as adding the postings in order to a
+        :class:`CounterInventory` for each account: numbers that sum to zero
+        are removed and the exponent of each number is the smallest one of
+        the numbers (and zero) added since the sum last was zero.
+
+        Args:
+            rows: The rows of the postings to sum, all by default.
+
+        Returns:
+            The balance of each account (that has postings).
+        """
+        accounts = self.accounts
+        currencies = self.currencies
+        costs = self.costs
+        numbers = self.numbers
+        exponents = self.exponents
+
+        sums: dict[tuple[int, int, int], list[int]] = {}
+        # The accounts with a number that summed to zero.
+        zeroed: set[int] = set()
+        for row in range(len(numbers)) if rows is None else rows:
+            key = (accounts[row], currencies[row], costs[row])
+            current = sums.get(key)
+            if current is None:
+                if numbers[row]:
+                    sums[key] = [numbers[row], min(exponents[row], 0)]
+                else:
+                    zeroed.add(key[0])
+                continue
+            total = current[0] + numbers[row]
+            if total:
+                current[0] = total
+                current[1] = min(current[1], exponents[row])
+            else:
+                del sums[key]
+                zeroed.add(key[0])
+
+        account_names = self.account_names
+        currency_names = self.currency_names
+        cost_values = self.cost_values
+        scales = self.scales
+        balances: dict[str, CounterInventory] = {
+            account_names[account_id]: CounterInventory()
+            for account_id in zeroed
+        }
+        for (account_id, currency_id, cost_id), (
+            total,
+            exponent,
+        ) in sums.items():
+            account = account_names[account_id]
+            balance = balances.get(account)
+            if balance is None:
+                balance = balances[account] = CounterInventory()
+            number = Decimal(total).scaleb(-scales[currency_id])
+            balance[currency_names[currency_id], cost_values[cost_id]] = (
+                number.quantize(Decimal((0, (1,), exponent)))
+            )
+        return balances
@@ -0,0 +1,172 @@
+"""Running balances of the accounts with checkpoints."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+from fava.core.inventory import ScaledCounterInventory
+
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Sequence
+
+    from fava.core.inventory import CounterInventory
+    from fava.core.inventory import InventoryKey
+    from fava.core.posting_table import PostingTable
+
+#: The number of postings of an account between two checkpoints.
+CHECKPOINT_INTERVAL = 64
+
+
+class _AccountBalances:
+    """The rows of the postings of an account and its running balances.
+
+    The balance after every :data:`CHECKPOINT_INTERVAL` postings is stored,
+    so that the balance before any row only needs to add at most that many
+    postings to a copy of the closest checkpoint.
+    """
+
+    __slots__ = ("checkpoints", "rows")
+
+    def __init__(
+        self,
+        rows: Sequence[int],
+        checkpoints: Sequence[ScaledCounterInventory],
+    ) -> None:
+        #: The rows of the postings of the account.
+        self.rows = rows
+        #: The balance before the rows at multiples of the interval.
+        self.checkpoints = checkpoints
+
+
+class RunningBalances:
+    """The running balances of the accounts of a ledger.
+
+    The balances are summed from the scaled numbers of the posting table, in
+    the order of the postings, and are therefore exactly the same as adding
+    the postings to a :class:`CounterInventory` in order. The checkpoints
+    for an account (with or without its children) are computed on the first
+    query for it.
+
+    Args:
+        table: The posting table of the ledger.
+    """
+
+    __slots__ = ("_accounts", "_keys", "_scales", "table")
+
+    def __init__(self, table: PostingTable) -> None:
+        self.table = table
+        self._scales = dict(
+            zip(table.currency_names, table.scales, strict=True)
+        )
+        self._keys: dict[tuple[int, int], InventoryKey] = {}
+        self._accounts: dict[tuple[str, bool], _AccountBalances] = {}
+
+    def _key(self, currency_id: int, cost_id: int) -> InventoryKey:
+        """The inventory key for a currency and cost id."""
+        key = self._keys.get((currency_id, cost_id))
+        if key is None:
+            key = (
+                self.table.currency_names[currency_id],
+                self.table.cost_values[cost_id],
+            )
+            self._keys[currency_id, cost_id] = key
+        return key
+
+    def _add_rows(
+        self, inventory: ScaledCounterInventory, rows: Sequence[int]
+    ) -> None:
+        """Add the postings in the given rows to an inventory."""
+        table = self.table
+        currencies = table.currencies
+        costs = table.costs
+        numbers = table.numbers
+        exponents = table.exponents
+        key = self._key
+        for row in rows:
+            inventory.add_scaled(
+                key(currencies[row], costs[row]), numbers[row], exponents[row]
+            )
+
+    def _account_balances(
+        self, account: str, *, with_children: bool
+    ) -> _AccountBalances:
+        """The rows and checkpoints for an account."""
+        account_balances = self._accounts.get((account, with_children))
+        if account_balances is not None:
+            return account_balances
+
+        table = self.table
+        prefix = f"{account}:"
+        account_ids = {
+            account_id
+            for account_id, name in enumerate(table.account_names)
+            if name == account or (with_children and name.startswith(prefix))
+        }
+        accounts = table.accounts
+        rows = [
+            row for row in range(len(accounts)) if accounts[row] in account_ids
+        ]
+
+        inventory = ScaledCounterInventory(self._scales)
+        checkpoints = [inventory.copy()]
+        for start in range(0, len(rows), CHECKPOINT_INTERVAL):
+            self._add_rows(
+                inventory, rows[start : start + CHECKPOINT_INTERVAL]
+            )
+            checkpoints.append(inventory.copy())
+
+        account_balances = _AccountBalances(rows, checkpoints)
+        self._accounts[account, with_children] = account_balances
+        return account_balances
+
+    def balance_before_row(
+        self, account: str, end: int, *, with_children: bool = False
+    ) -> CounterInventory:
+        """The balance of an account from the postings before a row.
+
+        Args:
+            account: An account name.
+            end: A row of the posting table.
+            with_children: Whether to include the postings of subaccounts.
+
+        Returns:
+            The sum of the units of the postings of the account before the
+            given row.
+        """
+        account_balances = self._account_balances(
+            account, with_children=with_children
+        )
+        rows = account_balances.rows
+        count = bisect_left(rows, end)
+        checkpoint = count // CHECKPOINT_INTERVAL
+        inventory = account_balances.checkpoints[checkpoint].copy()
+        self._add_rows(
+            inventory, rows[checkpoint * CHECKPOINT_INTERVAL : count]
+        )
+        return inventory.to_counter_inventory()
+
+    def balance_before_entry(
+        self, account: str, position: int, *, with_children: bool = False
+    ) -> CounterInventory:
+        """The balance of an account before the entry at a position."""
+        return self.balance_before_row(
+            account,
+            self.table.entry_rows[position],
+            with_children=with_children,
+        )
+
+    def balance_before(
+        self,
+        account: str,
+        date: datetime.date,
+        *,
+        with_children: bool = False,
+    ) -> CounterInventory:
+        """The balance of an account from the entries before a date."""
+        return self.balance_before_row(
+            account,
+            bisect_left(self.table.dates, date.toordinal()),
+            with_children=with_children,
+        )
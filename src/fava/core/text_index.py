@@ -0,0 +1,242 @@
+"""A trigram index for the narrations, payees and comments of entries."""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.core.filter_parser import Match
+
+#: The attributes of entries that a bare string in a filter is matched on.
+TEXT_ATTRIBUTES = ("narration", "payee", "comment")
+
+#: Matches the (few) non-ASCII characters that a case-insensitive regular
+#: expression considers equal to an ASCII letter, like the Kelvin sign.
+_ASCII_LETTER = re.compile("[a-z]", re.IGNORECASE)
+
+#: Characters that end a literal in a regular expression.
+_SPECIAL = frozenset(".^$)]}")
+
+#: Quantifiers, which make the preceding character optional.
+_QUANTIFIERS = frozenset("*+?{")
+
+#: Escapes that span more than one character after the backslash: character
+#: codes, named characters, octal escapes and backreferences.
+_LONG_ESCAPES = frozenset("xuUN0123456789")
+
+
+def _skip_set(pattern: str, start: int) -> int:
+    """The index after the set of characters starting at `start`."""
+    i = start + 1
+    if pattern[i : i + 1] == "^":
+        i += 1
+    # A closing bracket directly at the start is part of the set.
+    if pattern[i : i + 1] == "]":
+        i += 1
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "]":
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_group(pattern: str, start: int) -> int:
+    """The index after the (possibly nested) group starting at `start`."""
+    depth = 0
+    i = start
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            i = _skip_set(pattern, i)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def required_literals(pattern: str) -> list[str] | None:  # noqa: PLR0912
+    """The literal strings that every match of a regular expression contains.
+
+    This is a conservative approximation: only literal characters outside of
+    groups, sets and repetitions are considered. Characters that are not
+    ASCII end a literal and the returned literals are lower-cased.
+
+    Returns:
+        The literals or None if the pattern has alternatives, flags or escapes
+        that span more than one character, like character codes.
+    """
+    if "(?" in pattern:
+        return None
+    literals: list[str] = []
+    current: list[str] = []
+
+    def end_literal() -> None:
+        if current:
+            literals.append("".join(current).lower())
+            current.clear()
+
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "|":
+            return None
+        if char in _QUANTIFIERS:
+            if current:
+                current.pop()
+            end_literal()
+            if char == "{":
+                end = pattern.find("}", i)
+                i = len(pattern) if end < 0 else end + 1
+                continue
+        elif char == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            if escaped in _LONG_ESCAPES:
+                return None
+            if escaped and not escaped.isalnum() and escaped.isascii():
+                current.append(escaped)
+            else:
+                end_literal()
+            i += 2
+            continue
+        elif char == "(":
+            end_literal()
+            i = _skip_group(pattern, i)
+            continue
+        elif char == "[":
+            end_literal()
+            i = _skip_set(pattern, i)
+            continue
+        elif char in _SPECIAL or not char.isascii():
+            end_literal()
+        else:
+            current.append(char)
+        i += 1
+    end_literal()
+    return literals
+
+
+def _trigrams(text: str) -> set[str]:
+    """The trigrams of a lower-cased text that consist of ASCII characters."""
+    return {
+        trigram
+        for trigram in (text[i : i + 3] for i in range(len(text) - 2))
+        if trigram.isascii()
+    }
+
+
+class TextIndex:
+    """A trigram index for the narrations, payees and comments of entries.
+
+    The index maps the trigrams of the lower-cased text to the distinct
+    strings that contain them. To find the entries matching a bare string in
+    a filter, the strings containing all trigrams of the literals that every
+    match contains are matched and the positions of the entries with any of
+    the matching strings are returned. The result is therefore exactly the
+    same as matching all entries, as long as the case-insensitive matching
+    of the ASCII characters agrees with lower-casing them - strings with one
+    of the few other characters that match an ASCII letter are always
+    matched.
+
+    Args:
+        entries: The entries to index.
+    """
+
+    __slots__ = ("_ids", "_trigrams", "_unfolded", "positions", "strings")
+
+    #: The distinct non-empty values of the text attributes.
+    strings: Sequence[str]
+
+    #: For each string, the positions of the entries that have it.
+    positions: Sequence[Sequence[int]]
+
+    def __init__(self, entries: Sequence[Directive]) -> None:
+        ids: dict[str, int] = {}
+        strings: list[str] = []
+        positions: list[list[int]] = []
+        for position, entry in enumerate(entries):
+            for name in TEXT_ATTRIBUTES:
+                value = getattr(entry, name, None)
+                if not value:
+                    continue
+                string = str(value)
+                string_id = ids.get(string)
+                if string_id is None:
+                    string_id = ids[string] = len(strings)
+                    strings.append(string)
+                    positions.append([position])
+                elif positions[string_id][-1] != position:
+                    positions[string_id].append(position)
+
+        trigrams: dict[str, list[int]] = defaultdict(list)
+        unfolded: list[int] = []
+        for string_id, string in enumerate(strings):
+            if not string.isascii() and any(
+                _ASCII_LETTER.match(char)
+                for char in string
+                if not char.isascii()
+            ):
+                unfolded.append(string_id)
+            for trigram in _trigrams(string.lower()):
+                trigrams[trigram].append(string_id)
+
+        self.strings = strings
+        self.positions = positions
+        self._ids = ids
+        self._trigrams = dict(trigrams)
+        self._unfolded = unfolded
+
+    def search(self, match: Match) -> Sequence[int] | None:
+        """The positions of the entries with a text matching a string match.
+
+        Returns:
+            The sorted positions of the entries or None if the index cannot
+            narrow down the strings to match, e.g., for a regular expression
+            without a literal of at least three characters.
+        """
+        if match.regex is None:
+            string_id = self._ids.get(match.search)
+            return [] if string_id is None else self.positions[string_id]
+        literals = required_literals(match.search)
+        if literals is None:
+            return None
+        trigrams = set().union(*(_trigrams(literal) for literal in literals))
+        if not trigrams:
+            return None
+        index = self._trigrams
+        by_length = sorted(
+            (index.get(trigram, ()) for trigram in trigrams), key=len
+        )
+        candidates = set(by_length[0])
+        for string_ids in by_length[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(string_ids)
+        candidates.update(self._unfolded)
+        strings = self.strings
+        search = match.match
+        return sorted(
+            set().union(
+                *(
+                    self.positions[string_id]
+                    for string_id in candidates
+                    if search(strings[string_id])
+                )
+            )
+        )
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
+from bisect import bisect_right
 from collections import defaultdict
 from dataclasses import dataclass
+from itertools import pairwise
 from operator import attrgetter
 from typing import TYPE_CHECKING
 
@@ -13,10 +16,12 @@ from fava.context import g
 from fava.core.conversion import AT_COST
 from fava.core.conversion import AT_VALUE
 from fava.core.inventory import CounterInventory
+from fava.core.inventory import ZERO
 
 if TYPE_CHECKING:  # pragma: no cover
     import datetime
     from collections.abc import Iterable
+    from collections.abc import Mapping
     from collections.abc import Sequence
 
     from beancount.core import data
@@ -135,8 +140,7 @@ class Tree(dict[str, TreeNode]):
                 for posting in getattr(entry, "postings", []):
                     account_balances[posting.account].add_position(posting)
 
-            for name, balance in sorted(account_balances.items()):
-                self.insert(name, balance)
+            self.insert_balances(account_balances)
 
     @property
     def accounts(self) -> list[str]:
@@ -173,6 +177,81 @@ class Tree(dict[str, TreeNode]):
         for parent_node in self.ancestors(name):
             parent_node.balance_children.add_inventory(balance)
 
+    def insert_balances(
+        self, balances: Mapping[str, CounterInventory]
+    ) -> None:
+        """Insert accounts with balances.
+
+        This gives exactly the same balances as inserting the accounts one by
+        one in sorted order with :meth:`insert`, but mostly sums the balances
+        of the children into their parents in a single pass from the bottom
+        up, instead of adding each balance to all ancestors.
+
+        Adding in sorted order, a number keeps the smallest exponent of the
+        numbers added since its sum last was zero and the currencies are in
+        the order that they were (re-)added in. Summing the children gives
+        the same unless a sum of a node was zero in between, which needs
+        numbers of both signs, or the subtrees of the children interleave in
+        the sorted order ("A:B2" sorts before "A:B:C"). The balances below
+        such nodes are added in sorted order instead.
+
+        Args:
+            balances: The balances of the accounts.
+        """
+        names = sorted(balances)
+        for name in names:
+            node = self.get(name, insert=True)
+            node.balance.add_inventory(balances[name])
+            node.has_txns = True
+
+        # The nodes whose balances are added in sorted order.
+        in_order: set[str] = set()
+        # Children sort after their parents, so this visits them first.
+        for name in sorted(self, reverse=True):
+            node = self[name]
+            children = node.children
+            if len(children) > 1:
+                children = sorted(children, key=attrgetter("name"))
+            balance_children = CounterInventory(node.balance)
+            summed = not any(
+                child.name in in_order for child in children
+            ) and not any(
+                first.children
+                and second.name.startswith(first.name)
+                and second.name[len(first.name)] < ":"
+                for first, second in pairwise(children)
+            )
+            if summed:
+                # Without numbers of both signs, the balance of each child
+                # has all keys of its subtree with the sign of their numbers.
+                get = balance_children.get
+                for child in children:
+                    for key, number in child.balance_children.items():
+                        current = get(key)
+                        if current is None:
+                            balance_children[key] = number
+                        elif (current > ZERO) is (number > ZERO):
+                            balance_children[key] = current + number
+                        else:
+                            summed = False
+                            break
+                    if not summed:
+                        break
+            if not summed:
+                in_order.add(name)
+                balance_children = CounterInventory(node.balance)
+                # The names of the descendants all start with the name and a
+                # colon.
+                start = (
+                    bisect_left(names, f"{name}:")
+                    if name
+                    else bisect_right(names, "")
+                )
+                end = bisect_left(names, f"{name};") if name else len(names)
+                for descendant in names[start:end]:
+                    balance_children.add_inventory(balances[descendant])
+            node.balance_children = balance_children
+
     def get(  # type: ignore[override]
         self,
         name: str,
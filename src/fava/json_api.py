@@ -27,8 +27,6 @@ from flask import jsonify
 from flask import request
 from flask_babel import gettext
 
-from fava.beans.abc import Document
-from fava.beans.abc import Event
 from fava.context import g
 from fava.core import EntryNotFoundForHashError
 from fava.core.conversion import UNITS
@@ -37,7 +35,6 @@ from fava.core.documents import is_document_or_import_file
 from fava.core.file import GeneratedEntryError
 from fava.core.file import get_entry_slice
 from fava.core.filters import FilterError
-from fava.core.group_entries import group_entries_by_type
 from fava.core.ingest import filepath_in_primary_imports_folder
 from fava.core.misc import align
 from fava.helpers import FavaAPIError
@@ -57,6 +54,8 @@ if TYPE_CHECKING:  # pragma: no cover
     from flask.wrappers import Response
 
     from fava.beans.abc import Directive
+    from fava.beans.abc import Document
+    from fava.beans.abc import Event
     from fava.core.ingest import FileImporters
     from fava.core.inventory import SimpleCounterInventory
     from fava.core.query import QueryResultTable
@@ -617,7 +616,7 @@ def get_journal_page(page: int, order: str) -> JournalPage:
 def get_events() -> Sequence[Event]:
     """Get all (filtered) events."""
     g.ledger.changed()
-    return [serialise(e) for e in g.filtered.entries if isinstance(e, Event)]
+    return [serialise(e) for e in g.filtered.entries_by_type.Event]
 
 
 @api_endpoint
@@ -631,9 +630,7 @@ def get_imports() -> Sequence[FileImporters]:
 def get_documents() -> Sequence[Document]:
     """Get all (filtered) documents."""
     g.ledger.changed()
-    return [
-        serialise(e) for e in g.filtered.entries if isinstance(e, Document)
-    ]
+    return [serialise(e) for e in g.filtered.entries_by_type.Document]
 
 
 @dataclass(frozen=True)
@@ -921,9 +918,7 @@ def get_statistics() -> Statistics:
 
     entries_by_type = {
         type_: len(entries)
-        for type_, entries in group_entries_by_type(g.filtered.entries)
-        ._asdict()
-        .items()
+        for type_, entries in g.filtered.entries_by_type._asdict().items()
     }
 
     balances = {
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import datetime
+import subprocess
+import sys
 from http import HTTPStatus
 from importlib.metadata import version
 from pathlib import Path
@@ -17,7 +19,7 @@ from fava.beans.funcs import hash_entry
 from fava.context import g
 from fava.core import StatementMetadataInvalidError
 from fava.core import StatementNotFoundError
-from fava.core.group_entries import group_entries_by_type
+from fava.core.ledger_index import LedgerIndex
 
 if TYPE_CHECKING:  # pragma: no cover
     from flask import Flask
@@ -26,6 +28,19 @@ if TYPE_CHECKING:  # pragma: no cover
 
     from .conftest import SnapshotFunc
 
+#: Modules that are slow to import and should only be imported on first use.
+DEFERRED_IMPORTS = [
+    "beangulp",
+    "beanquery",
+    "fava.core.query_shell",
+    "fava.help",
+    "markdown_it",
+    "pyexcel",
+]
+
+#: The maximum number of modules that importing the application may import.
+IMPORT_BUDGET = 500
+
 FILTER_COMBINATIONS = [
     {"account": "Assets"},
     {"filter": "any(account: Assets)"},
@@ -249,9 +264,9 @@ def test_statement_download(
         app.preprocess_request()
 
         monkeypatch.setattr(g.ledger, "all_entries", entries)
-        monkeypatch.setattr(
-            g.ledger, "all_entries_by_type", group_entries_by_type(entries)
-        )
+        index = LedgerIndex(entries)
+        monkeypatch.setattr(g.ledger, "index", index)
+        monkeypatch.setattr(g.ledger, "all_entries_by_type", index.by_type)
         assert g.ledger.get_entry(txn_hash) == txn
         with pytest.raises(StatementMetadataInvalidError):
             g.ledger.statement_path(txn_hash, "asdf")
@@ -366,3 +381,49 @@ def test_load_extension_endpoint(test_client: FlaskClient) -> None:
     response = test_client.get(url)
     assert assert_success(response)
     assert response.json == ["some data"]
+
+
+def test_ledger_slug_loader(tmp_path: Path) -> None:
+    paths: list[str] = []
+    for title in ("First", "Second", "Second"):
+        path = tmp_path / f"{title}-{len(paths)}.beancount"
+        path.write_text(f'option "title" "{title}"\n')
+        paths.append(str(path))
+    app = create_app(paths)
+    ledgers = app.config["LEDGERS"]
+
+    assert ledgers["second"].beancount_file_path == paths[1]
+    assert ledgers.first_slug() == "first"
+    assert [ledger.beancount_file_path for ledger in ledgers.ledgers] == paths
+    # The files parsed in the loader processes are not parsed again on reload.
+    for ledger in ledgers.ledgers:
+        assert len(ledger._parse_cache) == 1
+    assert ledgers["second-2"].beancount_file_path == paths[2]
+    assert [slug for slug, _ in ledgers.items()] == [
+        "first",
+        "second",
+        "second-2",
+    ]
+    with pytest.raises(KeyError):
+        ledgers["third"]
+
+
+def test_import_time() -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fava.application"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    # Each line looks like "import time: <self> | <cumulative> | <module>".
+    imported = [
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "[us]" not in line
+    ]
+    assert "fava.application" in imported
+    for module in DEFERRED_IMPORTS:
+        assert module not in imported
+    assert len(imported) <= IMPORT_BUDGET, (
+        f"Importing fava.application imports {len(imported)} modules"
+    )
@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import datetime
+import pickle
+from typing import Any
+from typing import cast
+from typing import TYPE_CHECKING
+
+import pytest
+from beancount import loader
+
+from fava.beans.abc import Document
+from fava.beans.abc import Transaction
+from fava.beans.funcs import hash_entry
+from fava.beans.load import hash_files
+from fava.beans.load import load_cached
+from fava.beans.load import load_cached_with_derived
+from fava.beans.load import load_frozen
+from fava.beans.load import load_uncached
+from fava.beans.load import ParseCache
+from fava.beans.load import read_snapshot
+from fava.beans.load import snapshot_path
+from fava.beans.load import write_snapshot
+from fava.core import FavaLedger
+from fava.core.tree import Tree
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from fava.beans.abc import Directive
+    from fava.beans.types import LoaderResult
+
+
+def test_snapshot_read_write(tmp_path: Path) -> None:
+    data_file = tmp_path / "data.beancount"
+    data_file.write_text("; data")
+    path = snapshot_path(tmp_path / "cache", str(data_file))
+    assert read_snapshot(path) is None
+
+    write_snapshot(path, hash_files([str(data_file)]), [1, 2, 3])
+    assert read_snapshot(path) == [1, 2, 3]
+
+    data_file.write_text("; changed data")
+    assert read_snapshot(path) is None
+    write_snapshot(path, hash_files([str(data_file)]), [1, 2, 3])
+    assert read_snapshot(path) == [1, 2, 3]
+
+    data_file.unlink()
+    assert read_snapshot(path) is None
+
+
+def test_snapshot_invalid(tmp_path: Path) -> None:
+    path = tmp_path / "invalid.snapshot"
+    path.write_bytes(b"not a pickle")
+    assert read_snapshot(path) is None
+
+    path.write_bytes(pickle.dumps(((0, "", (0, 0)), {}, [1, 2, 3])))
+    assert read_snapshot(path) is None
+
+    # The cache directory cannot be created since there is a file in the way.
+    blocked = tmp_path / "blocked"
+    blocked.write_text("")
+    write_snapshot(blocked / "test.snapshot", {}, [1, 2, 3])
+    assert not list(tmp_path.glob("**/*.tmp"))
+
+    # Data that cannot be pickled is not stored, without raising.
+    unpicklable = tmp_path / "cache" / "unpicklable.snapshot"
+    write_snapshot(unpicklable, {}, [lambda: None])
+    assert not unpicklable.exists()
+    assert not list(tmp_path.glob("**/*.tmp"))
+
+
+def test_load_cached(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    other = tmp_path / "other.beancount"
+    main.write_text('include "other.beancount"\n2022-01-01 open Assets:Cash\n')
+    other.write_text("2022-01-01 open Assets:Other\n")
+    cache_dir = tmp_path / "cache"
+
+    entries, errors, options = load_cached(str(main), cache_dir)
+    assert len(entries) == 2
+    assert not errors
+    assert len(list(cache_dir.iterdir())) == 1
+
+    cached_entries, _, cached_options = load_cached(str(main), cache_dir)
+    assert cached_entries == entries
+    assert cached_options["include"] == options["include"]
+
+    other.write_text(
+        "2022-01-01 open Assets:Other\n2022-01-01 open Assets:B\n"
+    )
+    entries, _, _ = load_cached(str(main), cache_dir)
+    assert len(entries) == 3
+
+
+def test_load_cached_documents_and_plugins(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        'option "documents" "docs"\n'
+        'option "insert_pythonpath" "TRUE"\n'
+        'plugin "fava_test_snapshot_plugin"\n'
+        "2020-01-01 open Assets:Cash\n"
+    )
+    plugin = tmp_path / "fava_test_snapshot_plugin.py"
+    plugin.write_text("__plugins__ = []\n")
+    (tmp_path / "docs").mkdir()
+    cache_dir = tmp_path / "cache"
+    path = snapshot_path(cache_dir, str(main))
+
+    entries, errors, _ = load_cached(str(main), cache_dir)
+    assert not errors
+    assert not [e for e in entries if isinstance(e, Document)]
+
+    # New documents are picked up, even though no included file changed.
+    documents = tmp_path / "docs" / "Assets" / "Cash"
+    documents.mkdir(parents=True)
+    (documents / "2020-02-01.receipt.pdf").write_text("")
+    assert read_snapshot(path) is None
+    entries, _, _ = load_cached(str(main), cache_dir)
+    assert len([e for e in entries if isinstance(e, Document)]) == 1
+    assert read_snapshot(path) is not None
+
+    # A change to the code of a plugin also invalidates the snapshot.
+    plugin.write_text("__plugins__ = ()\n")
+    assert read_snapshot(path) is None
+
+
+def test_load_cached_with_derived(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    main.write_text("2022-01-01 open Assets:Cash\n")
+    cache_dir = tmp_path / "cache"
+    calls = []
+
+    def derive(result: LoaderResult) -> list[Directive]:
+        calls.append(result)
+        return [result[0][0]]
+
+    # A snapshot without derived data is completed.
+    load_cached(str(main), cache_dir)
+    result, derived = load_cached_with_derived(str(main), cache_dir, derive)
+    assert len(calls) == 1
+    assert derived == result[0]
+
+    # The derived data references the same entries as the result.
+    result, derived = load_cached_with_derived(str(main), cache_dir, derive)
+    assert len(calls) == 1
+    assert derived[0] is result[0][0]
+
+    main.write_text("2022-01-01 open Assets:Other\n")
+    result, derived = load_cached_with_derived(str(main), cache_dir, derive)
+    assert len(calls) == 2
+    assert derived[0] is result[0][0]
+
+
+@pytest.fixture
+def ledger_with_includes(tmp_path: Path) -> Path:
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        'option "operating_currency" "EUR"\n'
+        'include "years/*.beancount"\n'
+        'include "missing/*.beancount"\n'
+        'include "other.beancount"\n'
+        "2022-01-01 open Assets:Cash\n"
+        "2022-01-01 open Expenses:Food\n"
+    )
+    (tmp_path / "other.beancount").write_text(
+        'option "operating_currency" "USD"\n'
+        'include "main.beancount"\n'
+        "2022-01-01 price EUR 1.10 USD\n"
+    )
+    (tmp_path / "years").mkdir()
+    for year in (2022, 2023):
+        (tmp_path / "years" / f"{year}.beancount").write_text(
+            f'{year}-02-01 * "Shop" "Groceries"\n'
+            "  Assets:Cash  -10.00 EUR\n"
+            "  Expenses:Food\n"
+        )
+    return main
+
+
+def test_load_with_parse_cache_matches_beancount(
+    ledger_with_includes: Path,
+) -> None:
+    path = str(ledger_with_includes)
+    entries, errors, options = load_uncached(
+        path, is_encrypted=False, parse_cache=ParseCache()
+    )
+    expected_entries, expected_errors, expected_options = loader._load(
+        [(path, True)], None, None, None
+    )
+    assert entries == cast("Sequence[Directive]", expected_entries)
+    assert [e.message for e in errors] == [e.message for e in expected_errors]
+    assert len(errors) == 2
+    options_dict: dict[str, Any] = dict(options)
+    assert str(options_dict.pop("dcontext")) == str(
+        expected_options.pop("dcontext")
+    )
+    assert options_dict == expected_options
+    assert options["operating_currency"] == ["EUR", "USD"]
+
+
+def test_load_with_parse_cache_in_parallel(
+    ledger_with_includes: Path,
+) -> None:
+    path = str(ledger_with_includes)
+    parse_cache = ParseCache(processes=2)
+    entries, errors, options = load_uncached(
+        path, is_encrypted=False, parse_cache=parse_cache
+    )
+    expected_entries, expected_errors, expected_options = load_uncached(
+        path, is_encrypted=False, parse_cache=ParseCache()
+    )
+    assert entries == expected_entries
+    assert [e.message for e in errors] == [e.message for e in expected_errors]
+    assert options["include"] == expected_options["include"]
+    assert len(parse_cache) == 4
+
+
+def test_load_with_parse_cache_incremental(
+    ledger_with_includes: Path,
+) -> None:
+    path = str(ledger_with_includes)
+    parse_cache = ParseCache()
+    entries, _, options = load_uncached(
+        path, is_encrypted=False, parse_cache=parse_cache
+    )
+    assert len(parse_cache) == 4
+    parsed = {name: parse_cache.parse(name) for name in options["include"]}
+
+    year = ledger_with_includes.parent / "years" / "2023.beancount"
+    year.write_text(year.read_text().replace("10.00", "12.00"))
+    new_entries, _, new_options = load_uncached(
+        path, is_encrypted=False, parse_cache=parse_cache
+    )
+    assert len(new_entries) == len(entries)
+    last_entry = new_entries[-1]
+    assert isinstance(last_entry, Transaction)
+    assert last_entry.postings[0].units.number == -12
+    assert new_options["include"] == options["include"]
+    for name in options["include"]:
+        # only the changed file should have been parsed again
+        assert (parse_cache.parse(name) is parsed[name]) == (name != str(year))
+
+    # Rewriting the file with the same contents does not require reparsing.
+    reparsed = parse_cache.parse(str(year))
+    year.write_text(year.read_text())
+    load_uncached(path, is_encrypted=False, parse_cache=parse_cache)
+    assert parse_cache.parse(str(year)) is reparsed
+
+    # Results for files that are no longer included are dropped.
+    year.unlink()
+    load_uncached(path, is_encrypted=False, parse_cache=parse_cache)
+    assert len(parse_cache) == 3
+
+
+def test_ledger_with_cache_dir(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        '2022-01-01 custom "fava-option" "cache-dir" "cache"\n'
+        "2022-01-01 open Assets:Cash\n"
+    )
+    ledger = FavaLedger(str(main))
+    assert ledger.cache_dir == tmp_path / "cache"
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    assert ledger.fava_options.cache_dir == str(tmp_path / "cache")
+
+    other_dir = tmp_path / "other"
+    ledger = FavaLedger(str(main), cache_dir=str(other_dir))
+    assert ledger.cache_dir == other_dir
+    assert len(ledger.all_entries) == 2
+    assert len(list(other_dir.iterdir())) == 1
+
+
+def test_ledger_index_in_snapshot(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        "2022-01-01 open Assets:Cash\n"
+        "2022-01-01 open Expenses:Food\n"
+        '2022-01-02 * "Shop" "Food"\n'
+        "  Assets:Cash  -10 USD\n"
+        "  Expenses:Food\n"
+    )
+    cache_dir = tmp_path / "cache"
+    ledger = FavaLedger(str(main), cache_dir=str(cache_dir))
+    cached = FavaLedger(str(main), cache_dir=str(cache_dir))
+    assert cached.index.rankings == ledger.index.rankings
+    assert cached.attributes.payees == ["Shop"]
+    txn = cached.all_entries_by_type.Transaction[0]
+    assert cached.index.entry_hashes == {
+        hash_entry(entry): entry for entry in cached.all_entries
+    }
+    assert cached.get_entry(hash_entry(txn)) is txn
+    assert cached.index.by_type.Transaction[0] is cached.all_entries[-1]
+
+
+def _write_ledger_with_archive(tmp_path: Path) -> Path:
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        'include "2021.beancount"\n'
+        '2021-01-01 custom "fava-option" "cache-dir" "cache"\n'
+        '2021-01-01 custom "fava-option" "frozen-until" "2022-01-01"\n'
+        "2021-01-01 open Assets:Cash\n"
+        "2021-01-01 open Expenses:Food\n"
+        "2021-01-01 open Equity:Opening-Balances\n"
+        '2022-02-01 * "Shop"\n'
+        "  Assets:Cash  -5 USD\n"
+        "  Expenses:Food\n"
+        "2022-03-01 balance Assets:Cash 85 USD\n"
+    )
+    (tmp_path / "2021.beancount").write_text(
+        '2021-01-02 * "Init"\n'
+        "  Assets:Cash  100 USD\n"
+        "  Equity:Opening-Balances\n"
+        '2021-05-02 * "Shop"\n'
+        "  Assets:Cash  -10 USD\n"
+        "  Expenses:Food\n"
+        '2021-06-01 note Assets:Cash "Note"\n'
+        "2021-06-01 price EUR 1.2 USD\n"
+    )
+    return main
+
+
+def _balances(entries: Sequence[Directive]) -> dict[str, str]:
+    return {
+        name: str(node.balance)
+        for name, node in Tree(entries).items()
+        if not name.startswith("Equity")
+    }
+
+
+def test_load_frozen(tmp_path: Path) -> None:
+    main = _write_ledger_with_archive(tmp_path)
+    path = str(main)
+    cache_dir = tmp_path / "cache"
+    frozen_until = datetime.date(2022, 1, 1)
+    full_entries, _, _ = load_uncached(path, is_encrypted=False)
+
+    entries, errors, options = load_frozen(path, cache_dir, frozen_until)
+    assert not errors
+    assert _balances(entries) == _balances(full_entries)
+    assert len(options["include"]) == 2
+
+    # Only the live files are parsed when the frozen history is reused.
+    parse_cache = ParseCache()
+    entries, errors, _ = load_frozen(
+        path, cache_dir, frozen_until, parse_cache
+    )
+    assert not errors
+    assert len(parse_cache) == 1
+    assert _balances(entries) == _balances(full_entries)
+    narrations = [e.narration for e in entries if hasattr(e, "narration")]
+    assert "Init" not in narrations
+    assert narrations[-1] == "Shop"
+    types = {type(entry).__name__ for entry in entries}
+    assert types == {
+        "Open",
+        "Note",
+        "Price",
+        "Transaction",
+        "Balance",
+        "Custom",
+    }
+
+    # A change to the history in a live file summarises it again.
+    main.write_text(
+        main.read_text()
+        + '2021-12-01 * "Shop"\n  Assets:Cash  -1 USD\n  Expenses:Food\n'
+    )
+    entries, errors, _ = load_frozen(
+        path, cache_dir, frozen_until, parse_cache
+    )
+    assert len(errors) == 1
+    full_entries, full_errors, _ = load_uncached(path, is_encrypted=False)
+    assert len(full_errors) == 1
+    assert _balances(entries) == _balances(full_entries)
+
+
+def test_ledger_with_frozen_history(tmp_path: Path) -> None:
+    main = _write_ledger_with_archive(tmp_path)
+    ledger = FavaLedger(str(main))
+    assert ledger.frozen_until == datetime.date(2022, 1, 1)
+    assert not ledger.load_errors
+    notes = ledger.all_entries_by_type.Note
+    assert len(notes) == 1
+    assert all(
+        txn.date.year == 2021 + (txn.narration == "Shop")
+        for txn in ledger.all_entries_by_type.Transaction
+    )
+
+    # Reports starting before the date use the full history.
+    filtered = ledger.get_filtered(time="2021")
+    assert filtered.ledger is ledger.full_history
+    assert filtered.ledger.frozen_until is None
+    assert {
+        e.narration for e in filtered.entries if hasattr(e, "narration")
+    } == {"Init", "Shop"}
+    # All others use the summarised history.
+    assert ledger.get_filtered(time="2022").ledger is ledger
+    assert ledger.get_filtered().ledger is ledger
+    assert ledger.get_filtered(account="Assets").ledger is ledger
+    assert "Init" not in {
+        e.narration
+        for e in ledger.get_filtered().entries
+        if hasattr(e, "narration")
+    }
+    txn = ledger.full_history.all_entries_by_type.Transaction[0]
+    assert ledger.get_entry(hash_entry(txn)) is txn
+    entry, before, after = ledger.context(hash_entry(txn))
+    assert entry is txn
+    assert before == {"Assets:Cash": [], "Equity:Opening-Balances": []}
+    assert after == {
+        "Assets:Cash": ["100 USD"],
+        "Equity:Opening-Balances": ["-100 USD"],
+    }
+    full_history = ledger.full_history
+    assert ledger.full_history is full_history
+    ledger.load_file()
+    assert ledger.full_history is not full_history
+
+    full = FavaLedger(str(main), full_history=True)
+    assert full.frozen_until is None
+    assert full.full_history is full
+    assert len(full.all_entries_by_type.Transaction) == 3
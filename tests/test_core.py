@@ -1,21 +1,33 @@
 from __future__ import annotations
 
+import datetime
+import os
+import time
 from pathlib import Path
+from typing import Literal
 from typing import TYPE_CHECKING
 
 import pytest
 
 from fava.beans.funcs import hash_entry
+from fava.beans.helpers import slice_entry_dates
 from fava.core import EntryNotFoundForHashError
+from fava.core import FavaLedger
 from fava.core import FilteredLedger
+from fava.core.accounts import AccountDict
+from fava.core.file import _incomplete_sortkey
+from fava.core.group_entries import group_entries_by_type
+from fava.core.misc import NO_OPERATING_CURRENCY_ERROR
+from fava.core.tree import Tree
 from fava.util.date import local_today
 from fava.util.date import Month
+from fava.util.date import Quarter
 
 if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Sequence
 
     from fava.beans.abc import Directive
-    from fava.core import FavaLedger
+    from fava.util.date import Interval
 
 
 def test_attributes(example_ledger: FavaLedger) -> None:
@@ -47,6 +59,25 @@ def test_filtered_ledger(
     assert not year_2012.account_is_closed(closed_acc)
     assert not year_2012.account_is_closed(unclosed_acc)
 
+    assert (
+        all_entries.entries_by_type is small_example_ledger.all_entries_by_type
+    )
+    assert year_2012.entries_by_type == group_entries_by_type(
+        year_2012.entries
+    )
+
+    # Prices are merged into the filtered entries like when sorting them.
+    for filtered in (
+        all_entries,
+        FilteredLedger(small_example_ledger, account="Assets"),
+    ):
+        entries_with_all_prices = [
+            *filtered.entries,
+            *small_example_ledger.all_entries_by_type.Price,
+        ]
+        entries_with_all_prices.sort(key=_incomplete_sortkey)
+        assert filtered.entries_with_all_prices == entries_with_all_prices
+
 
 def test_ledger_get_entry(
     small_example_ledger: FavaLedger,
@@ -167,3 +198,129 @@ def test_paginate_journal(small_example_ledger: FavaLedger) -> None:
     assert len(set(all_indices)) == total_entries
     assert all(0 <= idx < total_entries for idx in all_indices)
     assert len(set(all_entries)) == total_entries
+
+    enumerated = list(enumerate(filtered.entries_without_prices))
+    orders: tuple[
+        tuple[Literal["asc", "desc"], Sequence[tuple[int, Directive]]], ...
+    ] = (
+        ("asc", enumerated),
+        ("desc", enumerated[::-1]),
+    )
+    for order, expected in orders:
+        pages = [
+            filtered.paginate_journal(page, 3, order)
+            for page in range(1, (total_entries + 2) // 3 + 1)
+        ]
+        assert [item for page in pages if page for item in page.entries] == (
+            expected
+        )
+    assert filtered.paginate_journal(total_entries, 3) is None
+
+
+def test_background_reload(tmp_path: Path) -> None:
+    path = tmp_path / "main.beancount"
+    path.write_text("2022-01-01 open Assets:Cash\n")
+    ledger = FavaLedger(str(path), poll_watcher=True, background_reload=True)
+    assert ledger.latest is ledger
+    assert not ledger.changed()
+
+    path.write_text("2022-01-01 open Assets:Cash\n2022-01-01 open Assets:B\n")
+    future = time.time() + 10
+    os.utime(path, (future, future))
+    ledger.changed()
+    for _ in range(500):  # pragma: no branch
+        if ledger.latest is not ledger:
+            break
+        time.sleep(0.01)
+    reloaded = ledger.latest
+    assert reloaded is not ledger
+    assert ledger.changed()
+    assert not reloaded.changed()
+    # The previous ledger object is left unchanged.
+    assert len(ledger.all_entries) == 1
+    assert len(reloaded.all_entries) == 2
+    assert reloaded.mtime > ledger.mtime
+    assert reloaded.accounts.ledger is reloaded
+
+    reloaded.reload()
+    assert reloaded.latest is not reloaded
+    assert ledger.latest is reloaded.latest
+
+
+def test_background_reload_after_edit(tmp_path: Path) -> None:
+    path = tmp_path / "main.beancount"
+    path.write_text("2022-01-01 open Assets:Cash\n")
+    ledger = FavaLedger(str(path), poll_watcher=True, background_reload=True)
+    entry = ledger.all_entries[0]
+    ledger.file.insert_metadata(hash_entry(entry), "key", "value")
+    # The edit is reloaded synchronously, not in a background thread.
+    reloaded = ledger.latest
+    assert reloaded is not ledger
+    assert reloaded.all_entries[0].meta["key"] == "value"
+
+
+def test_lazy_modules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    loads: list[AccountDict] = []
+    load_accounts = AccountDict.load_file
+
+    def _load_file(self: AccountDict) -> None:
+        loads.append(self)
+        load_accounts(self)
+
+    monkeypatch.setattr(AccountDict, "load_file", _load_file)
+    path = tmp_path / "main.beancount"
+    path.write_text("2022-01-01 open Assets:Cash\n")
+    ledger = FavaLedger(str(path))
+    assert not loads
+    assert list(ledger.accounts) == ["Assets:Cash"]
+    assert list(ledger.accounts) == ["Assets:Cash"]
+    assert len(loads) == 1
+
+    path.write_text("2022-01-01 open Assets:Cash\n2022-01-01 open Assets:B\n")
+    ledger.load_file()
+    assert len(loads) == 1
+    assert list(ledger.accounts) == ["Assets:Cash", "Assets:B"]
+    assert len(loads) == 2
+
+    # Modules that cannot have any errors are not loaded for them.
+    assert ledger.errors == [NO_OPERATING_CURRENCY_ERROR]
+    assert "budgets" not in ledger._module_generations
+    assert "ingest" not in ledger._module_generations
+    assert "misc" not in ledger._module_generations
+
+
+@pytest.mark.parametrize("accumulate", [False, True])
+@pytest.mark.parametrize(("interval", "count"), [(Month, 24), (Quarter, 8)])
+def test_interval_balances(
+    example_ledger: FavaLedger,
+    interval: Interval,
+    count: int,
+    *,
+    accumulate: bool,
+) -> None:
+    filtered = example_ledger.get_filtered(time="2015 - 2016")
+    trees, date_ranges = example_ledger.interval_balances(
+        filtered, interval, "Expenses", accumulate=accumulate
+    )
+    assert len(trees) == len(date_ranges) == count
+    assert date_ranges[0].begin > date_ranges[-1].begin
+    min_accounts = [
+        a for a in example_ledger.accounts if a.startswith("Expenses")
+    ]
+    for tree, date_range in zip(trees, date_ranges, strict=True):
+        expected = Tree(
+            slice_entry_dates(
+                filtered.entries,
+                datetime.date.min if accumulate else date_range.begin,
+                date_range.end,
+            ),
+            min_accounts,
+        )
+        assert list(tree) == list(expected)
+        for name, node in expected.items():
+            assert tree[name].balance.to_strings() == node.balance.to_strings()
+            assert (
+                tree[name].balance_children.to_strings()
+                == node.balance_children.to_strings()
+            )
+            assert tree[name].has_txns == node.has_txns
@@ -9,7 +9,10 @@ import pytest
 
 from fava.core.charts import dumps
 from fava.core.fava_options import FavaOptions
+from fava.core.fava_options import find_cache_dir_option
+from fava.core.fava_options import find_frozen_until_option
 from fava.core.fava_options import InsertEntryOption
+from fava.core.fava_options import InvalidFrozenUntilOptionError
 from fava.core.fava_options import NotARegularExpressionError
 from fava.core.fava_options import parse_options
 from fava.core.fava_options import UnknownLocaleOptionError
@@ -111,3 +114,33 @@ def test_fava_options_set_import_dirs() -> None:
     options.set_import_dirs("/path/with spaces")
     options.set_import_dirs("/simple/path")
     assert list(options.import_dirs) == ["/path/with spaces", "/simple/path"]
+
+
+def test_fava_options_cache_dir(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    assert find_cache_dir_option(str(main)) is None
+    main.write_text('2016-04-14 custom "fava-option" "indent" "4"\n')
+    assert find_cache_dir_option(str(main)) is None
+    main.write_text('2016-04-14 custom "fava-option" "cache-dir" ".cache"\n')
+    assert find_cache_dir_option(str(main)) == str(tmp_path / ".cache")
+
+    options = FavaOptions()
+    options.set_cache_dir("/cache", str(main))
+    assert options.cache_dir == str(Path("/cache").absolute())
+
+
+def test_fava_options_frozen_until(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    assert find_frozen_until_option(str(main)) is None
+    main.write_text('2016-04-14 custom "fava-option" "frozen-until" "x"\n')
+    assert find_frozen_until_option(str(main)) is None
+    main.write_text(
+        '2016-04-14 custom "fava-option" "frozen_until" "2016-01-01"\n'
+    )
+    assert find_frozen_until_option(str(main)) == datetime.date(2016, 1, 1)
+
+    options = FavaOptions()
+    options.set_frozen_until("2020-01-01")
+    assert options.frozen_until == datetime.date(2020, 1, 1)
+    with pytest.raises(InvalidFrozenUntilOptionError):
+        options.set_frozen_until("2020")
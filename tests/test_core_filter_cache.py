@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fava.core import FilteredLedger
+from fava.core.filter_cache import compact_positions
+from fava.core.filter_cache import FilterCache
+from fava.core.filter_cache import positions_size
+from fava.core.filter_cache import StageStats
+from fava.core.filters import AdvancedFilter
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fava.core import FavaLedger
+
+
+def test_filter_cache() -> None:
+    cache = FilterCache(max_size=1000)
+    computed: list[str] = []
+
+    def get(key: str, size: int) -> str:
+        def compute() -> str:
+            computed.append(key)
+            return key.upper()
+
+        return cache.get("stage", key, compute, lambda _: size)
+
+    assert get("a", 400) == "A"
+    assert get("b", 400) == "B"
+    assert get("a", 400) == "A"
+    assert computed == ["a", "b"]
+    assert cache.stats == {"stage": StageStats(hits=1, misses=2)}
+    assert cache.size == 800
+
+    # "b" is the least recently used value and evicted.
+    assert get("c", 400) == "C"
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert get("b", 400) == "B"
+    assert computed == ["a", "b", "c", "b"]
+
+    # A value that exceeds the budget on its own is kept.
+    assert get("d", 2000) == "D"
+    assert len(cache) == 1
+    assert cache.size == 2000
+
+    def fail() -> str:
+        msg = "failed"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="failed"):
+        cache.get("stage", "e", fail, lambda _: 0)
+    assert len(cache) == 1
+
+    cache.clear()
+    assert not len(cache)
+    assert not cache.size
+
+
+def test_positions_size() -> None:
+    positions = list(range(0, 2000, 2))
+    compact = compact_positions(positions)
+    assert list(compact) == positions
+    assert compact_positions(compact) is compact
+    assert positions_size(compact) < positions_size(positions)
+    assert positions_size(range(100_000)) < positions_size(compact)
+
+
+def test_ledger_filter_stages(example_ledger: FavaLedger) -> None:
+    cache = example_ledger.filter_cache
+    cache.clear()
+    before = cache.stats
+
+    def delta(stage: str) -> tuple[int, int]:
+        stats = cache.stats[stage]
+        prev = before.get(stage, StageStats())
+        return stats.hits - prev.hits, stats.misses - prev.misses
+
+    filtered = example_ledger.get_filtered("Assets", "#tag", "2015")
+    assert example_ledger.get_filtered("Assets", " #tag ", "2015") is filtered
+    example_ledger.get_filtered("Assets", "#tag", "2016")
+    example_ledger.get_filtered("Assets", "#other", "2016")
+    example_ledger.get_filtered("Assets", "#other")
+
+    assert delta("time") == (1, 4)
+    assert delta("advanced") == (2, 2)
+    assert delta("account") == (1, 1)
+
+    direct = FilteredLedger(
+        example_ledger, account="Assets", filter="#tag", time="2015"
+    )
+    assert filtered.entries == direct.entries
+
+
+def test_ledger_filter_refinement(example_ledger: FavaLedger) -> None:
+    cache = example_ledger.filter_cache
+    cache.clear()
+    assert cache.peek("advanced", (None, ())) is None
+
+    for filter_ in (
+        "payee:BayBook",
+        "payee:BayBook -#test",
+        "payee:BayBook -#test >30",
+    ):
+        before = cache.stats.get("advanced", StageStats())
+        filtered = example_ledger.get_filtered(filter=filter_)
+        assert filtered.entries == AdvancedFilter(filter_).apply(
+            example_ledger.all_entries
+        )
+        after = cache.stats["advanced"]
+        # The refined filters start from the positions of the previous one.
+        assert after.hits - before.hits == (filter_ != "payee:BayBook")
@@ -13,6 +13,7 @@ from fava.core.filter_parser import CLOSE
 from fava.core.filter_parser import CMP_OP
 from fava.core.filter_parser import COLON
 from fava.core.filter_parser import COMMA
+from fava.core.filter_parser import compile_filter
 from fava.core.filter_parser import DASH
 from fava.core.filter_parser import KEY
 from fava.core.filter_parser import LINK
@@ -27,6 +28,7 @@ from fava.util.parsing import ParseError
 from fava.util.parsing import UnexpectedTokenError
 
 if TYPE_CHECKING:  # pragma: no cover
+    from fava.core import FavaLedger
     from fava.util.parsing import TokenKind
 
 
@@ -42,6 +44,9 @@ def test_match() -> None:
     assert not Match("asdf")("fdsadfs")
     assert not Match("^asdf")("aasdfasdf")
     assert Match("(((")("(((")
+    assert Match("asdf") == Match("asdf")
+    assert hash(Match("asdf")) == hash(Match("asdf"))
+    assert Match("asdf") != Match("ASDF")
 
 
 def test_match_amount() -> None:
@@ -71,6 +76,17 @@ def test_match_amount() -> None:
     assert MatchAmount("<=", two)(two_amt)
     assert MatchAmount("<=", two)(one_amt)
 
+    assert MatchAmount("<=", two) == MatchAmount("<=", Decimal("2.0"))
+    assert MatchAmount("<=", two) != MatchAmount("<", two)
+
+
+def test_parse_filter_cached() -> None:
+    assert parse_filter("#tag payee:Shop") is parse_filter("#tag payee:Shop")
+    # Filter expressions compare equal for the same filter.
+    assert parse_filter("#tag -payee:Shop >10") == parse_filter(
+        "#tag  -payee:Shop >10"
+    )
+
 
 def test_lexer_basic() -> None:
     assert lex("#some_tag ^some_link -^some_link") == [
@@ -168,3 +184,29 @@ def test_lexer_comma() -> None:
 def test_parse_filter_invalid(string: str, error: str) -> None:
     with pytest.raises(ParseError, match=re.escape(error)):
         parse_filter(string)
+
+
+@pytest.mark.parametrize(
+    "string",
+    [
+        "#test",
+        "^test-link -#test",
+        "BayBook, Coffee, -#test",
+        'payee:"BayBo.*" >100',
+        'payee:""',
+        'name:".*etf" (#test, -^test-link)',
+        "number > 1",
+        'any(account:"Assets:US:ETrade" > 10) #test, all(-account:"Assets")',
+        'narration:"Payment" date:"2016"',
+        'comment:"." -payee:"x"',
+    ],
+)
+def test_compile_filter(example_ledger: FavaLedger, string: str) -> None:
+    expr = parse_filter(string)
+    compiled = compile_filter(expr)
+    entries = example_ledger.all_entries
+    # the memoised results are used when matching the entries a second time
+    for _ in range(2):
+        assert [e for e in entries if compiled(e)] == [
+            e for e in entries if expr(e)
+        ]
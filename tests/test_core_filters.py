@@ -57,6 +57,9 @@ def test_emoji_search_in_narration() -> None:
         ('payee:"baybo.*"', 62),
         (r'number:"\d*"', 3),
         ('not_a_meta_key:".*"', 0),
+        ('lineno:"100"', 6),
+        ('lineno:"1"', 714),
+        ('filename:"long-example"', 1826),
         ('name:".*ETF"', 4),
         ('name:".*ETF$"', 3),
         ('name:".*etf"', 4),
@@ -67,6 +70,10 @@ def test_emoji_search_in_narration() -> None:
         (">=17500 <18000", 1),
         ("any(units >= 17500)", 3),
         ("any(>=17500)", 3),
+        ("all(<17500)", 1823),
+        ("-(>=17500)", 1823),
+        ("<=0", 24),
+        ("BayBook >100", 62),
     ],
 )
 def test_advanced_filter(
@@ -78,6 +85,17 @@ def test_advanced_filter(
     filtered_entries = filter_.apply(example_ledger.all_entries)
     assert len(filtered_entries) == number
 
+    index = example_ledger.index
+    positions = filter_.positions(index, range(len(index.entries)))
+    assert index.entries_at(positions) == filtered_entries
+
+    # Filter only the entries matching an account filter.
+    within = AccountFilter("Assets").positions(index)
+    positions = filter_.positions(index, within)
+    assert index.entries_at(positions) == filter_.apply(
+        index.entries_at(within)
+    )
+
 
 def test_null_meta_posting() -> None:
     filter_ = AdvancedFilter('any(some_meta:"1")')
@@ -114,6 +132,17 @@ def test_account_filter(example_ledger: FavaLedger) -> None:
     assert len(filtered_entries) == 67
 
 
+def test_account_filter_with_index(example_ledger: FavaLedger) -> None:
+    entries = example_ledger.all_entries
+    index = example_ledger.index
+    positions = AccountFilter("").positions(index)
+    assert index.entries_at(positions) is entries
+    for value in ["Assets", ".*US:State", "Expenses:Food", "Unknown"]:
+        account_filter = AccountFilter(value)
+        positions = account_filter.positions(index)
+        assert index.entries_at(positions) == account_filter.apply(entries)
+
+
 def test_time_filter(example_ledger: FavaLedger) -> None:
     time_filter = TimeFilter(
         example_ledger.options,
@@ -144,6 +173,20 @@ def test_time_filter(example_ledger: FavaLedger) -> None:
         )
 
 
+@pytest.mark.parametrize(
+    "value",
+    ["1000", "2014", "2015-03", "2016-02-15 - 2016-05-03", "2016-q2", "2099"],
+)
+def test_time_filter_with_index(
+    example_ledger: FavaLedger, value: str
+) -> None:
+    ledger = example_ledger
+    time_filter = TimeFilter(ledger.options, ledger.fava_options, value)
+    assert time_filter.apply_to_index(ledger.index) == time_filter.apply(
+        ledger.all_entries
+    )
+
+
 def test_filter_error_contains_the_filter() -> None:
     with pytest.raises(
         FilterError,
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from typing import TYPE_CHECKING
 
 import pytest
 
 from fava.beans import create
 from fava.core.inventory import CounterInventory
+from fava.core.inventory import ScaledCounterInventory
 from fava.core.inventory import SimpleCounterInventory
 
+if TYPE_CHECKING:  # pragma: no cover
+    from fava.core import FavaLedger
+
 
 def test_no_iter_possible() -> None:
     inv = CounterInventory()
@@ -60,3 +65,60 @@ def test_add_inventory() -> None:
     inv = CounterInventory()
     inv.add_inventory(inv2)
     assert len(inv) == 1
+
+
+@pytest.mark.parametrize(
+    "numbers",
+    [
+        ["1.50", "-1.50", "2.5"],
+        ["1.50", "0", "-0.5", "0.000"],
+        ["5E+1", "1", "0.01"],
+        ["0.001", "1.50", "-0.001"],
+        ["1.50", "0.125", "-1.625", "1.1"],
+        ["1", "0.0001", "2"],
+    ],
+)
+def test_scaled_counter_inventory(numbers: list[str]) -> None:
+    scaled = ScaledCounterInventory({"EUR": 4, "USD": 4})
+    inv = CounterInventory()
+    for number in numbers:
+        decimal = Decimal(number)
+        exponent = decimal.as_tuple().exponent
+        assert isinstance(exponent, int)
+        for key in [("EUR", None), ("USD", None)]:
+            scaled.add_scaled(key, int(decimal.scaleb(4)), exponent)
+            inv.add(key, decimal)
+    copied = scaled.copy()
+    result = scaled.to_counter_inventory()
+    assert result == inv
+    assert result.to_strings() == inv.to_strings()
+    assert len(scaled) == len(inv)
+    assert scaled.is_empty() == inv.is_empty()
+    copied.add_scaled(("EUR", None), 1, 0)
+    assert scaled.to_counter_inventory() == inv
+
+
+def test_scaled_counter_inventory_ledger(example_ledger: FavaLedger) -> None:
+    table = example_ledger.index.posting_table
+    scales = dict(zip(table.currency_names, table.scales, strict=True))
+    scaled: dict[str, ScaledCounterInventory] = {}
+    for row, account_id in enumerate(table.accounts):
+        account = table.account_names[account_id]
+        scaled.setdefault(account, ScaledCounterInventory(scales))
+        scaled[account].add_scaled(
+            (
+                table.currency_names[table.currencies[row]],
+                table.cost_values[table.costs[row]],
+            ),
+            table.numbers[row],
+            table.exponents[row],
+        )
+    balances: dict[str, CounterInventory] = {}
+    for entry in example_ledger.all_entries:
+        for posting in getattr(entry, "postings", []):
+            balances.setdefault(posting.account, CounterInventory())
+            balances[posting.account].add_position(posting)
+    assert {
+        account: inv.to_counter_inventory().to_strings()
+        for account, inv in scaled.items()
+    } == {account: inv.to_strings() for account, inv in balances.items()}
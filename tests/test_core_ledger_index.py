@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fava.core.accounts import get_last_entry
+from fava.core.group_entries import group_entries_by_account
+from fava.core.group_entries import group_entries_by_type
+from fava.core.ledger_index import difference
+from fava.core.ledger_index import intersection
+from fava.core.ledger_index import LedgerIndex
+from fava.core.ledger_index import union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.core import FavaLedger
+
+
+def test_ledger_index(example_ledger: FavaLedger) -> None:
+    entries = example_ledger.all_entries
+    index = LedgerIndex(entries)
+
+    assert index.by_type == group_entries_by_type(entries)
+    entries_by_account = group_entries_by_account(entries)
+    assert index.entries_by_account == entries_by_account
+    assert list(index.entries_by_account) == list(entries_by_account)
+    for account, txn_postings in entries_by_account.items():
+        assert index.last_entry.get(account) == get_last_entry(txn_postings)
+
+    transactions = index.by_type.Transaction
+    assert set(index.payees) == {txn.payee for txn in transactions} - {None}
+    for payee, payee_transactions in index.payees.items():
+        assert payee_transactions == [
+            txn for txn in transactions if txn.payee == payee
+        ]
+    assert "USD" in index.currencies
+    assert index.dates == sorted({entry.date for entry in entries})
+    assert index.tags == sorted(index.tags)
+
+
+def test_ledger_index_tags_and_links(
+    load_doc_entries: Sequence[Directive],
+) -> None:
+    """
+    2016-01-01 open Assets:Cash
+    2016-01-01 open Expenses:Food
+
+    2016-01-02 * "Shop" "Groceries" #tag2 ^link1
+        Assets:Cash  -10 USD
+        Expenses:Food
+
+    2016-01-03 * "Groceries" #tag1 ^link1
+        Assets:Cash  -10 USD
+        Expenses:Food
+
+    2016-01-04 note Assets:Cash "Note" #tag3
+      key: "value"
+    """
+    index = LedgerIndex(load_doc_entries)
+    assert index.tags == ["tag1", "tag2", "tag3"]
+    assert index.links == ["link1"]
+    assert list(index.payees) == ["Shop"]
+    assert len(index.dates) == 4
+    assert (
+        index.currencies["USD"]
+        == [load_doc_entries[2].date] * 2 + [load_doc_entries[3].date] * 2
+    )
+    last_cash_entry = index.last_entry["Assets:Cash"]
+    assert last_cash_entry is load_doc_entries[-1]
+
+    assert index.tag_positions == {"tag1": [3], "tag2": [2], "tag3": [4]}
+    assert index.link_positions == {"link1": [2, 3]}
+    assert index.payee_positions == {"Shop": [2]}
+    assert index.meta_key_positions == {"key": [4]}
+    assert index.account_positions == {
+        "Assets:Cash": [0, 2, 3, 4],
+        "Expenses:Food": [1, 2, 3],
+    }
+    assert index.entries_at([0, 4]) == [
+        load_doc_entries[0],
+        load_doc_entries[4],
+    ]
+
+
+def test_position_set_operations() -> None:
+    assert union([]) == []
+    assert union([[1, 3]]) == [1, 3]
+    assert union([[1, 3], [2, 3], []]) == [1, 2, 3]
+    assert intersection([[1, 3]]) == [1, 3]
+    assert intersection([range(10), [2, 3, 11], [3, 7]]) == [3]
+    assert intersection([[1], []]) == []
+    assert difference(range(4), [1, 2]) == [0, 3]
+    assert difference([1, 2], []) == [1, 2]
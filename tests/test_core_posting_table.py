@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from fava.beans import create
+from fava.core.filters import AccountFilter
+from fava.core.inventory import CounterInventory
+from fava.core.posting_table import PostingTable
+from fava.core.tree import Tree
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.beans.abc import Meta
+    from fava.core import FavaLedger
+
+
+def _balances(entries: Sequence[Directive]) -> dict[str, CounterInventory]:
+    balances: dict[str, CounterInventory] = defaultdict(CounterInventory)
+    for entry in entries:
+        for posting in getattr(entry, "postings", []):
+            balances[posting.account].add_position(posting)
+    return dict(balances)
+
+
+def _as_strings(
+    balances: dict[str, CounterInventory],
+) -> dict[str, list[str]]:
+    return {
+        account: balance.to_strings() for account, balance in balances.items()
+    }
+
+
+def test_posting_table(example_ledger: FavaLedger) -> None:
+    entries = example_ledger.all_entries
+    table = PostingTable(entries)
+    assert len(table) == sum(
+        len(getattr(entry, "postings", [])) for entry in entries
+    )
+    assert _as_strings(table.balances()) == _as_strings(_balances(entries))
+
+    index = example_ledger.index
+    positions = AccountFilter("Assets").positions(index)
+    assert _as_strings(table.balances(table.rows(positions))) == _as_strings(
+        _balances(index.entries_at(positions))
+    )
+
+
+def test_posting_table_exponents() -> None:
+    meta: Meta = {"filename": "<posting_table>", "lineno": 0}
+    date = datetime.date(2022, 1, 1)
+
+    def txn(*numbers: str) -> Directive:
+        return create.transaction(
+            meta,
+            date,
+            "*",
+            None,
+            "",
+            postings=[
+                create.posting(
+                    f"Assets:Cash{i}", create.amount(Decimal(number), "EUR")
+                )
+                for i, number in enumerate(numbers)
+            ],
+        )
+
+    entries = [
+        txn("1.50", "0", "5E+1"),
+        txn("-1.50", "0.000", "1"),
+        txn("2.5", "1.1", "1"),
+    ]
+    balances = PostingTable(entries).balances()
+    assert _as_strings(balances) == _as_strings(_balances(entries))
+    assert balances["Assets:Cash0"].to_strings() == ["2.5 EUR"]
+    assert balances["Assets:Cash1"].to_strings() == ["1.1 EUR"]
+    assert balances["Assets:Cash2"].to_strings() == ["52 EUR"]
+
+
+def test_filtered_ledger_tree(example_ledger: FavaLedger) -> None:
+    filtered = example_ledger.get_filtered(account="Assets")
+    assert filtered.positions is not None
+    tree = Tree(filtered.entries)
+    assert list(filtered.root_tree) == list(tree)
+    for name, node in tree.items():
+        table_node = filtered.root_tree[name]
+        assert table_node.balance == node.balance
+        assert table_node.balance_children == node.balance_children
+        assert table_node.has_txns == node.has_txns
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import datetime
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fava.beans.account import account_tester
+from fava.core.inventory import CounterInventory
+from fava.core.running_balances import CHECKPOINT_INTERVAL
+from fava.core.running_balances import RunningBalances
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.core import FavaLedger
+
+
+def _balance(
+    entries: Sequence[Directive], account: str, *, with_children: bool
+) -> CounterInventory:
+    is_account = account_tester(account, with_children=with_children)
+    balance = CounterInventory()
+    for entry in entries:
+        for posting in getattr(entry, "postings", []):
+            if is_account(posting.account):
+                balance.add_position(posting)
+    return balance
+
+
+@pytest.mark.parametrize(
+    "account",
+    ["Assets", "Assets:US:BofA:Checking", "Expenses:Food", "Income:US"],
+)
+@pytest.mark.parametrize("with_children", [False, True])
+def test_running_balances(
+    example_ledger: FavaLedger, account: str, *, with_children: bool
+) -> None:
+    index = example_ledger.index
+    entries = index.entries
+    running_balances = RunningBalances(index.posting_table)
+
+    for position in range(0, len(entries) + 1, 97):
+        balance = running_balances.balance_before_entry(
+            account, position, with_children=with_children
+        )
+        expected = _balance(
+            entries[:position], account, with_children=with_children
+        )
+        assert balance.to_strings() == expected.to_strings()
+
+
+def test_running_balances_checkpoints(example_ledger: FavaLedger) -> None:
+    index = example_ledger.index
+    running_balances = index.running_balances
+    table = index.posting_table
+    account = "Assets:US:BofA:Checking"
+    rows = [
+        row
+        for row, account_id in enumerate(table.accounts)
+        if table.account_names[account_id] == account
+    ]
+    assert len(rows) > CHECKPOINT_INTERVAL + 1
+    # The entries just before, at and just after the first checkpoint.
+    for row in rows[CHECKPOINT_INTERVAL - 1 : CHECKPOINT_INTERVAL + 2]:
+        position = bisect_right(table.entry_rows, row) - 1
+        balance = running_balances.balance_before_entry(account, position)
+        expected = _balance(
+            index.entries[:position], account, with_children=False
+        )
+        assert balance == expected
+        assert balance.to_strings() == expected.to_strings()
+
+
+def test_ledger_balance_before(example_ledger: FavaLedger) -> None:
+    date = datetime.date(2016, 5, 1)
+    entries = [e for e in example_ledger.all_entries if e.date < date]
+    for account, with_children in [("Assets", True), ("Liabilities", True)]:
+        assert example_ledger.balance_before(
+            account, date, with_children=with_children
+        ).to_strings() == (
+            _balance(
+                entries, account, with_children=with_children
+            ).to_strings()
+        )
+    assert example_ledger.balance_before("Assets", date).is_empty()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fava.beans import create
+from fava.core.filter_parser import Match
+from fava.core.filter_parser import StringMatch
+from fava.core.text_index import required_literals
+from fava.core.text_index import TextIndex
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fava.beans.abc import Meta
+    from fava.core import FavaLedger
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("Pizza", ["pizza"]),
+        ("^Buy.*shares$", ["buy", "shares"]),
+        (r"st\. Louis", ["st. louis"]),
+        (r"\d+ shares", [" shares"]),
+        ("piz+a", ["pi", "a"]),
+        ("a{2}bc", ["bc"]),
+        ("[Bb]ank", ["ank"]),
+        ("x[)]yz", ["x", "yz"]),
+        ("(abc)?def", ["def"]),
+        ("Müller", ["m", "ller"]),
+        ("Uncle|Boy", None),
+        ("(?x)a b c", None),
+        (r"\x41bc", None),
+        (r"\101bc", None),
+        (r"\u0041bc", None),
+        (r"\U00000041bc", None),
+        (r"\N{LATIN CAPITAL LETTER A}bc", None),
+        (r"(a)bc\1", None),
+    ],
+)
+def test_required_literals(pattern: str, expected: list[str] | None) -> None:
+    assert required_literals(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    "search",
+    [
+        "Pizza",
+        "bank.*",
+        "^Buy",
+        "[Bb]ank",
+        "Investing 40% of cash",
+        "(Uncle|Boy)",
+        "n",
+        "food)",
+        "Cafe Modagor",
+    ],
+)
+def test_text_index(example_ledger: FavaLedger, search: str) -> None:
+    entries = example_ledger.all_entries
+    text_index = TextIndex(entries)
+    match = Match(search)
+    expr = StringMatch(match)
+
+    positions = text_index.search(match)
+    if positions is not None:
+        assert positions == [
+            position for position, entry in enumerate(entries) if expr(entry)
+        ]
+
+
+def test_text_index_case_folding() -> None:
+    meta: Meta = {"filename": "<text>", "lineno": 0}
+    date = datetime.date(2022, 1, 1)
+    entries = [
+        create.transaction(meta, date, "*", None, "\u017falary"),
+        create.transaction(meta, date, "*", "\u212aiosk", ""),
+        create.note(meta, date, "Assets", "Grüße from MÜLLER"),
+    ]
+    text_index = TextIndex(entries)
+    assert text_index.search(Match("salary")) == [0]
+    assert text_index.search(Match("kiosk")) == [1]
+    assert text_index.search(Match("müller")) == [2]
+    assert text_index.search(Match("from")) == [2]
+    assert text_index.search(Match("\u017f")) is None
+
+
+@pytest.mark.parametrize(
+    "search",
+    [r"\x41bcd", r"\101bcd", r"\u0041bcd", r"\N{LATIN CAPITAL LETTER A}bcd"],
+)
+def test_text_index_character_escapes(search: str) -> None:
+    meta: Meta = {"filename": "<text>", "lineno": 0}
+    date = datetime.date(2022, 1, 1)
+    entries = [create.transaction(meta, date, "*", None, "Abcdef")]
+    text_index = TextIndex(entries)
+    match = Match(search)
+    assert StringMatch(match)(entries[0])
+    assert text_index.search(match) in ([0], None)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from decimal import Decimal
 from typing import TYPE_CHECKING
 
+from fava.core.inventory import CounterInventory
 from fava.core.tree import Tree
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -55,3 +57,60 @@ def test_tree_cap(example_ledger: FavaLedger, snapshot: SnapshotFunc) -> None:
     tree.cap(example_ledger.options)
 
     snapshot({n.name: n.balance.to_strings() for n in tree.values()})
+
+
+def test_tree_insert_balances(example_ledger: FavaLedger) -> None:
+    balances: dict[str, CounterInventory] = {}
+    for entry in example_ledger.all_entries:
+        for posting in getattr(entry, "postings", []):
+            balance = balances.setdefault(posting.account, CounterInventory())
+            balance.add_position(posting)
+
+    tree = Tree()
+    tree.insert_balances(balances)
+    expected = Tree()
+    for name, balance in sorted(balances.items()):
+        expected.insert(name, balance)
+    assert list(tree) == list(expected)
+    for name, node in expected.items():
+        assert tree[name].balance == node.balance
+        assert tree[name].balance_children == node.balance_children
+        assert tree[name].has_txns == node.has_txns
+
+    # The balances are added to the parents in the sorted order of all
+    # accounts, which keeps trailing zeros of subtrees that sum to zero.
+    tree = Tree()
+    tree.insert_balances(
+        {
+            "X": CounterInventory({("EUR", None): Decimal("1.5")}),
+            "Y:A": CounterInventory({("EUR", None): Decimal("0.25")}),
+            "Y:B": CounterInventory({("EUR", None): Decimal("-0.25")}),
+        }
+    )
+    assert tree["Y"].balance_children.is_empty()
+    assert tree[""].balance_children.to_strings() == ["1.50 EUR"]
+
+    # This also determines the order of the currencies ("A:B2" < "A:B:C").
+    tree = Tree()
+    tree.insert_balances(
+        {
+            "A:B:C": CounterInventory({("EUR", None): Decimal(1)}),
+            "A:B2": CounterInventory({("USD", None): Decimal(1)}),
+        }
+    )
+    assert tree["A"].balance_children.to_strings() == ["1 USD", "1 EUR"]
+
+    # A sum that is zero in between drops the trailing zeros and moves the
+    # currency to the end.
+    tree = Tree()
+    tree.insert_balances(
+        {
+            "A:B": CounterInventory(
+                {("EUR", None): Decimal("1.00"), ("USD", None): Decimal(1)}
+            ),
+            "A:C": CounterInventory({("EUR", None): Decimal(-1)}),
+            "A:D": CounterInventory({("EUR", None): Decimal(1)}),
+        }
+    )
+    assert tree["A"].balance_children.to_strings() == ["1 USD", "1 EUR"]
+    assert tree[""].balance_children.to_strings() == ["1 USD", "1 EUR"]